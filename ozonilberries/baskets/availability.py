@@ -0,0 +1,54 @@
+"""Модуль для проверки наличия товара с учётом корзины и мягких резервов"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def get_reservation_deadline():
+    """Время окончания резерва для строки корзины или None, если резервы выключены"""
+    if not settings.BASKET_RESERVATION_SECONDS:
+        return None
+
+    return timezone.now() + timedelta(seconds=settings.BASKET_RESERVATION_SECONDS)
+
+
+def _owner_lines(owner: dict):
+    """Условие на строки корзины владельца для агрегатов по `basket`"""
+    if owner.get("user") is not None:
+        return Q(basket__user=owner["user"])
+    if owner.get("session_key"):
+        return Q(basket__session_key=owner["session_key"], basket__user__isnull=True)
+
+    return None
+
+
+def annotate_availability(queryset, owner: dict):
+    """
+    Добавляем к товарам `available_count` и `in_basket_count` одним запросом.
+
+    `available_count` — остаток на складе за вычетом действующих резервов
+    чужих корзин, `in_basket_count` — количество товара в корзине владельца
+    (`{"user": ...}` или `{"session_key": ...}`). Резервы мягкие: они
+    не блокируют строки, а только не дают добавить в корзину товар,
+    который уже отложен другими покупателями.
+    """
+    reserved = Q(basket__reserved_until__gt=timezone.now())
+    reserved_count = Coalesce(Sum("basket__count", filter=reserved), 0)
+
+    own = _owner_lines(owner)
+    if own is None:
+        return queryset.annotate(
+            available_count=F("count") - reserved_count,
+            in_basket_count=Value(0),
+        )
+
+    return queryset.annotate(
+        available_count=F("count")
+        - reserved_count
+        + Coalesce(Sum("basket__count", filter=reserved & own), 0),
+        in_basket_count=Coalesce(Sum("basket__count", filter=own), 0),
+    )
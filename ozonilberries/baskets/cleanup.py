@@ -0,0 +1,88 @@
+"""Модуль для удаления просроченных сессий и брошенных анонимных корзин"""
+
+from datetime import timedelta
+
+from django.contrib.sessions.models import Session
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from baskets.models import Basket
+from core.sessions import (
+    are_anonymous_sessions_cached,
+    get_live_anonymous_session_keys,
+)
+
+
+def _delete_in_batches(queryset, batch_size: int) -> int:
+    """
+    Удаляем строки пачками по первичному ключу.
+
+    Каждая пачка — отдельный короткий запрос, поэтому блокировки не держатся
+    долго и не мешают корзинам и входу пользователей.
+    """
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+
+        count, _ = queryset.model.objects.filter(pk__in=pks).delete()
+        deleted += count
+
+
+def delete_expired_sessions(batch_size: int) -> int:
+    """Удаляем сессии с истёкшим сроком действия"""
+    return _delete_in_batches(
+        Session.objects.filter(expire_date__lt=timezone.now()), batch_size
+    )
+
+
+def delete_abandoned_baskets(older_than_days: int, batch_size: int) -> int:
+    """
+    Удаляем анонимные корзины без живой сессии или старше `older_than_days`.
+
+    Корзины пользователей не трогаем. Корзина без сессии в `django_session`
+    удаляется, если только анонимные сессии не хранятся в общем кэше
+    (`core.sessions`): тогда её ключ сначала проверяется в кэше пачками
+    по `batch_size`.
+    """
+    boundary = timezone.now() - timedelta(days=older_than_days)
+    anonymous = Basket.objects.filter(user__isnull=True)
+
+    deleted = _delete_in_batches(
+        anonymous.filter(Q(session_key__isnull=True) | Q(created_at__lt=boundary)),
+        batch_size,
+    )
+
+    check_cache = are_anonymous_sessions_cached()
+    live_session = Session.objects.filter(session_key=OuterRef("session_key"))
+    orphaned_keys = (
+        anonymous.filter(~Exists(live_session))
+        .order_by("session_key")
+        .values_list("session_key", flat=True)
+        .distinct()
+    )
+    last_key = ""
+    while session_keys := list(
+        orphaned_keys.filter(session_key__gt=last_key)[:batch_size]
+    ):
+        last_key = session_keys[-1]
+        live_keys = (
+            get_live_anonymous_session_keys(session_keys) if check_cache else set()
+        )
+        deleted += _delete_in_batches(
+            anonymous.filter(
+                session_key__in=[key for key in session_keys if key not in live_keys]
+            ),
+            batch_size,
+        )
+
+    return deleted
+
+
+def cleanup_baskets(older_than_days: int, batch_size: int) -> dict:
+    """Сначала удаляем сессии, чтобы их корзины удалились в этом же проходе"""
+    return {
+        "sessions": delete_expired_sessions(batch_size),
+        "baskets": delete_abandoned_baskets(older_than_days, batch_size),
+    }
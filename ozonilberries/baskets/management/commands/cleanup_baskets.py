@@ -0,0 +1,44 @@
+"""Команда для удаления просроченных сессий и брошенных анонимных корзин"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from baskets.cleanup import cleanup_baskets
+
+
+class Command(BaseCommand):
+    help = "Delete expired sessions and anonymous baskets without a live session in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ANONYMOUS_BASKET_MAX_AGE_DAYS,
+            help="Also delete anonymous baskets created more than N days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.BASKET_CLEANUP_BATCH_SIZE,
+            help="Number of rows deleted by one query",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat every N seconds instead of running once",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = cleanup_baskets(options["days"], options["batch_size"])
+            self.stdout.write(
+                f"Deleted sessions: {result['sessions']}, "
+                f"anonymous baskets: {result['baskets']}"
+            )
+
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
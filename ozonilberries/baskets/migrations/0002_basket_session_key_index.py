@@ -0,0 +1,19 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baskets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="basket",
+            index=models.Index(
+                fields=["session_key"], name="basket_session_b220bd_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:29
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_lines(apps, schema_editor):
+    """Складываем повторяющиеся строки одного товара в самую раннюю"""
+    Basket = apps.get_model("baskets", "Basket")
+
+    for owner in ("user", "session_key"):
+        duplicates = (
+            Basket.objects.filter(**{f"{owner}__isnull": False})
+            .values(owner, "product")
+            .annotate(lines=Count("id"), total=Sum("count"), first_id=Min("id"))
+            .filter(lines__gt=1)
+        )
+        for row in duplicates:
+            Basket.objects.filter(
+                **{owner: row[owner], "product": row["product"]}
+            ).exclude(id=row["first_id"]).delete()
+            Basket.objects.filter(id=row["first_id"]).update(
+                count=min(row["total"], 32767)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baskets", "0002_basket_session_key_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_lines, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="basket",
+            name="basket_session_b220bd_idx",
+        ),
+        migrations.AddConstraint(
+            model_name="basket",
+            constraint=models.UniqueConstraint(
+                fields=("user", "product"), name="basket_user_product_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="basket",
+            constraint=models.UniqueConstraint(
+                fields=("session_key", "product"), name="basket_session_product_uniq"
+            ),
+        ),
+    ]
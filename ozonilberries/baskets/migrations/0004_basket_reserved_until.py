@@ -0,0 +1,18 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("baskets", "0003_basket_unique_lines"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="basket",
+            name="reserved_until",
+            field=models.DateTimeField(blank=True, null=True, verbose_name="Резерв до"),
+        ),
+    ]
@@ -36,11 +36,24 @@ class Basket(models.Model):
     created_at = models.timestamp = models.DateTimeField(
         auto_now_add=True, verbose_name="Дата добавления"
     )
+    reserved_until = models.DateTimeField(
+        null=True, blank=True, verbose_name="Резерв до"
+    )
 
     class Meta:
         db_table = "basket"
         verbose_name = "Корзину"
         verbose_name_plural = "Корзины"
+        constraints = [
+            # по этим ключам работает `INSERT ... ON CONFLICT` (см. `baskets.upsert`);
+            # индекс по (session_key, product) заменяет отдельный индекс по session_key
+            models.UniqueConstraint(
+                fields=["user", "product"], name="basket_user_product_uniq"
+            ),
+            models.UniqueConstraint(
+                fields=["session_key", "product"], name="basket_session_product_uniq"
+            ),
+        ]
 
     objects = BasketQueryset().as_manager()
 
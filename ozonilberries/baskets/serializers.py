@@ -1,15 +1,26 @@
 """Модуль для описания сериалайзеров для модели 'Basket'"""
 
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from baskets.availability import annotate_availability, get_reservation_deadline
 from baskets.models import Basket
-from products.models import Product
-from products.serializers import ProductImageSerializer, ReviewSerializer, TagSerializer
+from baskets.upsert import add_many_to_basket, add_to_basket
+from core.fieldsets import SparseFieldsetMixin
+from products.models import Product, calculate_sale_price
+from products.serializers import (
+    DATETIME_FIELD,
+    PRICE_FIELD,
+    ProductImageSerializer,
+    ProductRowSerializer,
+    ReviewSerializer,
+    TagSerializer,
+)
 
 
-class ShowBasketItemSerializer(serializers.ModelSerializer):
+class ShowBasketItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Класс сериалайзера для работы с моделью `Basket`"""
 
     id = serializers.IntegerField(source="product.id")
@@ -61,34 +72,73 @@ class ShowBasketItemSerializer(serializers.ModelSerializer):
         return ProductImageSerializer([img for img in all_images], many=True).data
 
     def validate(self, attrs):
-        user_product = get_object_or_404(Product, id=attrs["product"]["id"])
-        remaining_quantity = user_product.count - attrs["count"]
+        # товар, его остаток за вычетом чужих резервов и количество в корзине
+        # загружаются одним запросом
+        user_product = get_object_or_404(
+            annotate_availability(Product.objects.all(), self.context["owner"]),
+            id=attrs["product"]["id"],
+        )
+        can_add = user_product.available_count - user_product.in_basket_count
 
-        if remaining_quantity < 0:
-            raise serializers.ValidationError("Такого количества товара нет на складе")
+        if attrs["count"] > can_add:
+            raise serializers.ValidationError(
+                "Такого количества товара нет на складе. "
+                f"Можно добавить - {max(can_add, 0)}"
+            )
 
         attrs["product_object"] = user_product
         return attrs
 
     def create(self, validated_data):
-        current_basket = None
-        purchased_product = validated_data["product_object"]
+        return add_to_basket(
+            validated_data["owner"],
+            validated_data["product_object"],
+            validated_data["count"],
+        )
 
-        if validated_data["user"].is_authenticated:
-            current_basket, _ = Basket.objects.get_or_create(
-                user=validated_data["user"],
-                product=purchased_product,
-            )
-        elif validated_data["session_key_for_anonym"]:
-            current_basket, _ = Basket.objects.get_or_create(
-                session_key=validated_data["session_key_for_anonym"],
-                product=purchased_product,
-            )
 
-        current_basket.count += validated_data["count"]
-        current_basket.save()
+class ShowBasketItemRowSerializer(ProductRowSerializer):
+    """Класс облегчённого сериалайзера, совпадающий с `ShowBasketItemSerializer`"""
 
-        return current_basket
+    product_key = "product_id"
+    title_key = "product__title"
+    row_fields = (
+        "product_id",
+        "product__category_id",
+        "product__price",
+        "product__discounted__discount",
+        "count",
+        "created_at",
+        "product__title",
+        "product__description",
+        "product__freeDelivery",
+        "product__review_stats__reviews_count",
+        "product__review_stats__rate_sum",
+    )
+
+    def to_representation(self, row: dict) -> dict:
+        # то же, что `Basket.products_price()`: цена со скидкой, если она есть
+        price = row["product__price"]
+        if row["product__discounted__discount"] is not None:
+            price = calculate_sale_price(price, row["product__discounted__discount"])
+
+        return {
+            "id": row["product_id"],
+            "category": row["product__category_id"],
+            "price": PRICE_FIELD.to_representation(price * row["count"]),
+            "count": row["count"],
+            "date": DATETIME_FIELD.to_representation(row["created_at"]),
+            "title": row["product__title"],
+            "description": row["product__description"],
+            "freeDelivery": row["product__freeDelivery"],
+            "images": self.get_images(row),
+            "tags": self.tags[row["product_id"]],
+            "reviews": row["product__review_stats__reviews_count"] or 0,
+            "rating": self.get_rating(
+                row["product__review_stats__reviews_count"],
+                row["product__review_stats__rate_sum"],
+            ),
+        }
 
 
 class DeleteFromBasketSerializer(serializers.Serializer):
@@ -96,3 +146,121 @@ class DeleteFromBasketSerializer(serializers.Serializer):
 
     id = serializers.IntegerField(min_value=0)
     count = serializers.IntegerField(min_value=0)
+
+
+class BasketLineSerializer(serializers.Serializer):
+    """Класс сериалайзера для строки пакетного изменения корзины"""
+
+    id = serializers.IntegerField(min_value=1)
+    count = serializers.IntegerField(min_value=0)
+
+
+class BasketBulkSerializer(serializers.Serializer):
+    """
+    Класс сериалайзера для пакетного изменения корзины.
+
+    `add` увеличивает количество товаров, `update` задаёт его (0 удаляет
+    товар), `remove` удаляет товары по id. Остатки всех товаров (за вычетом
+    чужих резервов) проверяются одним запросом. В одной транзакции строки
+    удаляются одним `DELETE`, `update` записывается одним upsert, а `add`
+    прибавляется к количеству в БД (`add_many_to_basket`), поэтому
+    одновременные добавления не теряются.
+    """
+
+    add = BasketLineSerializer(many=True, required=False, default=list)
+    update = BasketLineSerializer(many=True, required=False, default=list)
+    remove = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list
+    )
+
+    def validate(self, attrs):
+        product_ids = [line["id"] for line in attrs["add"] + attrs["update"]]
+        product_ids += attrs["remove"]
+        if len(product_ids) != len(set(product_ids)):
+            raise serializers.ValidationError(
+                "Каждый товар можно указать только в одной операции и один раз"
+            )
+
+        for line in attrs["add"]:
+            if line["count"] < 1:
+                raise serializers.ValidationError(
+                    {"add": "Количество добавляемого товара должно быть больше 0"}
+                )
+
+        return attrs
+
+    def create(self, validated_data):
+        owner = validated_data["owner"]
+        new_counts = {line["id"]: line["count"] for line in validated_data["update"]}
+        added = {line["id"]: line["count"] for line in validated_data["add"]}
+
+        with transaction.atomic():
+            stock = dict(
+                annotate_availability(
+                    Product.objects.filter(id__in=[*added, *new_counts]), owner
+                ).values_list("id", "available_count")
+            )
+            missing = sorted((added.keys() | new_counts.keys()) - stock.keys())
+            if missing:
+                raise serializers.ValidationError(
+                    {"id": [f"Товары не найдены: {', '.join(map(str, missing))}"]}
+                )
+
+            lines = {
+                line.product_id: line
+                for line in Basket.objects.filter(
+                    product_id__in=[*added, *new_counts], **owner
+                ).select_for_update()
+            }
+            for product_id, count in added.items():
+                line = lines.get(product_id)
+                new_counts[product_id] = count + (line.count if line else 0)
+
+            unavailable = sorted(
+                product_id
+                for product_id, count in new_counts.items()
+                if count > stock[product_id]
+            )
+            if unavailable:
+                raise serializers.ValidationError(
+                    {
+                        "count": [
+                            "Такого количества товара нет на складе: "
+                            + ", ".join(map(str, unavailable))
+                        ]
+                    }
+                )
+
+            removed = list(validated_data["remove"])
+            reserved_until = get_reservation_deadline()
+            changed = []
+            for product_id, count in new_counts.items():
+                if product_id in added:
+                    continue
+                if count == 0:
+                    removed.append(product_id)
+                else:
+                    changed.append(
+                        Basket(
+                            product_id=product_id,
+                            count=count,
+                            reserved_until=reserved_until,
+                            **owner,
+                        )
+                    )
+
+            if removed:
+                Basket.objects.filter(product_id__in=removed, **owner).delete()
+            # один `INSERT ... ON CONFLICT DO UPDATE` задаёт количество для `update`
+            Basket.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=[*owner, "product"],
+                update_fields=["count", "reserved_until"],
+            )
+            # строку для `add` могли создать после блокировки, поэтому прибавляем
+            # в БД (`count = count + EXCLUDED.count`), а не записываем итог
+            if added:
+                changed += add_many_to_basket(owner, added)
+
+        return changed
@@ -1,3 +1,265 @@
-from django.test import TestCase
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from rest_framework.test import APITestCase
+
+from baskets.models import Basket
+from baskets.upsert import add_to_basket, merge_anonymous_basket
+from core.sessions import SessionStore
+from products.models import Category, Product, ProductImage, Subcategory, Tag
+
+User = get_user_model()
+
+
+class BasketTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_basket_data()
+
+    @classmethod
+    def create_basket_data(cls):
+        cls.user = User.objects.create_user(username="buyer", password="buyer-pass-123")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        category = Category.objects.create(title="Компьютеры", slug="computers")
+        cls.products = [
+            Product.objects.create(
+                title=f"Товар {number}",
+                slug=f"product-{number}",
+                category=category,
+                subcategory=subcategory,
+                price=100,
+                count=10,
+            )
+            for number in range(3)
+        ]
+
+
+class BasketBulkTests(BasketTestMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def assert_bulk_returns_basket(self):
+        first, second, third = self.products
+        Basket.objects.create(user=self.user, product=second, count=2)
+        Basket.objects.create(user=self.user, product=third, count=1)
+
+        response = self.client.post(
+            "/api/basket/bulk/",
+            {
+                "add": [{"id": first.id, "count": 3}],
+                "update": [{"id": second.id, "count": 5}],
+                "remove": [third.id],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        items = response.data["results"]
+        self.assertEqual(
+            {item["id"]: (item["title"], item["count"]) for item in items},
+            {first.id: (first.title, 3), second.id: (second.title, 5)},
+        )
+
+    @override_settings(FAST_LIST_SERIALIZATION=1)
+    def test_bulk_returns_basket_from_rows(self):
+        self.assert_bulk_returns_basket()
+
+    @override_settings(FAST_LIST_SERIALIZATION=0)
+    def test_bulk_returns_basket_from_model_serializer(self):
+        self.assert_bulk_returns_basket()
+
+    def test_bulk_add_is_added_to_existing_line(self):
+        first = self.products[0]
+        Basket.objects.create(user=self.user, product=first, count=2)
+
+        response = self.client.post(
+            "/api/basket/bulk/", {"add": [{"id": first.id, "count": 3}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Basket.objects.get(user=self.user, product=first).count, 5)
+
+
+class BasketRowSerializerParityTests(BasketTestMixin, APITestCase):
+    def test_basket_rows_match_model_serializer(self):
+        first, second, _ = self.products
+        first.tags.add(Tag.objects.create(name="Новинка"))
+        ProductImage.objects.create(product=first, image="products/first.jpg")
+        Basket.objects.create(user=self.user, product=first, count=2)
+        Basket.objects.create(user=self.user, product=second, count=1)
+        self.client.force_authenticate(self.user)
+
+        responses = {}
+        for fast in (1, 0):
+            with override_settings(FAST_LIST_SERIALIZATION=fast):
+                response = self.client.get("/api/basket/")
+            self.assertEqual(response.status_code, 200)
+            # порядок строк корзины не задан
+            responses[fast] = sorted(
+                response.json()["results"], key=lambda item: item["id"]
+            )
+
+        self.assertEqual(len(responses[1]), 2)
+        self.assertEqual(responses[1], responses[0])
+
+
+class BasketUpsertTests(BasketTestMixin, TestCase):
+    def test_lines_are_unique_per_owner_and_product(self):
+        product = self.products[0]
+        Basket.objects.create(user=self.user, product=product, count=1)
+        Basket.objects.create(session_key="a" * 32, product=product, count=1)
+
+        for owner in ({"user": self.user}, {"session_key": "a" * 32}):
+            with self.subTest(owner=owner), self.assertRaises(IntegrityError):
+                with transaction.atomic():
+                    Basket.objects.create(product=product, count=1, **owner)
+
+    def test_add_to_basket_sums_counts(self):
+        product = self.products[0]
+
+        add_to_basket({"user": self.user}, product, 2)
+        line = add_to_basket({"user": self.user}, product, 3)
+
+        self.assertEqual(line.count, 5)
+        self.assertEqual(
+            list(Basket.objects.filter(user=self.user).values_list("count", flat=True)),
+            [5],
+        )
+
+    def test_merge_anonymous_basket_sums_counts(self):
+        first, second, _ = self.products
+        session_key = "s" * 32
+        Basket.objects.create(user=self.user, product=first, count=3)
+        Basket.objects.create(session_key=session_key, product=first, count=2)
+        Basket.objects.create(session_key=session_key, product=second, count=1)
+
+        merge_anonymous_basket(session_key, self.user)
+
+        self.assertEqual(
+            dict(
+                Basket.objects.filter(user=self.user).values_list("product_id", "count")
+            ),
+            {first.id: 5, second.id: 1},
+        )
+        self.assertFalse(Basket.objects.filter(session_key=session_key).exists())
+
+
+class BasketDestroyTests(BasketTestMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.line = Basket.objects.create(
+            user=self.user, product=self.products[0], count=3
+        )
+
+    def test_destroy_with_count_decrements_line(self):
+        response = self.client.delete(
+            f"/api/basket/{self.line.id}/", {"count": 2}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.line.refresh_from_db()
+        self.assertEqual(self.line.count, 1)
+
+    def test_destroy_with_whole_count_deletes_line(self):
+        response = self.client.delete(
+            f"/api/basket/{self.line.id}/", {"count": 3}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Basket.objects.filter(id=self.line.id).exists())
+
+
+class CleanupBasketsTests(BasketTestMixin, TestCase):
+    def create_session(self, expire_date) -> str:
+        session = Session.objects.create(
+            session_key=get_random_string(32), session_data="", expire_date=expire_date
+        )
+
+        return session.session_key
+
+    def add_line(self, session_key=None, user=None, product=None) -> Basket:
+        return Basket.objects.create(
+            session_key=session_key,
+            user=user,
+            product=product or self.products[0],
+            count=1,
+        )
+
+    def cleanup(self) -> set:
+        """Запускаем команду и возвращаем id оставшихся строк корзин"""
+        call_command("cleanup_baskets", days=30, batch_size=2, stdout=StringIO())
+
+        return set(Basket.objects.values_list("id", flat=True))
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_baskets_without_database_session_are_deleted(self):
+        now = timezone.now()
+        live = self.add_line(self.create_session(now + timedelta(days=1)))
+        user_line = self.add_line(user=self.user)
+        expired = self.add_line(self.create_session(now - timedelta(days=1)))
+        missing = [self.add_line(get_random_string(32)) for _ in range(3)]
+        old = self.add_line(self.create_session(now + timedelta(days=1)))
+        Basket.objects.filter(id=old.id).update(created_at=now - timedelta(days=31))
+
+        remaining = self.cleanup()
+
+        self.assertEqual(remaining, {live.id, user_line.id})
+        self.assertNotIn(
+            expired.session_key, Session.objects.values_list("pk", flat=True)
+        )
+        self.assertFalse(Basket.objects.filter(id__in=[line.id for line in missing]))
+
+    def test_cached_anonymous_sessions_keep_their_baskets(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            SESSION_ENGINE="core.sessions",
+            CACHES={
+                **settings.CACHES,
+                "sessions": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": location,
+                },
+            },
+        ):
+            session = SessionStore()
+            session["basket"] = True
+            session.create()
+            cached = self.add_line(session.session_key)
+            missing = self.add_line(get_random_string(32))
+
+            remaining = self.cleanup()
+
+        self.assertIn(cached.id, remaining)
+        self.assertNotIn(missing.id, remaining)
+        self.assertFalse(Session.objects.filter(pk=session.session_key).exists())
+
+
+class ConcurrentBasketAddTests(BasketTestMixin, TransactionTestCase):
+    def setUp(self):
+        self.create_basket_data()
+
+    def test_concurrent_adds_are_not_lost(self):
+        product = self.products[0]
+
+        def add(_):
+            try:
+                add_to_basket({"user": self.user}, product, 1)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            list(executor.map(add, range(5)))
+
+        self.assertEqual(
+            list(Basket.objects.filter(user=self.user).values_list("count", flat=True)),
+            [5],
+        )
@@ -0,0 +1,98 @@
+"""Модуль для атомарного добавления товаров в корзину через `INSERT ... ON CONFLICT`"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from baskets.availability import get_reservation_deadline
+from baskets.models import Basket
+
+BASKET_ADD_SQL = """
+    INSERT INTO {table} AS b
+        (user_id, session_key, product_id, count, created_at, reserved_until)
+    VALUES {values}
+    ON CONFLICT ({owner_column}, product_id)
+    DO UPDATE SET
+        count = b.count + EXCLUDED.count,
+        reserved_until = EXCLUDED.reserved_until
+    RETURNING id, product_id, count, created_at, reserved_until
+"""
+
+BASKET_MERGE_SQL = """
+    INSERT INTO {table} AS b
+        (user_id, session_key, product_id, count, created_at, reserved_until)
+    SELECT %s, NULL, product_id, count, created_at, reserved_until
+    FROM {table}
+    WHERE session_key = %s AND user_id IS NULL
+    ON CONFLICT (user_id, product_id)
+    DO UPDATE SET
+        count = b.count + EXCLUDED.count,
+        reserved_until = GREATEST(b.reserved_until, EXCLUDED.reserved_until)
+"""
+
+
+def _owner_params(owner: dict) -> tuple:
+    """Колонка уникального ключа и значения `user_id`, `session_key` владельца"""
+    if "user" in owner:
+        return "user_id", owner["user"].pk, None
+
+    return "session_key", None, owner["session_key"]
+
+
+def add_many_to_basket(owner: dict, counts: dict) -> list:
+    """
+    Добавляем товары `{id товара: количество}` в корзину за один запрос.
+
+    Если строка с товаром уже есть, количество увеличивается в той же
+    команде, поэтому одновременные добавления не теряются и не создают
+    дубликатов (см. ограничения уникальности `Basket`). Резерв строк
+    продлевается (см. `BASKET_RESERVATION_SECONDS`).
+    """
+    owner_column, user_id, session_key = _owner_params(owner)
+    now = timezone.now()
+    reserved_until = get_reservation_deadline()
+    params = []
+    for product_id, count in counts.items():
+        params += [user_id, session_key, product_id, count, now, reserved_until]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            BASKET_ADD_SQL.format(
+                table=connection.ops.quote_name(Basket._meta.db_table),
+                owner_column=owner_column,
+                values=", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(counts)),
+            ),
+            params,
+        )
+        rows = cursor.fetchall()
+
+    return [
+        Basket(
+            id=basket_id,
+            product_id=product_id,
+            count=total_count,
+            created_at=created_at,
+            reserved_until=reserved_until,
+            **owner,
+        )
+        for basket_id, product_id, total_count, created_at, reserved_until in rows
+    ]
+
+
+def add_to_basket(owner: dict, product, count: int) -> Basket:
+    """Добавляем `count` единиц товара в корзину (см. `add_many_to_basket`)"""
+    (line,) = add_many_to_basket(owner, {product.pk: count})
+    line.product = product
+
+    return line
+
+
+def merge_anonymous_basket(session_key: str, user):
+    """Переносим корзину анонима в корзину пользователя, складывая количества"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            BASKET_MERGE_SQL.format(
+                table=connection.ops.quote_name(Basket._meta.db_table)
+            ),
+            [user.pk, session_key],
+        )
+        Basket.objects.filter(session_key=session_key, user__isnull=True).delete()
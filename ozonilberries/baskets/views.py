@@ -1,11 +1,20 @@
 """Модуль для описания представлений для модели 'Basket'"""
 
+from django.db.models import F
 from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework.decorators import action
 from rest_framework.mixins import CreateModelMixin, DestroyModelMixin, ListModelMixin
 from rest_framework.viewsets import GenericViewSet
 
 from baskets.models import Basket
-from baskets.serializers import DeleteFromBasketSerializer, ShowBasketItemSerializer
+from baskets.serializers import (
+    BasketBulkSerializer,
+    DeleteFromBasketSerializer,
+    ShowBasketItemRowSerializer,
+    ShowBasketItemSerializer,
+)
+from core.rows import RowListMixin
+from core.throttling import UserWriteThrottle
 
 
 @extend_schema_view(
@@ -26,13 +35,23 @@ from baskets.serializers import DeleteFromBasketSerializer, ShowBasketItemSerial
         # request=ShowBasketItemSerializer,
         # methods=['DELETE'],
     ),
+    bulk=extend_schema(
+        tags=["basket"],
+        summary="Изменить несколько товаров в корзине",
+        description="Add, update and remove many basket lines, returns the basket",
+        request=BasketBulkSerializer,
+        responses=ShowBasketItemSerializer(many=True),
+    ),
 )
 class BasketViewSet(
-    ListModelMixin, CreateModelMixin, DestroyModelMixin, GenericViewSet
+    RowListMixin, ListModelMixin, CreateModelMixin, DestroyModelMixin, GenericViewSet
 ):
     """ViewSet для работы с моделью `Basket`"""
 
     serializer_class = ShowBasketItemSerializer
+    row_serializer_class = ShowBasketItemRowSerializer
+    throttle_classes = (UserWriteThrottle,)
+    throttle_scope = "basket"
 
     def get_queryset(self):
         """Получаем корзину пользователя"""
@@ -42,22 +61,62 @@ class BasketViewSet(
             return Basket.objects.filter(user=user).select_related("product")
 
         elif not self.request.session.session_key:
-            self.request.session.create()
+            # у анонима без сессии корзина пуста: сессия создаётся только при добавлении товара
+            return Basket.objects.none()
 
         return Basket.objects.filter(
             session_key=self.request.session.session_key
         ).select_related("product")
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # для проверки наличия с учётом того, что уже лежит в корзине
+        context["owner"] = self.get_basket_owner()
+
+        return context
+
+    def ensure_session(self):
+        """Создаём сессию анониму, который впервые меняет корзину"""
+        if (
+            not self.request.user.is_authenticated
+            and not self.request.session.session_key
+        ):
+            self.request.session.create()
+
+    def get_basket_owner(self) -> dict:
+        """Получаем условие на владельца корзины: пользователь или сессия"""
+        if self.request.user.is_authenticated:
+            return {"user": self.request.user}
+
+        return {"session_key": self.request.session.session_key}
+
     def perform_create(self, serializer):
         """Метод для создания корзин"""
-        serializer.save(session_key_for_anonym=self.request.session.session_key)
+        self.ensure_session()
+        serializer.save(owner=self.get_basket_owner())
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Метод для пакетного изменения корзины"""
+        # `BasketBulkSerializer` только разбирает запрос, в ответе — корзина,
+        # как в `list` (через `serializer_class` или `row_serializer_class`)
+        serializer = BasketBulkSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        self.ensure_session()
+        serializer.save(owner=self.get_basket_owner())
+
+        return self.list(request)
 
     def perform_destroy(self, instance):
         """Метод для удаления корзин"""
         deleted_count = self.request.data.get("count", None)
-        count_in_basket = instance.count
-        if deleted_count is not None and deleted_count < count_in_basket:
-            instance.count -= deleted_count
-            instance.save()
-        else:
-            instance.delete()
+        if deleted_count is not None:
+            # уменьшаем количество в БД, чтобы не потерять одновременные изменения
+            if Basket.objects.filter(id=instance.id, count__gt=deleted_count).update(
+                count=F("count") - deleted_count
+            ):
+                return
+
+        Basket.objects.filter(id=instance.id).delete()
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+    verbose_name = "Общие инструменты"
+
+    def ready(self):
+        from django.conf import settings
+        from PIL import Image
+
+        import core.checks
+
+        # Pillow предупреждает о таких изображениях, а вдвое больших не открывает
+        Image.MAX_IMAGE_PIXELS = settings.IMAGE_MAX_PIXELS
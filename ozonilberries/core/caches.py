@@ -0,0 +1,10 @@
+"""Модуль для проверки, видят ли кэш другие процессы"""
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_cache_shared(alias: str) -> bool:
+    """Проверяем, общий ли кэш `alias` для всех процессов, а не память одного процесса"""
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
@@ -0,0 +1,67 @@
+"""Модуль для системных проверок настроек кэшей"""
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from core.caches import is_cache_shared
+
+
+@register()
+def check_session_cache(app_configs, **kwargs):
+    """Анонимные сессии `core.sessions` живут только в кэше и должны его пережить"""
+    if settings.SESSION_ENGINE != "core.sessions" or is_cache_shared(
+        settings.SESSION_CACHE_ALIAS
+    ):
+        return []
+
+    return [
+        Warning(
+            "SESSION_ENGINE is 'core.sessions', but the session cache is local "
+            "to each process.",
+            hint=(
+                "Anonymous sessions and their baskets are lost between workers "
+                "and after restarts, and cleanup_baskets deletes baskets whose "
+                "session is not in the database. Set SESSION_CACHE_BACKEND/SESSION_CACHE_LOCATION "
+                "to a shared cache or use django.contrib.sessions.backends.db."
+            ),
+            id="core.W001",
+        )
+    ]
+
+
+@register()
+def check_throttle_cache(app_configs, **kwargs):
+    """Лимиты запросов защищают вход, только если все процессы считают их вместе"""
+    if settings.DEBUG or is_cache_shared(settings.THROTTLE_CACHE_ALIAS):
+        return []
+
+    return [
+        Warning(
+            "THROTTLE_CACHE_ALIAS points to a cache that is local to each process.",
+            hint=(
+                "Every worker keeps its own token buckets, so N workers allow N times "
+                "the configured THROTTLE_* rates. Set CACHE_BACKEND/CACHE_LOCATION "
+                "to a shared cache such as Redis."
+            ),
+            id="core.W002",
+        )
+    ]
+
+
+@register()
+def check_reference_cache(app_configs, **kwargs):
+    """Версии справочников сбрасывают копии других процессов только через общий кэш"""
+    if settings.DEBUG or is_cache_shared(settings.REFERENCE_CACHE_ALIAS):
+        return []
+
+    return [
+        Warning(
+            "REFERENCE_CACHE_ALIAS points to a cache that is local to each process.",
+            hint=(
+                "Changes to delivery cost, categories and tags are seen by other "
+                "workers only after REFERENCE_CACHE_TTL seconds. Set "
+                "CACHE_BACKEND/CACHE_LOCATION to a shared cache such as Redis."
+            ),
+            id="core.W003",
+        )
+    ]
@@ -0,0 +1,176 @@
+"""Модуль для условных GET-запросов (ETag / Last-Modified) без сериализации"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.fieldsets import get_fieldset_key
+
+
+def _set_validators(response, etag: str, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Миксин для `retrieve` с поддержкой `If-None-Match` / `If-Modified-Since`.
+
+    Валидаторы берутся одним запросом по первичному ключу из полей
+    `conditional_version_field` и `conditional_modified_field`, поэтому ответ
+    304 отдаётся без загрузки объекта и работы сериалайзера.
+    """
+
+    conditional_version_field = "version"
+    conditional_modified_field = "updated_at"
+
+    def get_conditional_queryset(self):
+        """Queryset для чтения валидаторов, без тяжёлых аннотаций и prefetch"""
+        return self.get_queryset()
+
+    def get_retrieve_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        validators = (
+            self.get_conditional_queryset()
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list(
+                "pk", self.conditional_version_field, self.conditional_modified_field
+            )
+            .first()
+        )
+        if validators is None:
+            return None, None
+
+        pk, version, last_modified = validators
+        self.retrieve_version = version
+        etag = quote_etag(
+            f"{pk}-{version}-{self.request.accepted_renderer.format}"
+            f"{get_fieldset_key(self.request)}"
+        )
+
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_retrieve_validators()
+        if etag is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=int(last_modified.timestamp())
+        )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+
+        return _set_validators(response, etag, last_modified)
+
+
+class CachedRetrieveMixin:
+    """
+    Миксин для кэширования сериализованного объекта в `retrieve`.
+
+    Используется вместе с `ConditionalRetrieveMixin`: запись кэша хранит
+    версию объекта и используется, только если версия не изменилась.
+    """
+
+    retrieve_cache_timeout = None
+
+    def get_retrieve_cache_key(self) -> str:
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        version = getattr(self, "retrieve_version", None)
+        if version is None or not self.retrieve_cache_timeout:
+            return super().retrieve(request, *args, **kwargs)
+
+        cache_key = self.get_retrieve_cache_key() + get_fieldset_key(request)
+        cached = cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return Response(cached[1])
+
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, (version, response.data), self.retrieve_cache_timeout)
+
+        return response
+
+
+class NotModified(Exception):
+    """Исключение, которым `ConditionalListMixin` прерывает `list` до сериализации"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalListMixin:
+    """
+    Миксин для `list` с поддержкой `If-None-Match`.
+
+    ETag собирается из строк текущей страницы (первичный ключ и
+    `conditional_modified_field`), данных пагинации (количество, ссылки)
+    и параметров запроса. Строки страницы всё равно загружаются для ответа,
+    поэтому ETag не требует отдельного запроса по всему списку, а при
+    совпадении ETag ответ 304 отдаётся без сериализации. В строках
+    `row_serializer_class` должны быть `id` и `conditional_modified_field`.
+    `Last-Modified` не отдаётся: удаление объекта его не меняет.
+    """
+
+    conditional_modified_field = "updated_at"
+
+    def get_row_validators(self, row) -> tuple:
+        if isinstance(row, dict):
+            return row["id"], row[self.conditional_modified_field]
+        return row.pk, getattr(row, self.conditional_modified_field)
+
+    def get_list_etag(self, rows, paginated: bool) -> str:
+        envelope = {}
+        if paginated:
+            envelope = self.paginator.get_paginated_response([]).data
+        fingerprint = "|".join(
+            [
+                self.request.get_full_path(),
+                self.request.accepted_renderer.format,
+                *(
+                    f"{key}={value}"
+                    for key, value in envelope.items()
+                    if key != "results"
+                ),
+                *(
+                    f"{pk}@{modified.isoformat()}"
+                    for pk, modified in map(self.get_row_validators, rows)
+                ),
+            ]
+        )
+
+        return quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # без пагинации queryset вычисляется здесь и кэширует строки для ответа
+        self.list_etag = self.get_list_etag(
+            queryset if page is None else page, page is not None
+        )
+        response = get_conditional_response(self.request, etag=self.list_etag)
+        if response is not None:
+            raise NotModified(response)
+
+        return page
+
+    def list(self, request, *args, **kwargs):
+        self.list_etag = None
+        try:
+            response = super().list(request, *args, **kwargs)
+        except NotModified as exc:
+            response = exc.response
+
+        if self.list_etag is None:
+            return response
+
+        return _set_validators(response, self.list_etag)
@@ -0,0 +1,149 @@
+"""Модуль для распределения чтения каталога по репликам БД"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    """Состояние маршрутизации запросов к БД в рамках одного HTTP-запроса"""
+
+    def __init__(self, pinned: bool = False):
+        # клиент недавно писал в БД: читаем только с основной
+        self.pinned = pinned
+        # представление разрешило читать с реплик
+        self.use_replica = False
+        # в этом запросе уже была запись
+        self.wrote = False
+
+
+_routing_state = ContextVar("routing_state", default=None)
+
+
+def start_routing(pinned: bool = False):
+    return _routing_state.set(RoutingState(pinned))
+
+
+def finish_routing(token) -> RoutingState:
+    state = _routing_state.get()
+    _routing_state.reset(token)
+
+    return state
+
+
+def use_replica():
+    """Разрешаем чтение с реплик до конца текущего запроса"""
+    state = _routing_state.get()
+    if state is not None:
+        state.use_replica = True
+
+
+def pin_to_primary():
+    """Отправляем все чтения текущего запроса на основную БД"""
+    state = _routing_state.get()
+    if state is not None:
+        state.pinned = True
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Читаем только с основной БД внутри блока.
+
+    Для данных, которые после чтения кэшируются для всех клиентов: копия
+    с отстающей реплики после записи осталась бы в кэше до истечения срока.
+    """
+    state = _routing_state.get()
+    if state is None:
+        yield
+        return
+
+    pinned, state.pinned = state.pinned, True
+    try:
+        yield
+    finally:
+        state.pinned = pinned
+
+
+def _user_pin_key(user_id) -> str:
+    return f"replica:pin:user:{user_id}"
+
+
+def is_user_pinned(user) -> bool:
+    return bool(user.is_authenticated and cache.get(_user_pin_key(user.pk)))
+
+
+def pin_user(user):
+    """Запоминаем для пользователя, что он писал в БД (для клиентов без cookie)"""
+    if user is not None and user.is_authenticated:
+        cache.set(_user_pin_key(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+class ReplicaRouter:
+    """
+    Роутер, который отправляет чтение на реплики из `DATABASE_REPLICAS`.
+
+    Читать с реплики можно, только если представление это разрешило
+    (`ReplicaReadMixin`), в запросе ещё не было записи, клиент не писал в БД
+    последние `REPLICA_PIN_SECONDS` и нет открытой транзакции. Всё остальное,
+    включая любую запись, идёт в основную БД.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if (
+            state is None
+            or not state.use_replica
+            or state.pinned
+            or state.wrote
+            or not settings.DATABASE_REPLICAS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.wrote = True
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # реплики содержат те же данные, что и основная БД
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # схема на реплики приходит через репликацию
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaReadMixin:
+    """
+    Миксин для представления, которому можно читать с реплик.
+
+    Действия перечисляются в `replica_actions` (для `APIView` — методы в нижнем
+    регистре). Аутентификация и проверка прав выполняются до переключения,
+    то есть всегда на основной БД.
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if not settings.DATABASE_REPLICAS:
+            return
+
+        action = getattr(self, "action", None) or request.method.lower()
+        if action not in self.replica_actions:
+            return
+        if is_user_pinned(request.user):
+            pin_to_primary()
+            return
+        use_replica()
@@ -0,0 +1,45 @@
+"""Модуль для обработки исключений в API"""
+
+from django.core.exceptions import RequestDataTooBig
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+
+class ServiceBusy(Exception):
+    """
+    Исключение, когда ресурс перегружен и запрос стоит повторить позже.
+
+    Исключение не зависит от DRF, поэтому его можно бросать из кода, который
+    вызывают и API, и админка, и `authenticate()`: в API его превращает
+    в 503 `api_exception_handler`, в остальных представлениях —
+    `ServiceBusyMiddleware`.
+    """
+
+    message = "Сервис перегружен, повторите попытку позже."
+    retry_after = 1
+
+    def __init__(self, message=None):
+        self.message = message or self.message
+        super().__init__(self.message)
+
+
+def api_exception_handler(exc, context):
+    """
+    Обработчик исключений DRF.
+
+    Отвечает 413 на слишком большие загрузки и 503 с `Retry-After`
+    на `ServiceBusy`, остальное передаёт обработчику DRF.
+    """
+    if isinstance(exc, RequestDataTooBig):
+        return Response(
+            {"detail": str(exc)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+    if isinstance(exc, ServiceBusy):
+        return Response(
+            {"detail": exc.message},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+
+    return exception_handler(exc, context)
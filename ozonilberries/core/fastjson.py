@@ -0,0 +1,71 @@
+"""Модуль для быстрой сериализации и разбора JSON через `orjson`, если он установлен"""
+
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Класс рендерера, который кодирует ответ через `orjson`.
+
+    Результат совпадает с `JSONRenderer` побайтово: компактные разделители,
+    символы без `\\uXXXX`-экранирования (кроме U+2028/U+2029), даты, `Decimal`
+    и ленивые строки проходят через `encoder_class`. Без `orjson`, при
+    `indent` в заголовке `Accept` и при нестандартных настройках
+    `COMPACT_JSON` / `UNICODE_JSON` используется обычный `JSONRenderer`.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+        )
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """
+    Класс парсера, который разбирает тело запроса в UTF-8 через `orjson`.
+
+    Как и `JSONParser` со `STRICT_JSON`, не принимает `NaN` и `Infinity`.
+    Без `orjson` и для других кодировок используется обычный `JSONParser`.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
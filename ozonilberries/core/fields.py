@@ -0,0 +1,45 @@
+"""Модуль для полей сериалайзеров, общих для приложений"""
+
+from django.conf import settings
+from PIL import Image, UnidentifiedImageError
+from rest_framework import serializers
+
+
+class ImageHeaderField(serializers.FileField):
+    """
+    Поле изображения, которое проверяет только заголовок файла.
+
+    В отличие от `ImageField` пиксели не декодируются: формат и размеры
+    читаются из заголовка, и изображения больше `IMAGE_MAX_PIXELS`
+    отклоняются до того, как их кто-либо попытается открыть целиком.
+    """
+
+    default_error_messages = {
+        "invalid_image": "Загрузите корректное изображение.",
+        "invalid_format": "Допустимые форматы: {formats}.",
+        "too_many_pixels": "Изображение слишком большое: {width}x{height} пикселей.",
+        "decompression_bomb": "Изображение слишком большое.",
+    }
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+
+        try:
+            with Image.open(file) as image:
+                image_format = image.format
+                width, height = image.size
+        except Image.DecompressionBombError:
+            self.fail("decompression_bomb")
+        except (UnidentifiedImageError, OSError):
+            self.fail("invalid_image")
+        finally:
+            file.seek(0)
+
+        if image_format not in settings.IMAGE_UPLOAD_FORMATS:
+            self.fail(
+                "invalid_format", formats=", ".join(settings.IMAGE_UPLOAD_FORMATS)
+            )
+        if width * height > settings.IMAGE_MAX_PIXELS:
+            self.fail("too_many_pixels", width=width, height=height)
+
+        return file
@@ -0,0 +1,56 @@
+"""Модуль для выбора полей ответа параметром `?fields=id,title,price`"""
+
+import hashlib
+
+from rest_framework import serializers
+
+SPARSE_FIELDS_PARAM = "fields"
+
+
+def get_requested_fields(request):
+    """
+    Получаем множество полей из параметра запроса или None, если он не указан.
+
+    Учитывается только в GET/HEAD: при записи сериалайзеру нужны все поля.
+    """
+    if request is None or request.method not in ("GET", "HEAD"):
+        return None
+
+    value = request.query_params.get(SPARSE_FIELDS_PARAM)
+    if value is None:
+        return None
+
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+def get_fieldset_key(request) -> str:
+    """Короткий суффикс для ETag и ключей кэша, зависящий от набора полей"""
+    requested = get_requested_fields(request)
+    if requested is None:
+        return ""
+
+    return "-" + hashlib.md5(",".join(sorted(requested)).encode()).hexdigest()[:8]
+
+
+class SparseFieldsetMixin:
+    """
+    Миксин для сериалайзера, который оставляет только поля из `?fields=`.
+
+    Работает только для сериалайзера верхнего уровня (или элемента списка
+    верхнего уровня); вложенные сериалайзеры отдаются целиком.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        requested = get_requested_fields(self.context.get("request"))
+        if requested is None:
+            return fields
+
+        return {name: field for name, field in fields.items() if name in requested}
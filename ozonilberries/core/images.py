@@ -0,0 +1,187 @@
+"""Модуль для обработки загруженных изображений и создания уменьшенных копий"""
+
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Model, Q
+from PIL import Image, ImageOps
+
+from core.signals import image_processed
+from core.tasks import run_in_background
+
+THUMBNAIL_FORMATS = {
+    "webp": "WEBP",
+    "jpeg": "JPEG",
+}
+
+# форматы, в которых уменьшенный оригинал сохраняется как есть, остальные — в PNG
+DOWNSCALE_FORMATS = ("JPEG", "PNG", "WEBP")
+
+
+def thumbnail_name(name: str, width: int, extension: str) -> str:
+    """Кладём уменьшенную копию рядом с оригиналом: `photo.png` -> `photo_320w.webp`"""
+    root, _ = os.path.splitext(name)
+    return f"{root}_{width}w.{extension}"
+
+
+def generate_thumbnails(name: str) -> dict:
+    """
+    Создаём уменьшенные копии изображения для всех `IMAGE_THUMBNAIL_SIZES`.
+
+    Ширины больше оригинала пропускаются. Возвращаем словарь вида
+    `{"source": name, "webp": {"320": "...", ...}, "jpeg": {...}}`.
+    """
+    thumbnails = {"source": name}
+    thumbnails.update({extension: {} for extension in THUMBNAIL_FORMATS})
+
+    with default_storage.open(name, "rb") as file, Image.open(file) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        widths = [
+            width
+            for width in sorted(settings.IMAGE_THUMBNAIL_SIZES)
+            if width < image.width
+        ]
+        # маленький оригинал всё равно перекодируем, чтобы отдать его в WebP
+        for width in widths or [image.width]:
+            resized = image.copy()
+            resized.thumbnail((width, image.height))
+
+            for extension, image_format in THUMBNAIL_FORMATS.items():
+                buffer = io.BytesIO()
+                resized.save(
+                    buffer,
+                    image_format,
+                    quality=settings.IMAGE_THUMBNAIL_QUALITY,
+                    optimize=True,
+                )
+                thumb_name = thumbnail_name(name, width, extension)
+                if default_storage.exists(thumb_name):
+                    default_storage.delete(thumb_name)
+                thumbnails[extension][str(width)] = default_storage.save(
+                    thumb_name, ContentFile(buffer.getvalue())
+                )
+
+    return thumbnails
+
+
+def thumbnail_names(thumbnails: dict) -> set:
+    return {
+        name
+        for extension in THUMBNAIL_FORMATS
+        for name in (thumbnails or {}).get(extension, {}).values()
+    }
+
+
+def delete_thumbnails(thumbnails: dict):
+    for name in thumbnail_names(thumbnails):
+        default_storage.delete(name)
+
+
+def delete_stale_thumbnails(old: dict, new: dict):
+    """Удаляем прежние копии, которые не были перезаписаны новыми"""
+    for name in thumbnail_names(old) - thumbnail_names(new):
+        default_storage.delete(name)
+
+
+def update_thumbnails(model, pk: int, field_name: str):
+    """Пересоздаём уменьшенные копии для изображения объекта `model` с id `pk`"""
+    instance = model.objects.filter(pk=pk).only(field_name, "thumbnails").first()
+    if instance is None:
+        return False
+
+    name = getattr(instance, field_name).name or ""
+    if name == instance.thumbnails.get("source", ""):
+        return False
+
+    if name:
+        thumbnails = generate_thumbnails(name)
+        same_image = Q(**{field_name: name})
+    else:
+        thumbnails = {}
+        same_image = Q(**{field_name: ""}) | Q(**{f"{field_name}__isnull": True})
+
+    # пока копии создавались, изображение могли заменить ещё раз
+    updated = model.objects.filter(same_image, pk=pk).update(thumbnails=thumbnails)
+    if updated:
+        delete_stale_thumbnails(instance.thumbnails, thumbnails)
+    else:
+        delete_thumbnails(thumbnails)
+
+    return bool(updated)
+
+
+def downscale_image(model, pk: int, field_name: str):
+    """Уменьшаем оригинал, если одна из его сторон больше `IMAGE_MAX_DIMENSION`"""
+    name = model.objects.filter(pk=pk).values_list(field_name, flat=True).first()
+    if not name:
+        return False
+
+    max_dimension = settings.IMAGE_MAX_DIMENSION
+    with default_storage.open(name, "rb") as file, Image.open(file) as original:
+        if max(original.size) <= max_dimension:
+            return False
+
+        image_format = original.format
+        if image_format not in DOWNSCALE_FORMATS:
+            image_format = "PNG"
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((max_dimension, max_dimension))
+        if image_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, quality=settings.IMAGE_THUMBNAIL_QUALITY)
+
+    root, _ = os.path.splitext(name)
+    new_name = default_storage.save(
+        f"{root}.{image_format.lower()}", ContentFile(buffer.getvalue())
+    )
+    # пока изображение уменьшалось, его могли заменить ещё раз
+    if model.objects.filter(pk=pk, **{field_name: name}).update(
+        **{field_name: new_name}
+    ):
+        default_storage.delete(name)
+        return True
+
+    default_storage.delete(new_name)
+    return False
+
+
+def process_image(model, pk: int, field_name: str):
+    """Фоновая обработка загруженного изображения: уменьшение и создание копий"""
+    downscaled = downscale_image(model, pk, field_name)
+    if update_thumbnails(model, pk, field_name) or downscaled:
+        image_processed.send(sender=model, pk=pk, field_name=field_name)
+
+
+def schedule_image_processing(instance: Model, field_name: str):
+    """Ставим обработку изображения в фон, если изображение изменилось"""
+    name = getattr(instance, field_name).name or ""
+    if name != instance.thumbnails.get("source", ""):
+        run_in_background(process_image, type(instance), instance.pk, field_name)
+
+
+def build_srcset(thumbnails: dict, extension: str = "webp") -> str:
+    """Собираем значение атрибута `srcset`: `media/a_160w.webp 160w, ...`"""
+    return ", ".join(
+        f"{settings.MEDIA_URL}{name} {width}w"
+        for width, name in sorted(
+            (thumbnails or {}).get(extension, {}).items(), key=lambda item: int(item[0])
+        )
+    )
+
+
+def image_info(name, thumbnails: dict, alt: str) -> dict:
+    """Описание изображения для API: оригинал и наборы уменьшенных копий"""
+    return {
+        "src": f"{settings.MEDIA_URL}{name}",
+        "alt": alt,
+        "srcset": build_srcset(thumbnails, "webp"),
+        "srcsetJpeg": build_srcset(thumbnails, "jpeg"),
+    }
@@ -0,0 +1,18 @@
+"""Модуль для сбора внутренней статистики процесса для служебного API"""
+
+import os
+
+_providers = {}
+
+
+def register_stats(name: str, provider):
+    """Регистрируем функцию, которая возвращает статистику подсистемы"""
+    _providers[name] = provider
+
+
+def collect_stats() -> dict:
+    stats = {"pid": os.getpid()}
+    for name, provider in _providers.items():
+        stats[name] = provider()
+
+    return stats
@@ -0,0 +1,78 @@
+"""Команда для удаления медиафайлов, на которые не ссылается ни один объект"""
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from django.utils import timezone
+
+from core.images import thumbnail_names
+from core.storage import ContentAddressedStorage
+
+
+def referenced_names() -> set:
+    """Собираем имена файлов из всех файловых полей и уменьшенных копий"""
+    names = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                names.update(
+                    model._default_manager.exclude(**{field.attname: ""})
+                    .exclude(**{f"{field.attname}__isnull": True})
+                    .values_list(field.attname, flat=True)
+                    .iterator()
+                )
+            elif isinstance(field, models.JSONField) and field.name == "thumbnails":
+                for thumbnails in model._default_manager.values_list(
+                    field.attname, flat=True
+                ).iterator():
+                    names.update(thumbnail_names(thumbnails))
+
+    return names
+
+
+class Command(BaseCommand):
+    help = "Delete content-addressed media files that are no longer referenced"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-hours",
+            type=int,
+            default=settings.MEDIA_BLOB_GC_GRACE_HOURS,
+            help="Keep unreferenced files younger than this many hours",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list files that would be deleted",
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError(
+                "Garbage collection works only with ContentAddressedStorage"
+            )
+
+        # список файлов берём до ссылок: файл, сохранённый позже, не попадёт в обход
+        blobs = list(default_storage.iter_blobs())
+        references = referenced_names()
+        deadline = timezone.now() - timedelta(hours=options["grace_hours"])
+
+        deleted = 0
+        for name in blobs:
+            if name in references:
+                continue
+            if default_storage.get_modified_time(name) > deadline:
+                continue
+
+            if options["dry_run"]:
+                self.stdout.write(name)
+            else:
+                default_storage.purge(name)
+            deleted += 1
+
+        action = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(f"{action} {deleted} of {len(blobs)} files")
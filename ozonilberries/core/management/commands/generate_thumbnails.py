@@ -0,0 +1,51 @@
+"""Команда для создания уменьшенных копий уже загруженных изображений"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.images import delete_stale_thumbnails, generate_thumbnails
+
+IMAGE_MODELS = {
+    "products.ProductImage": "image",
+    "products.Category": "image",
+    "products.Subcategory": "image",
+    "users.Profile": "avatar",
+}
+
+
+class Command(BaseCommand):
+    help = "Generate WebP/JPEG thumbnails for images that do not have them yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate thumbnails even if they are up to date",
+        )
+
+    def handle(self, *args, **options):
+        for label, field_name in IMAGE_MODELS.items():
+            model = apps.get_model(label)
+            processed = 0
+            instances = (
+                model.objects.exclude(**{f"{field_name}__isnull": True})
+                .exclude(**{field_name: ""})
+                .only(field_name, "thumbnails")
+                .order_by("pk")
+            )
+            for instance in instances.iterator():
+                name = getattr(instance, field_name).name
+                if not options["force"] and name == instance.thumbnails.get("source"):
+                    continue
+
+                try:
+                    thumbnails = generate_thumbnails(name)
+                except (OSError, ValueError) as exc:
+                    self.stderr.write(f"{label} #{instance.pk} ({name}): {exc}")
+                    continue
+
+                model.objects.filter(pk=instance.pk).update(thumbnails=thumbnails)
+                delete_stale_thumbnails(instance.thumbnails, thumbnails)
+                processed += 1
+
+            self.stdout.write(f"{label}: {processed} images processed")
@@ -0,0 +1,149 @@
+"""Модуль для middleware: сжатие ответов, закрепление за основной БД и ответы 503"""
+
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from core.db import finish_routing, pin_user, start_routing
+from core.exceptions import ServiceBusy
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli необязателен
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+REPLICA_PIN_COOKIE = "replica_pin"
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+# brotli не добавляет случайного заполнения против BREACH, как `GZipMiddleware`,
+# поэтому им сжимаются только данные API и выгрузки, но не HTML с CSRF-токеном
+BROTLI_CONTENT_TYPES = ("application/json", "text/csv")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Класс middleware для сжатия ответов.
+
+    Сжимаются только текстовые ответы (JSON, CSV/JSONL, HTML) не короче
+    `COMPRESSION_MIN_SIZE`. Если установлен `brotli` и клиент его принимает,
+    обычный ответ JSON или CSV сжимается brotli, иначе (HTML, потоковые ответы
+    и ответы, использовавшие CSRF-токен) — gzip со встроенной в Django защитой
+    от BREACH. Изображения и другие уже сжатые файлы отдаются как есть.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_CONTENT_TYPES):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if (
+            brotli is None
+            or response.streaming
+            or not re_accepts_brotli.search(accept_encoding)
+            or not response.get("Content-Type", "").startswith(BROTLI_CONTENT_TYPES)
+            or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        compressed_content = brotli.compress(
+            response.content, quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response.headers["Content-Length"] = str(len(response.content))
+        # сжатый ответ побайтово отличается от исходного: ETag становится слабым
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+
+        return response
+
+
+class ReplicaPinMiddleware:
+    """
+    Класс middleware для чтения своих записей при работе с репликами.
+
+    После запроса, в котором была запись в БД, клиент на `REPLICA_PIN_SECONDS`
+    получает cookie (а пользователь — отметку в кэше), и в это время все его
+    запросы читают только с основной БД, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            pinned_until = float(request.COOKIES.get(REPLICA_PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+
+        token = start_routing(pinned=pinned_until > time.time())
+        try:
+            response = self.get_response(request)
+        finally:
+            state = finish_routing(token)
+
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                str(int(time.time()) + settings.REPLICA_PIN_SECONDS),
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+            pin_user(getattr(request, "user", None))
+
+        return response
+
+
+class ServiceBusyMiddleware:
+    """
+    Класс middleware, который отвечает 503 с `Retry-After` на `ServiceBusy`.
+
+    Нужен для представлений вне DRF (админка, вход через `authenticate()`):
+    в API исключение обрабатывает `core.exceptions.api_exception_handler`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, ServiceBusy):
+            return None
+
+        response = HttpResponse(
+            exception.message,
+            status=503,
+            content_type="text/plain; charset=utf-8",
+        )
+        response.headers["Retry-After"] = str(exception.retry_after)
+
+        return response
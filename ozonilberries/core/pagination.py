@@ -0,0 +1,193 @@
+"""Модуль для курсорной пагинации по составному ключу сортировки"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _to_cursor_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Курсорная пагинация по набору полей сортировки (keyset pagination).
+
+    В курсоре хранятся значения полей сортировки последней строки страницы,
+    следующая страница выбирается условием «строго после этих значений».
+    В отличие от `CursorPagination` из DRF повторы в первом поле сортировки
+    не превращаются в OFFSET, поэтому последнее поле должно быть уникальным.
+    """
+
+    page_size = 10
+    max_page_size = 50
+    page_size_query_param = "limit"
+    cursor_query_param = "cursor"
+    sort_query_param = "sort"
+    # название сортировки -> поля для `order_by`, последнее поле уникально
+    sort_options = {}
+    default_sort = None
+    invalid_cursor_message = "Некорректный курсор."
+
+    def get_sort(self, request) -> str:
+        sort = request.query_params.get(self.sort_query_param, self.default_sort)
+        if sort not in self.sort_options:
+            raise ValidationError(
+                {
+                    self.sort_query_param: [
+                        f"Допустимые значения: {', '.join(self.sort_options)}."
+                    ]
+                }
+            )
+
+        return sort
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(
+                request.query_params.get(self.page_size_query_param, self.page_size)
+            )
+        except ValueError:
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request, model, ordering):
+        """
+        Получаем значения полей сортировки из курсора.
+
+        Курсор приходит от клиента, поэтому каждое значение приводится
+        `to_python()` поля модели; неподходящий курсор даёт 404, как
+        в `CursorPagination` из DRF, а не ошибку при построении запроса.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            position = json.loads(urlsafe_b64decode(encoded.encode()))
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            position = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(ordering, position)
+            ]
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+
+        return position
+
+    def encode_cursor(self, position) -> str:
+        return urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    @staticmethod
+    def after_position(ordering, position) -> Q:
+        """Условие «строка идёт после `position`» для сортировки `ordering`"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.sort = self.get_sort(request)
+        ordering = self.sort_options[self.sort]
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*ordering)
+        position = self.decode_cursor(request, queryset.model, ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after_position(ordering, position))
+
+        rows = list(queryset[: page_size + 1])
+        self.next_position = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = [
+                _to_cursor_value(getattr(rows[-1], field.lstrip("-")))
+                for field in ordering
+            ]
+
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_first_link(self):
+        url = self.request.build_absolute_uri()
+        return remove_query_param(url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "sort": self.sort,
+                "next": self.get_next_link(),
+                "first": self.get_first_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "sort": {"type": "string", "example": self.default_sort},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "first": {"type": "string", "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor from the `next` link",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.sort_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Sort order: {', '.join(self.sort_options)}",
+                "schema": {"type": "string", "enum": list(self.sort_options)},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results per page",
+                "schema": {"type": "integer"},
+            },
+        ]
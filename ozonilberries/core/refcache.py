@@ -0,0 +1,129 @@
+"""Модуль для кэша небольших справочных данных в памяти процесса"""
+
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from core.db import read_from_primary
+from core.instrumentation import register_stats
+
+
+class ReferenceCache:
+    """
+    Потокобезопасный LRU-кэш с TTL для справочных данных.
+
+    Каждый справочник регистрируется с функцией загрузки и моделями, от которых
+    он зависит. Изменение этих моделей сбрасывает запись в текущем процессе и
+    меняет версию справочника в кэше `REFERENCE_CACHE_ALIAS`, по которой
+    остальные процессы узнают, что их копия устарела. Если этот кэш в памяти
+    процесса (`LocMemCache`), сброс работает только в текущем процессе,
+    а остальные видят изменения через `REFERENCE_CACHE_TTL` (см. `core.W003`).
+    """
+
+    version_key_prefix = "refcache:version"
+
+    def __init__(self, max_size: int = None, ttl: int = None):
+        self.max_size = max_size or settings.REFERENCE_CACHE_MAX_SIZE
+        self.ttl = ttl if ttl is not None else settings.REFERENCE_CACHE_TTL
+        self.loaders = {}
+        self.entries = OrderedDict()
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, loader, models=()):
+        """Регистрируем справочник `name` и сбрасываем его при изменении `models`"""
+        self.loaders[name] = loader
+        self.stats[name] = {"hits": 0, "misses": 0, "invalidations": 0}
+
+        def invalidate(sender, **kwargs):
+            transaction.on_commit(lambda: self.invalidate(name))
+
+        for model in models:
+            uid = f"refcache:{name}:{model._meta.label}"
+            post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+            for field in model._meta.local_many_to_many:
+                m2m_changed.connect(
+                    invalidate,
+                    sender=field.remote_field.through,
+                    weak=False,
+                    dispatch_uid=f"{uid}:{field.name}",
+                )
+
+    @property
+    def version_cache(self):
+        return caches[settings.REFERENCE_CACHE_ALIAS]
+
+    def version_key(self, name: str) -> str:
+        return f"{self.version_key_prefix}:{name}"
+
+    def get(self, name: str):
+        """Получаем справочник из памяти процесса или загружаем его из БД"""
+        version = self.version_cache.get(self.version_key(name))
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                self.entries.move_to_end(name)
+                self.stats[name]["hits"] += 1
+                return entry[2]
+            self.stats[name]["misses"] += 1
+
+        # загрузка идёт без блокировки, чтобы медленный запрос не задерживал
+        # чтение других справочников; загруженная копия нужна всем клиентам,
+        # поэтому читаем с основной БД, а не с отстающей реплики
+        with read_from_primary():
+            value = self.loaders[name]()
+
+        with self.lock:
+            self.entries[name] = (version, now + self.ttl, value)
+            self.entries.move_to_end(name)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+        return value
+
+    def invalidate(self, name: str):
+        """Сбрасываем справочник во всех процессах"""
+        with self.lock:
+            self.entries.pop(name, None)
+            self.stats[name]["invalidations"] += 1
+
+        # случайная версия, а не счётчик: если кэш вытеснит ключ, новая версия
+        # всё равно не совпадёт с версией старой копии в другом процессе
+        self.version_cache.set(self.version_key(name), uuid4().hex, timeout=None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = {
+                "size": len(self.entries),
+                "maxSize": self.max_size,
+                "ttl": self.ttl,
+                "entries": {},
+            }
+            for name, counters in self.stats.items():
+                requests = counters["hits"] + counters["misses"]
+                stats["entries"][name] = {
+                    **counters,
+                    "hitRate": (
+                        round(counters["hits"] / requests, 4) if requests else None
+                    ),
+                    "cached": name in self.entries,
+                }
+
+        return stats
+
+
+reference_cache = ReferenceCache()
+register_stats("referenceCache", reference_cache.get_stats)
@@ -0,0 +1,92 @@
+"""Модуль для облегчённой сериализации списков из строк `values()`"""
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from core.fieldsets import get_requested_fields
+
+
+class RowListSerializer(serializers.ListSerializer):
+    """
+    Класс сериалайзера для списка строк.
+
+    Перед сериализацией дочерний сериалайзер один раз загружает связанные
+    данные для всех строк страницы (`prepare_rows`). Если в запросе указан
+    `?fields=`, в ответе остаются только эти поля.
+    """
+
+    def to_representation(self, data):
+        rows = list(data)
+        self.child.requested_fields = get_requested_fields(self.context.get("request"))
+        self.child.prepare_rows(rows)
+        items = [self.child.to_representation(row) for row in rows]
+
+        requested = self.child.requested_fields
+        if requested is None:
+            return items
+
+        return [
+            {name: value for name, value in item.items() if name in requested}
+            for item in items
+        ]
+
+
+class RowSerializer(serializers.BaseSerializer):
+    """
+    Базовый класс облегчённого сериалайзера только для чтения.
+
+    Работает со словарями из `queryset.values(*row_fields)` вместо экземпляров
+    моделей и не создаёт поля DRF на каждый объект. Результат должен
+    совпадать с обычным сериалайзером списка, для которого он написан.
+    """
+
+    row_fields = ()
+    requested_fields = None
+
+    class Meta:
+        list_serializer_class = RowListSerializer
+
+    @classmethod
+    def get_rows(cls, queryset):
+        """Превращаем queryset представления в queryset строк"""
+        return queryset.prefetch_related(None).values(*cls.row_fields)
+
+    def is_requested(self, name: str) -> bool:
+        """Проверяем, нужно ли поле в ответе (см. `?fields=`)"""
+        return self.requested_fields is None or name in self.requested_fields
+
+    def prepare_rows(self, rows: list):
+        """Загружаем связанные данные для всех строк одним запросом на связь"""
+
+    def to_representation(self, row: dict):
+        raise NotImplementedError("`to_representation()` must be implemented.")
+
+
+class RowListMixin:
+    """
+    Миксин для `list`, который сериализует страницу через `row_serializer_class`.
+
+    Отключается настройкой `FAST_LIST_SERIALIZATION`; схема API и остальные
+    действия по-прежнему используют `serializer_class`.
+    """
+
+    row_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.row_serializer_class is None or not settings.FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.row_serializer_class.get_rows(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = self.row_serializer_class(
+            queryset if page is None else page,
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+
+        return Response(serializer.data)
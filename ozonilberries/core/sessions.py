@@ -0,0 +1,137 @@
+"""Модуль для хранилища сессий: анонимные сессии в кэше, сессии пользователей в БД"""
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends import cache as cache_backend
+from django.contrib.sessions.backends.base import CreateError, UpdateError
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+from core.caches import is_cache_shared
+
+# тот же префикс, что у `django.contrib.sessions.backends.cache`
+ANONYMOUS_KEY_PREFIX = cache_backend.KEY_PREFIX
+
+
+class SessionStore(CachedDBStore):
+    """
+    Класс хранилища сессий для `SESSION_ENGINE = "core.sessions"`.
+
+    Сессия анонимного покупателя (например, с ключом корзины) хранится только
+    в кэше `SESSION_CACHE_ALIAS` и не пишет строку в `django_session`. Как
+    только в сессии появляется пользователь (`login()`), она сохраняется в БД
+    как у `cached_db` и дальше живёт там.
+    """
+
+    anonymous_key_prefix = ANONYMOUS_KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        # сессия уже записана в БД
+        self._persistent = False
+
+    def _anonymous_cache_key(self, session_key: str) -> str:
+        return self.anonymous_key_prefix + session_key
+
+    def load(self):
+        try:
+            data = self._cache.get(self._anonymous_cache_key(self._session_key))
+        except Exception:
+            # см. `cached_db.SessionStore.load`
+            data = None
+        if data is not None:
+            return data
+
+        data = super().load()
+        self._persistent = self._session_key is not None
+
+        return data
+
+    def exists(self, session_key):
+        return bool(session_key) and (
+            self._anonymous_cache_key(session_key) in self._cache
+            or super().exists(session_key)
+        )
+
+    def create(self):
+        # кэш может молча не сохранить сессию, поэтому попыток конечное число
+        for i in range(10000):
+            self._session_key = self._get_new_session_key()
+            self._persistent = False
+            try:
+                self.save(must_create=True)
+            except CreateError:
+                continue
+            self.modified = True
+            return
+        raise RuntimeError(
+            "Unable to create a new session key. "
+            "It is likely that the cache is unavailable."
+        )
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+
+        data = self._get_session(no_load=must_create)
+        if self._persistent or SESSION_KEY in data:
+            self._save_persistent(must_create)
+        else:
+            self._save_anonymous(data, must_create)
+
+    def _save_persistent(self, must_create: bool):
+        """Сохраняем сессию пользователя в БД и кэш `cached_db`"""
+        promoted = not self._persistent
+        super().save(must_create=must_create or promoted)
+        self._persistent = True
+
+        if promoted:
+            self._cache.delete(self._anonymous_cache_key(self.session_key))
+
+    def _save_anonymous(self, data: dict, must_create: bool):
+        """Сохраняем анонимную сессию только в кэш, как `cache.SessionStore`"""
+        cache_key = self._anonymous_cache_key(self.session_key)
+        if must_create:
+            func = self._cache.add
+        elif self._cache.get(cache_key) is not None:
+            func = self._cache.set
+        else:
+            raise UpdateError
+
+        result = func(cache_key, data, self.get_expiry_age())
+        if must_create and not result:
+            raise CreateError
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+
+        self._cache.delete(self._anonymous_cache_key(session_key))
+        super().delete(session_key)
+
+
+def is_session_cache_shared() -> bool:
+    """Проверяем, видят ли кэш сессий другие процессы (например, команды)"""
+    return is_cache_shared(settings.SESSION_CACHE_ALIAS)
+
+
+def are_anonymous_sessions_cached() -> bool:
+    """
+    Проверяем, хранятся ли анонимные сессии в кэше, видном другим процессам.
+
+    Только тогда у корзины без строки в `django_session` может быть живая
+    сессия, которую стоит искать в кэше (`get_live_anonymous_session_keys`).
+    """
+    return settings.SESSION_ENGINE == "core.sessions" and is_session_cache_shared()
+
+
+def get_live_anonymous_session_keys(session_keys) -> set:
+    """Получаем ключи анонимных сессий, которые ещё есть в кэше"""
+    store = SessionStore()
+    found = store._cache.get_many(
+        [store._anonymous_cache_key(session_key) for session_key in session_keys]
+    )
+    prefix_length = len(store.anonymous_key_prefix)
+
+    return {cache_key[prefix_length:] for cache_key in found}
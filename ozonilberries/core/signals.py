@@ -0,0 +1,6 @@
+"""Модуль для описания сигналов общих инструментов"""
+
+from django.dispatch import Signal
+
+# отправляется после фоновой обработки изображения, аргументы: pk, field_name
+image_processed = Signal()
@@ -0,0 +1,88 @@
+"""Модуль для хранилища медиафайлов с именами по хэшу содержимого"""
+
+import hashlib
+import os
+import re
+from uuid import uuid4
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIRECTORY = "blobs"
+
+BLOB_NAME_RE = re.compile(
+    rf"{BLOB_DIRECTORY}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/(?P<digest>[0-9a-f]{{64}})(\.\w+)?"
+)
+
+
+def content_digest(content: File) -> str:
+    """Считаем sha256 файла по частям, не загружая его в память целиком"""
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk.encode() if isinstance(chunk, str) else chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+
+    return digest.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, в котором имя файла — sha256 его содержимого.
+
+    Одинаковые изображения разных товаров хранятся один раз, а файл под
+    заданным именем никогда не меняется, поэтому его можно кэшировать навсегда.
+    Файлы не удаляются при замене или удалении объекта: их могут использовать
+    другие объекты. Неиспользуемые файлы удаляет команда `collect_media_garbage`.
+    """
+
+    def blob_name(self, digest: str, name: str) -> str:
+        extension = os.path.splitext(name)[1].lower()
+        return f"{BLOB_DIRECTORY}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        return super().save(
+            self.blob_name(content_digest(content), name), content, max_length
+        )
+
+    def get_available_name(self, name, max_length=None):
+        # одно и то же имя означает одно и то же содержимое
+        return name
+
+    def _save(self, name, content):
+        try:
+            # файл снова используется: `collect_media_garbage` отсчитывает
+            # срок хранения неиспользуемых файлов от этого момента
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            pass
+        else:
+            return name
+
+        # пишем во временный файл и атомарно переименовываем, чтобы
+        # параллельная загрузка не увидела недописанный файл
+        temp_name = super()._save(f"{name}.{uuid4().hex}.tmp", content)
+        os.replace(self.path(temp_name), self.path(name))
+
+        return name
+
+    def delete(self, name):
+        """Файл может использоваться другими объектами, удаляем только в `purge`"""
+
+    def purge(self, name):
+        super().delete(name)
+
+    def iter_blobs(self):
+        """Обходим все сохранённые файлы хранилища"""
+        root = self.path(BLOB_DIRECTORY)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                yield os.path.relpath(path, self.location).replace("\\", "/")
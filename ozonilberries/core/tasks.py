@@ -0,0 +1,47 @@
+"""Модуль для запуска фоновых задач в пуле потоков после фиксации транзакции"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_TASK_WORKERS,
+            thread_name_prefix="background-task",
+        )
+
+    return _executor
+
+
+def _run(func, args, kwargs):
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+    finally:
+        # у каждого потока пула своё соединение с БД
+        close_old_connections()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Запускаем задачу в фоновом потоке после фиксации текущей транзакции.
+
+    При `BACKGROUND_TASKS_EAGER` задача выполняется сразу в текущем потоке,
+    что удобно для management-команд и отладки.
+    """
+    if settings.BACKGROUND_TASKS_EAGER:
+        transaction.on_commit(lambda: func(*args, **kwargs))
+        return
+
+    transaction.on_commit(lambda: _get_executor().submit(_run, func, args, kwargs))
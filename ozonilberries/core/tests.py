@@ -0,0 +1,161 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from core import middleware
+from core.middleware import CompressionMiddleware
+from core.refcache import ReferenceCache
+from core.sessions import SessionStore
+from core.storage import ContentAddressedStorage
+from core.throttling import IPThrottle
+
+
+class AnonymousSessionStoreTests(TestCase):
+    def test_anonymous_session_is_kept_only_in_cache(self):
+        session = SessionStore()
+        session["basket"] = True
+        session.save()
+
+        self.assertFalse(
+            Session.objects.filter(session_key=session.session_key).exists()
+        )
+        self.assertTrue(SessionStore().exists(session.session_key))
+
+    def test_session_survives_culling_of_default_cache(self):
+        session = SessionStore()
+        session["basket"] = True
+        session.save()
+
+        for number in range(400):
+            cache.set(f"filler:{number}", number)
+
+        self.assertTrue(SessionStore().exists(session.session_key))
+        self.assertEqual(SessionStore(session.session_key)["basket"], True)
+
+    def test_session_moves_to_database_after_login(self):
+        session = SessionStore()
+        session["basket"] = True
+        session.save()
+
+        session[SESSION_KEY] = "1"
+        session.save()
+
+        self.assertTrue(
+            Session.objects.filter(session_key=session.session_key).exists()
+        )
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ContentAddressedStorage(location=directory.name)
+
+    def test_same_content_is_stored_once(self):
+        first = self.storage.save("a.jpg", ContentFile(b"image"))
+        second = self.storage.save("b.jpg", ContentFile(b"image"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(list(self.storage.iter_blobs())), 1)
+
+    def test_duplicate_upload_refreshes_modified_time(self):
+        name = self.storage.save("a.jpg", ContentFile(b"image"))
+        week_ago = time.time() - 7 * 24 * 3600
+        os.utime(self.storage.path(name), (week_ago, week_ago))
+
+        self.storage.save("b.jpg", ContentFile(b"image"))
+
+        self.assertGreater(os.path.getmtime(self.storage.path(name)), week_ago + 60)
+
+
+@unittest.skipIf(middleware.brotli is None, "brotli is not installed")
+@override_settings(COMPRESSION_MIN_SIZE=10)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def compress(self, content_type: str, use_csrf=False) -> str:
+        request = APIRequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br")
+        if use_csrf:
+            get_token(request)
+        response = HttpResponse("x" * 1000, content_type=content_type)
+
+        return CompressionMiddleware(lambda _: response)(request)["Content-Encoding"]
+
+    def test_brotli_is_used_only_for_api_data(self):
+        self.assertEqual(self.compress("application/json"), "br")
+        self.assertEqual(self.compress("text/csv"), "br")
+        self.assertEqual(self.compress("text/html"), "gzip")
+
+    def test_response_with_csrf_token_is_gzipped(self):
+        self.assertEqual(self.compress("application/json", use_csrf=True), "gzip")
+
+
+class ThrottledView:
+    throttle_scope = "sign_in"
+
+
+@override_settings(
+    REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": {"sign_in_ip": "2/min"}},
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+
+    def allow(self) -> bool:
+        throttle = IPThrottle()
+        allowed = throttle.allow_request(self.request, ThrottledView())
+        self.wait = throttle.wait()
+
+        return allowed
+
+    @mock.patch("core.throttling.time.time")
+    def test_bucket_refills_over_period(self, now):
+        now.return_value = 1000.0
+        self.assertEqual([self.allow() for _ in range(3)], [True, True, False])
+        self.assertAlmostEqual(self.wait, 30.0)
+
+        now.return_value = 1030.0
+        self.assertEqual([self.allow() for _ in range(2)], [True, False])
+
+
+class ReferenceCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.loads = 0
+        # два экземпляра с общим кэшем версий, как в двух процессах
+        self.first, self.second = ReferenceCache(), ReferenceCache()
+        for reference_cache in (self.first, self.second):
+            reference_cache.register("numbers", self.load)
+
+    def load(self) -> int:
+        self.loads += 1
+        return self.loads
+
+    def test_invalidation_reaches_other_instances(self):
+        self.assertEqual(self.first.get("numbers"), 1)
+        self.assertEqual(self.second.get("numbers"), 2)
+        self.assertEqual(self.second.get("numbers"), 2)
+
+        self.first.invalidate("numbers")
+
+        self.assertEqual(self.second.get("numbers"), 3)
+
+    def test_evicted_version_does_not_revive_stale_copy(self):
+        self.first.invalidate("numbers")
+        self.assertEqual(self.second.get("numbers"), 1)
+
+        cache.clear()
+        self.first.invalidate("numbers")
+
+        self.assertEqual(self.second.get("numbers"), 2)
@@ -0,0 +1,125 @@
+"""Модуль для ограничения частоты запросов по алгоритму token bucket"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: str) -> tuple:
+    """Разбираем лимит вида `5/min` в (ёмкость корзины, период в секундах)"""
+    num, period = rate.split("/")
+
+    return int(num), DURATIONS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый класс ограничения частоты запросов по алгоритму token bucket.
+
+    Лимит берётся из `DEFAULT_THROTTLE_RATES` по ключу
+    `<throttle_scope представления>_<scope_suffix>`; если лимита нет,
+    запросы не ограничиваются. Лимит `N/период` означает корзину на N
+    запросов, которая равномерно пополняется за период, то есть допускает
+    всплеск до N запросов. Корзины хранятся в кэше `THROTTLE_CACHE_ALIAS`,
+    который должен быть общим для всех процессов (Redis): с `LocMemCache`
+    каждый процесс считает свой лимит, и N процессов пропускают в N раз
+    больше запросов (см. проверку `core.W002`, в тестах `LocMemCache`
+    подходит). Чтение и запись корзины не атомарны: при одновременных
+    запросах лимит может быть превышен на несколько запросов, что для защиты
+    от перебора допустимо.
+    """
+
+    scope_suffix = None
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        self.scope = None
+        self.wait_seconds = None
+
+    def get_rate(self, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return None
+
+        self.scope = f"{scope}_{self.scope_suffix}"
+
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope) or None
+
+    def get_ident_key(self, request, view):
+        """Получаем идентификатор клиента или None, чтобы не ограничивать запрос"""
+        raise NotImplementedError(".get_ident_key() must be overridden")
+
+    def allow_request(self, request, view):
+        rate = self.get_rate(view)
+        if rate is None:
+            return True
+
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return True
+
+        capacity, duration = parse_rate(rate)
+        refill_per_second = capacity / duration
+        key = self.cache_format % {
+            "scope": self.scope,
+            "ident": hashlib.sha256(str(ident).encode()).hexdigest()[:32],
+        }
+
+        now = time.time()
+        tokens, updated_at = self.cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill_per_second
+            return False
+
+        self.cache.set(key, (tokens - 1, now), duration)
+
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Ограничение по IP-адресу клиента"""
+
+    scope_suffix = "ip"
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    """Ограничение по имени пользователя из тела запроса входа или регистрации"""
+
+    scope_suffix = "username"
+
+    def get_ident_key(self, request, view):
+        data = request.data
+        username = data.get("username") if hasattr(data, "get") else None
+        if not isinstance(username, str) or not username:
+            return None
+
+        return username.strip().lower()
+
+
+class UserWriteThrottle(TokenBucketThrottle):
+    """Ограничение изменяющих запросов по пользователю (для анонимов — по IP)"""
+
+    scope_suffix = "user"
+
+    def get_ident_key(self, request, view):
+        if request.method in SAFE_METHODS:
+            return None
+        if request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+
+        return f"ip:{self.get_ident(request)}"
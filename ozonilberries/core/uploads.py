@@ -0,0 +1,55 @@
+"""Модуль для потоковой загрузки файлов во временный файл с ограничением размера"""
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+
+
+def get_upload_max_size(request) -> int:
+    """
+    Берём ограничение размера загрузки для текущего представления.
+
+    Представление может задать атрибут `upload_max_size`, иначе
+    используется `FILE_UPLOAD_MAX_SIZE`.
+    """
+    view = getattr(getattr(request, "resolver_match", None), "func", None)
+    view_class = getattr(view, "cls", None) or getattr(view, "view_class", None)
+    max_size = getattr(view_class, "upload_max_size", None)
+
+    return max_size or settings.FILE_UPLOAD_MAX_SIZE
+
+
+class MaxSizeTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Обработчик загрузки, который сразу пишет файл на диск, не держа его в памяти.
+
+    Запрос отклоняется по `Content-Length` ещё до чтения тела, а если длина
+    не указана — как только записанные данные превысят ограничение.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = get_upload_max_size(request)
+        self.received = 0
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        if content_length and content_length > self.max_size:
+            self.raise_too_big()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            if self.file is not None:
+                self.file.close()
+            self.raise_too_big()
+
+        return super().receive_data_chunk(raw_data, start)
+
+    def raise_too_big(self):
+        raise RequestDataTooBig(
+            f"Размер загружаемых файлов не должен превышать "
+            f"{filesizeformat(self.max_size)}."
+        )
@@ -0,0 +1,28 @@
+"""Модуль для описания urls общих инструментов"""
+
+import re
+
+from django.conf import settings
+from django.urls import path, re_path
+
+from core.views import InstrumentationAPIView, serve_media
+
+app_name = "core"
+
+urlpatterns = [
+    path(
+        "api/instrumentation/",
+        InstrumentationAPIView.as_view(),
+        name="instrumentation",
+    ),
+]
+
+if settings.MEDIA_SERVE:
+    # в продакшене медиафайлы отдаёт веб-сервер или CDN
+    urlpatterns.append(
+        re_path(
+            rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.+)$",
+            serve_media,
+            name="media",
+        )
+    )
@@ -0,0 +1,63 @@
+"""Модуль для отдачи медиафайлов и служебной статистики процесса"""
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
+from django.views.static import serve
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.instrumentation import collect_stats
+from core.storage import BLOB_NAME_RE
+
+
+@require_safe
+def serve_media(request, path: str):
+    """
+    Отдаём медиафайл.
+
+    Подключается только при `MEDIA_SERVE`. Файлы с именем по хэшу содержимого
+    не меняются, поэтому отдаются с `Cache-Control: immutable` и ETag, равным
+    хэшу. Остальные файлы отдаются только при `DEBUG`, как `static()`.
+    """
+    match = BLOB_NAME_RE.fullmatch(path)
+    if match is None:
+        if not settings.DEBUG:
+            raise Http404("Файл не найден.")
+        return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    etag = f'"{match["digest"]}"'
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            response = FileResponse(default_storage.open(path, "rb"))
+        except FileNotFoundError:
+            raise Http404("Файл не найден.")
+
+    response["ETag"] = etag
+    patch_cache_control(
+        response, public=True, max_age=settings.MEDIA_BLOB_MAX_AGE, immutable=True
+    )
+
+    return response
+
+
+class InstrumentationAPIView(APIView):
+    """APIView для просмотра внутренней статистики процесса"""
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        tags=["instrumentation"],
+        summary="Посмотреть статистику кэшей процесса",
+        description="Get in-process cache statistics of the worker that handled the request",
+        responses={200: dict},
+    )
+    def get(self, request):
+        """Метод для получения статистики текущего процесса"""
+        return Response(collect_stats())
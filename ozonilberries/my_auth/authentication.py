@@ -0,0 +1,131 @@
+"""Модуль для классов аутентификации API с кэшем токенов и замером времени"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import authentication
+
+from core.caches import is_cache_shared
+from core.instrumentation import register_stats
+
+
+def get_token_cache_key(key: str) -> str:
+    """Ключ кэша для токена: сам токен в кэш не попадает"""
+    return "auth:token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_tokens(*keys: str):
+    """Сбрасываем закэшированных пользователей для токенов"""
+    caches[settings.AUTH_TOKEN_CACHE_ALIAS].delete_many(
+        [get_token_cache_key(key) for key in keys]
+    )
+
+
+class AuthenticationStats:
+    """Счётчики вызовов и времени аутентификации в текущем процессе"""
+
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def incr(self, name: str, counter: str, value=1):
+        with self.lock:
+            counters = self.counters.setdefault(
+                name, {"calls": 0, "authenticated": 0, "seconds": 0.0}
+            )
+            counters[counter] = counters.get(counter, 0) + value
+
+    def record(self, name: str, seconds: float, authenticated: bool):
+        self.incr(name, "calls")
+        self.incr(name, "seconds", seconds)
+        if authenticated:
+            self.incr(name, "authenticated")
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = {}
+            for name, counters in self.counters.items():
+                seconds = counters["seconds"]
+                stats[name] = {
+                    **{
+                        key: value
+                        for key, value in counters.items()
+                        if key != "seconds"
+                    },
+                    "totalMs": round(seconds * 1000, 3),
+                    "avgMs": (
+                        round(seconds * 1000 / counters["calls"], 4)
+                        if counters["calls"]
+                        else None
+                    ),
+                }
+
+        return stats
+
+
+authentication_stats = AuthenticationStats()
+register_stats("authentication", authentication_stats.get_stats)
+
+
+class MeasuredAuthenticationMixin:
+    """Миксин, который учитывает время каждой попытки аутентификации"""
+
+    def authenticate(self, request):
+        started = time.perf_counter()
+        result = None
+        try:
+            result = super().authenticate(request)
+            return result
+        finally:
+            authentication_stats.record(
+                type(self).__name__, time.perf_counter() - started, result is not None
+            )
+
+
+class CachedTokenAuthentication(
+    MeasuredAuthenticationMixin, authentication.TokenAuthentication
+):
+    """
+    Класс аутентификации по токену с кэшем «токен → пользователь».
+
+    Пользователь хранится в кэше `AUTH_TOKEN_CACHE_ALIAS`
+    `AUTH_TOKEN_CACHE_TIMEOUT` секунд, поэтому повторные запросы клиента
+    не обращаются к БД. Удаление токена и изменение пользователя (пароль,
+    `is_active`, права) сбрасывают кэш (см. `my_auth.signals`). Сброс виден
+    всем процессам только в общем кэше, поэтому с кэшем в памяти процесса
+    токен каждый раз проверяется по БД. В `request.auth` передаётся строка
+    токена.
+    """
+
+    def authenticate_credentials(self, key):
+        if not is_cache_shared(settings.AUTH_TOKEN_CACHE_ALIAS):
+            user, token = super().authenticate_credentials(key)
+            return user, token.key
+
+        cache = caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+        cache_key = get_token_cache_key(key)
+        user = cache.get(cache_key)
+        if user is not None:
+            authentication_stats.incr(type(self).__name__, "cacheHits")
+            return user, key
+
+        authentication_stats.incr(type(self).__name__, "cacheMisses")
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, user, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+        return user, token.key
+
+
+class BasicAuthentication(
+    MeasuredAuthenticationMixin, authentication.BasicAuthentication
+):
+    """Класс Basic-аутентификации: хэширует пароль на каждом запросе"""
+
+
+class SessionAuthentication(
+    MeasuredAuthenticationMixin, authentication.SessionAuthentication
+):
+    """Класс аутентификации по сессии"""
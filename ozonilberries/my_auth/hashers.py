@@ -0,0 +1,120 @@
+"""Модуль для хэширования паролей в ограниченном пуле исполнителей"""
+
+import atexit
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+from core.exceptions import ServiceBusy
+from core.instrumentation import register_stats
+
+
+class PasswordHashingBusy(ServiceBusy):
+    """Исключение, когда пул хэширования не освободился за время ожидания"""
+
+    message = "Сервис входа перегружен, повторите попытку позже."
+
+
+def _pbkdf2_encode(password, salt, iterations):
+    """Хэшируем пароль обычным хэшером (функция должна сериализоваться для процессов)"""
+    return PBKDF2PasswordHasher().encode(password, salt, iterations)
+
+
+class HashingPool:
+    """
+    Пул для хэширования паролей с ограничением параллельности.
+
+    Одновременно хэшируется не больше `PASSWORD_HASHING_CONCURRENCY`
+    паролей, остальные запросы ждут свободного места не дольше
+    `PASSWORD_HASHING_QUEUE_TIMEOUT` секунд и получают 503. Так волна
+    входов занимает не больше заданного числа ядер, а каталог и корзина
+    продолжают отвечать. PBKDF2 из `hashlib` отпускает GIL, поэтому по
+    умолчанию используются потоки; `PASSWORD_HASHING_EXECUTOR=process`
+    переносит хэширование в отдельные процессы.
+    """
+
+    def __init__(self):
+        self.executor = None
+        self.slots = None
+        self.lock = threading.Lock()
+        self.stats = {"calls": 0, "rejected": 0, "waitSeconds": 0.0, "hashSeconds": 0.0}
+
+    def _get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                workers = settings.PASSWORD_HASHING_CONCURRENCY
+                if settings.PASSWORD_HASHING_EXECUTOR == "process":
+                    self.executor = ProcessPoolExecutor(max_workers=workers)
+                    atexit.register(self.executor.shutdown)
+                else:
+                    self.executor = ThreadPoolExecutor(
+                        max_workers=workers, thread_name_prefix="password-hashing"
+                    )
+                self.slots = threading.BoundedSemaphore(workers)
+
+        return self.executor
+
+    def _count(self, counter: str, value=1):
+        with self.lock:
+            self.stats[counter] += value
+
+    def run(self, func, *args):
+        """Выполняем `func(*args)` в пуле, дождавшись свободного места"""
+        executor = self._get_executor()
+        started = time.perf_counter()
+        if not self.slots.acquire(timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT):
+            self._count("rejected")
+            raise PasswordHashingBusy()
+
+        waited = time.perf_counter() - started
+        try:
+            return executor.submit(func, *args).result()
+        finally:
+            self.slots.release()
+            self._count("calls")
+            self._count("waitSeconds", waited)
+            self._count("hashSeconds", time.perf_counter() - started - waited)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            calls = self.stats["calls"]
+            return {
+                "executor": settings.PASSWORD_HASHING_EXECUTOR,
+                "concurrency": settings.PASSWORD_HASHING_CONCURRENCY,
+                "calls": calls,
+                "rejected": self.stats["rejected"],
+                "avgWaitMs": (
+                    round(self.stats["waitSeconds"] * 1000 / calls, 3)
+                    if calls
+                    else None
+                ),
+                "avgHashMs": (
+                    round(self.stats["hashSeconds"] * 1000 / calls, 3)
+                    if calls
+                    else None
+                ),
+            }
+
+
+hashing_pool = HashingPool()
+register_stats("passwordHashing", hashing_pool.get_stats)
+
+
+class BoundedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Класс хэшера PBKDF2, который считает хэш в `hashing_pool`.
+
+    Алгоритм и формат хэша не меняются, поэтому существующие пароли
+    проверяются как прежде. Через этот хэшер проходят `make_password`,
+    `authenticate`, `check_password` и `set_password`.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+
+        return hashing_pool.run(
+            _pbkdf2_encode, password, salt, iterations or self.iterations
+        )
@@ -0,0 +1,89 @@
+"""Команда для сравнения разбора тела запросов входа старым и новым способом"""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.fastjson import FastJSONParser
+from my_auth.parsers import FormJSONParser, MultiPartJSONParser
+
+CREDENTIALS = {"username": "benchmark-user", "password": "benchmark-password"}
+
+PAYLOADS = {
+    "json": (json.dumps(CREDENTIALS), "application/json"),
+    "form-json": (json.dumps(CREDENTIALS), "application/x-www-form-urlencoded"),
+}
+
+LEGACY_PARSERS = (JSONParser, FormParser, MultiPartParser)
+PARSERS = (FastJSONParser, FormJSONParser, MultiPartJSONParser)
+
+
+def _legacy_data(request: Request):
+    """Разбор, как в представлениях до `FormJSONParser`: перебор имён полей"""
+    data = None
+    if "username" in request.data and "password" in request.data:
+        data = request.data
+    else:
+        for _key in request.data:
+            if "username" in _key and "password" in _key:
+                data = json.loads(_key)
+                break
+
+    return data
+
+
+def _parsed_data(request: Request):
+    return request.data
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare parsing sign-in payloads (JSON body and JSON sent as a form "
+        "field name) with the default parsers and key scanning versus "
+        "FastJSONParser and FormJSONParser"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=10000,
+            help="Number of requests parsed for each payload",
+        )
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        variants = {
+            "default parsers": (LEGACY_PARSERS, _legacy_data),
+            "auth parsers": (PARSERS, _parsed_data),
+        }
+
+        for name, (body, content_type) in PAYLOADS.items():
+            results = {}
+            for variant, (parser_classes, get_data) in variants.items():
+                parsers = [parser_class() for parser_class in parser_classes]
+                django_requests = [
+                    factory.post("/api/sign-in", body, content_type=content_type)
+                    for _ in range(options["repeat"])
+                ]
+
+                started = time.perf_counter()
+                for django_request in django_requests:
+                    data = get_data(Request(django_request, parsers=parsers))
+                elapsed = time.perf_counter() - started
+
+                if dict(data.items()) != CREDENTIALS:
+                    raise CommandError(f"{name}: {variant} parsed {data!r}")
+                results[variant] = elapsed * 1_000_000 / options["repeat"]
+
+            self.stdout.write(
+                f"{name}: "
+                + ", ".join(
+                    f"{variant} {microseconds:.1f} us"
+                    for variant, microseconds in results.items()
+                )
+            )
@@ -0,0 +1,104 @@
+"""Команда для замера задержки каталога во время волны входов"""
+
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from my_auth.hashers import BoundedPBKDF2PasswordHasher, PasswordHashingBusy
+
+SCENARIOS = {
+    "idle": None,
+    "unbounded": PBKDF2PasswordHasher,
+    "pool": BoundedPBKDF2PasswordHasher,
+}
+
+
+def _hash_passwords(hasher, stop: threading.Event, counters: dict, lock):
+    """Хэшируем пароли, как при входе, пока не попросят остановиться"""
+    while not stop.is_set():
+        try:
+            hasher.encode("benchmark-password", hasher.salt())
+            counter = "hashed"
+        except PasswordHashingBusy:
+            counter = "rejected"
+        with lock:
+            counters[counter] += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure catalog latency while concurrent threads hash passwords "
+        "directly and through the bounded hashing pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--logins",
+            type=int,
+            default=8,
+            help="Number of threads hashing passwords at the same time",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Number of catalog requests in each scenario",
+        )
+        parser.add_argument(
+            "--path",
+            default="/api/catalog/",
+            help="URL to measure",
+        )
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        # первый запрос прогревает соединение с БД и кэши
+        client.get(options["path"])
+
+        self.stdout.write(
+            f"{options['logins']} hashing threads, "
+            f"pool concurrency {settings.PASSWORD_HASHING_CONCURRENCY} "
+            f"({settings.PASSWORD_HASHING_EXECUTOR})"
+        )
+        for name, hasher_class in SCENARIOS.items():
+            stop = threading.Event()
+            lock = threading.Lock()
+            counters = {"hashed": 0, "rejected": 0}
+            threads = []
+            if hasher_class is not None:
+                threads = [
+                    threading.Thread(
+                        target=_hash_passwords,
+                        args=(hasher_class(), stop, counters, lock),
+                        daemon=True,
+                    )
+                    for _ in range(options["logins"])
+                ]
+            for thread in threads:
+                thread.start()
+
+            started = time.perf_counter()
+            latencies = []
+            for _ in range(options["requests"]):
+                request_started = time.perf_counter()
+                client.get(options["path"])
+                latencies.append((time.perf_counter() - request_started) * 1000)
+            elapsed = time.perf_counter() - started
+
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+            latencies.sort()
+            p95 = latencies[max(0, round(len(latencies) * 0.95) - 1)]
+            self.stdout.write(
+                f"{name}: catalog p50 {statistics.median(latencies):.1f} ms, "
+                f"p95 {p95:.1f} ms, max {latencies[-1]:.1f} ms; "
+                f"{counters['hashed'] / elapsed:.1f} hashes/s, "
+                f"{counters['rejected']} rejected"
+            )
@@ -0,0 +1,54 @@
+"""Модуль для разбора тела запросов входа и регистрации"""
+
+from rest_framework.parsers import DataAndFiles, FormParser, MultiPartParser
+
+from core.fastjson import json_loads
+
+
+def _decode_json_key(data):
+    """Возвращает объект из JSON в имени единственного поля с пустым значением"""
+    if len(data) != 1:
+        return data
+
+    key, values = next(iter(data.lists()))
+    if values != [""] or not key.startswith("{"):
+        return data
+
+    try:
+        payload = json_loads(key)
+    except ValueError:
+        return data
+
+    return payload if isinstance(payload, dict) else data
+
+
+class FormJSONParser(FormParser):
+    """
+    Класс парсера формы, который понимает JSON, присланный именем поля.
+
+    Некоторые клиенты отправляют `{"username": ..., "password": ...}` с типом
+    `application/x-www-form-urlencoded`, и форма превращается в одно поле
+    с JSON в имени и пустым значением. Такой объект декодируется здесь один
+    раз, а представления получают в `request.data` обычный словарь. Остальные
+    формы разбираются как в `FormParser`.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return _decode_json_key(super().parse(stream, media_type, parser_context))
+
+
+class MultiPartJSONParser(MultiPartParser):
+    """
+    Класс парсера `multipart/form-data`, который понимает JSON в имени поля.
+
+    То же, что `FormJSONParser`, для клиентов, отправляющих JSON единственным
+    полем multipart-формы без файлов. Остальные формы разбираются как
+    в `MultiPartParser`.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parsed = super().parse(stream, media_type, parser_context)
+        if parsed.files:
+            return parsed
+
+        return DataAndFiles(_decode_json_key(parsed.data), parsed.files)
@@ -0,0 +1,27 @@
+"""Модуль для описания сигналов, сбрасывающих кэш токенов аутентификации"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from my_auth.authentication import invalidate_tokens
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token_cache(sender, instance: Token, **kwargs):
+    """Сигнал для отзыва токена из кэша после его изменения или удаления"""
+    key = instance.key
+    transaction.on_commit(lambda: invalidate_tokens(key))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    """Сигнал для сброса закэшированного пользователя после его изменения"""
+    keys = list(Token.objects.filter(user=instance).values_list("key", flat=True))
+    if keys:
+        transaction.on_commit(lambda: invalidate_tokens(*keys))
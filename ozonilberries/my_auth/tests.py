@@ -1,3 +1,209 @@
-from django.test import TestCase
+import copy
+import json
+import tempfile
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import QueryDict
+from django.test import override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from my_auth.authentication import CachedTokenAuthentication
+from my_auth.hashers import PasswordHashingBusy, hashing_pool
+from my_auth.parsers import FormJSONParser, MultiPartJSONParser
+
+User = get_user_model()
+
+
+def throttle_rates(**rates) -> dict:
+    """Настройки DRF с заданными лимитами вместо лимитов по умолчанию"""
+    rest_framework = copy.deepcopy(settings.REST_FRAMEWORK)
+    rest_framework["DEFAULT_THROTTLE_RATES"] = rates
+
+    return rest_framework
+
+
+class SignInThrottleTests(APITestCase):
+    def setUp(self):
+        # корзины лимитов хранятся в `LocMemCache` тестового процесса
+        cache.clear()
+
+    def sign_in(self, username: str, ip: str):
+        return self.client.post(
+            "/api/sign-in",
+            {"username": username, "password": "wrong-password"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(sign_in_username="2/min"))
+    def test_username_is_limited_across_ips(self):
+        statuses = [
+            self.sign_in("bob", ip).status_code
+            for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3")
+        ]
+        response = self.sign_in("Bob", "10.0.0.4")
+
+        self.assertEqual(statuses, [400, 400, 429])
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(self.sign_in("alice", "10.0.0.4").status_code, 400)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(sign_in_ip="2/min"))
+    def test_ip_is_limited_across_usernames(self):
+        statuses = [
+            self.sign_in(username, "10.0.0.1").status_code
+            for username in ("bob", "alice", "carol")
+        ]
+
+        self.assertEqual(statuses, [400, 400, 429])
+        self.assertEqual(self.sign_in("bob", "10.0.0.2").status_code, 400)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(sign_in_ip=""))
+    def test_empty_rate_disables_limit(self):
+        statuses = {self.sign_in("bob", "10.0.0.1").status_code for _ in range(5)}
+
+        self.assertEqual(statuses, {400})
+
+
+class AuthParserTests(APITestCase):
+    credentials = {"username": "bob", "password": "bob-password"}
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(**cls.credentials)
+
+    def setUp(self):
+        # корзины лимитов входа не должны переходить в другие тесты
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def parse(self, body, content_type: str):
+        request = APIRequestFactory().post("/", body, content_type=content_type)
+
+        return Request(request, parsers=[FormJSONParser(), MultiPartJSONParser()]).data
+
+    def test_sign_in_content_types(self):
+        form = "application/x-www-form-urlencoded"
+        for name, kwargs in {
+            "json": {"data": self.credentials, "format": "json"},
+            "form": {"data": urlencode(self.credentials), "content_type": form},
+            "form-json": {"data": json.dumps(self.credentials), "content_type": form},
+            "multipart": {"data": self.credentials, "format": "multipart"},
+            "multipart-json": {
+                "data": {json.dumps(self.credentials): ""},
+                "format": "multipart",
+            },
+        }.items():
+            with self.subTest(name):
+                response = self.client.post("/api/sign-in", **kwargs)
+
+                self.assertEqual(response.status_code, 200)
+
+    def test_other_forms_are_not_decoded(self):
+        form = "application/x-www-form-urlencoded"
+        for body in ('["bob"]', '{"username": ', "%7B%22a%22%3A1%7D=x", "a=1&b=2"):
+            with self.subTest(body=body):
+                self.assertEqual(
+                    self.parse(body, form), QueryDict(body, encoding="utf-8")
+                )
+
+    def test_multipart_with_files_is_not_decoded(self):
+        body = encode_multipart(
+            BOUNDARY,
+            {
+                json.dumps(self.credentials): "",
+                "avatar": SimpleUploadedFile("a.txt", b"avatar"),
+            },
+        )
+        data = self.parse(body, MULTIPART_CONTENT)
+
+        self.assertEqual(data[json.dumps(self.credentials)], "")
+        self.assertEqual(data["avatar"].read(), b"avatar")
+
+
+@mock.patch.object(hashing_pool, "run", side_effect=PasswordHashingBusy)
+class PasswordHashingBusyTests(APITestCase):
+    credentials = {"username": "bob", "password": "password"}
+
+    def test_api_sign_in_gets_503(self, run):
+        response = self.client.post("/api/sign-in", self.credentials, format="json")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_admin_login_gets_503(self, run):
+        response = self.client.post("/admin/login/", self.credentials)
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        location = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(
+            override_settings(
+                CACHES={
+                    **settings.CACHES,
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                        "LOCATION": location,
+                    },
+                }
+            )
+        )
+        self.user = User.objects.create_user(username="bob", password="password")
+        self.token = Token.objects.create(user=self.user)
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_cached_user_is_authenticated_without_queries(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            user, key = self.authenticate()
+
+        self.assertEqual((user, key), (self.user, self.token.key))
+
+    def test_deleted_token_is_revoked(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_inactive_user_is_rejected(self):
+        self.authenticate()
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_local_cache_is_not_used(self):
+        with override_settings(
+            CACHES={
+                **settings.CACHES,
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            }
+        ):
+            self.authenticate()
+
+            with self.assertNumQueries(1):
+                self.authenticate()
@@ -1,7 +1,5 @@
 """Модуль для описания представлений для аутентификации пользователя"""
 
-import json
-
 from django.contrib.auth import authenticate, get_user_model, login, logout
 from django.contrib.auth.models import update_last_login
 from drf_spectacular.utils import extend_schema
@@ -12,7 +10,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
-from baskets.models import Basket
+from baskets.upsert import merge_anonymous_basket
+from core.fastjson import FastJSONParser
+from core.throttling import IPThrottle, UsernameThrottle
+from my_auth.parsers import FormJSONParser, MultiPartJSONParser
 from my_auth.serializers import (
     UserLogInSerializer,
     UserLogOutSerializer,
@@ -32,20 +33,13 @@ class UserRegistrationViewSet(CreateModelMixin, GenericViewSet):
 
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
+    parser_classes = (FastJSONParser, FormJSONParser, MultiPartJSONParser)
+    throttle_classes = (IPThrottle, UsernameThrottle)
+    throttle_scope = "sign_up"
 
     def create(self, request, *args, **kwargs):
         """Метод для регистрации нового пользователя"""
-        data = None
-        if "username" in request.data and "password" in request.data:
-            data = request.data
-
-        else:
-            for _key in request.data:
-                if "username" in _key and "password" in _key:
-                    data = json.loads(_key)
-                    break
-
-        serializer = self.get_serializer(data=data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         new_user = serializer.save()
 
@@ -56,9 +50,8 @@ class UserRegistrationViewSet(CreateModelMixin, GenericViewSet):
         login(request, new_user)
 
         if session_key:
-            Basket.objects.filter(session_key=session_key).update(
-                user=new_user, session_key=None
-            )  # для корзины незарегистрированного пользователя
+            # для корзины незарегистрированного пользователя
+            merge_anonymous_basket(session_key, new_user)
 
         headers = self.get_success_headers(request.data)
         return Response(status=status.HTTP_201_CREATED, headers=headers)
@@ -68,6 +61,9 @@ class UserLogInAPIView(APIView):
     """APIView для входа пользователя в систему"""
 
     serializer_class = UserLogInSerializer
+    parser_classes = (FastJSONParser, FormJSONParser, MultiPartJSONParser)
+    throttle_classes = (IPThrottle, UsernameThrottle)
+    throttle_scope = "sign_in"
 
     @extend_schema(
         tags=["auth"],
@@ -77,16 +73,7 @@ class UserLogInAPIView(APIView):
     )
     def post(self, request):
         """Метод для входа пользователя в систему"""
-        data = None
-        if "username" in request.data and "password" in request.data:
-            data = request.data
-        else:
-            for _key in request.data:
-                if "username" in _key and "password" in _key:
-                    data = json.loads(_key)
-                    break
-
-        serializer = self.serializer_class(data=data)
+        serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = authenticate(
             request,
@@ -110,9 +97,8 @@ class UserLogInAPIView(APIView):
         login(request, user)
 
         if session_key:
-            Basket.objects.filter(session_key=session_key).update(
-                user=user, session_key=None
-            )  # для корзины незарегистрированного пользователя
+            # для корзины незарегистрированного пользователя
+            merge_anonymous_basket(session_key, user)
 
         return Response(status=status.HTTP_200_OK)
 
@@ -1,8 +1,19 @@
 """Модуль для регистрации в административной панели Django модели 'Order' и связанных с ней"""
 
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
-from orders.models import DeliveryCost, Order, OrderItem, Payment
+from orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedPayment,
+    DeliveryCost,
+    Order,
+    OrderItem,
+    Payment,
+)
+from reports.exports import export_order_lines
 
 
 class OrderTabularAdmin(admin.TabularInline):
@@ -47,8 +58,34 @@ class OrderItemTabularAdmin(admin.TabularInline):
     extra = 0
 
 
+ORDER_ITEM_MODELS = {
+    Order: OrderItem,
+    ArchivedOrder: ArchivedOrderItem,
+}
+
+
+@admin.action(description="Выгрузить позиции заказов в CSV")
+def export_orders_csv(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+):
+    order_items = ORDER_ITEM_MODELS[queryset.model].objects.filter(order__in=queryset)
+    return export_order_lines(order_items, file_format="csv")
+
+
+@admin.action(description="Выгрузить позиции заказов в JSONL")
+def export_orders_jsonl(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+):
+    order_items = ORDER_ITEM_MODELS[queryset.model].objects.filter(order__in=queryset)
+    return export_order_lines(order_items, file_format="jsonl")
+
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
+    actions = [
+        export_orders_csv,
+        export_orders_jsonl,
+    ]
 
     def get_queryset(self, request):
         return Order.objects.select_related("user")
@@ -78,6 +115,76 @@ class OrderAdmin(admin.ModelAdmin):
     inlines = OrderItemTabularAdmin, PaymentTabularAdmin
 
 
+class ArchivedPaymentTabularAdmin(admin.TabularInline):
+    model = ArchivedPayment
+    fields = [
+        "payment_error_message",
+        "is_paid",
+        "created_at",
+    ]
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+class ArchivedOrderItemTabularAdmin(admin.TabularInline):
+    model = ArchivedOrderItem
+    fields = [
+        "product",
+        "name",
+        "price",
+        "quantity",
+    ]
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    """Архив заказов только для просмотра и выгрузки"""
+
+    actions = [
+        export_orders_csv,
+        export_orders_jsonl,
+    ]
+
+    def get_queryset(self, request):
+        return ArchivedOrder.objects.select_related("user")
+
+    def user_verbose(self, obj: ArchivedOrder) -> str:
+        if obj.user is None:
+            return "-"
+        return obj.user.first_name or obj.user.username
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    list_display = [
+        "id",
+        "user_verbose",
+        "delivery_type",
+        "payment_type",
+        "total_price",
+        "status",
+        "created_at",
+        "archived_at",
+    ]
+    search_fields = [
+        "id",
+    ]
+    list_filter = [
+        "status",
+        "delivery_type",
+        "payment_type",
+    ]
+    date_hierarchy = "created_at"
+    inlines = ArchivedOrderItemTabularAdmin, ArchivedPaymentTabularAdmin
+
+
 @admin.register(DeliveryCost)
 class DeliveryCostAdmin(admin.ModelAdmin):
     list_display = [
@@ -0,0 +1,104 @@
+"""Модуль для переноса завершённых заказов в архивные таблицы"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    ArchivedPayment,
+    Order,
+    OrderItem,
+    Payment,
+)
+from reports.models import RolledUpOrder
+
+
+def _copy_fields(instance, model, **extra) -> dict:
+    """Значения всех общих с архивной моделью полей, включая id и внешние ключи"""
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in model._meta.concrete_fields
+        if hasattr(instance, field.attname)
+    }
+    values.update(extra)
+
+    return values
+
+
+def get_archivable_orders(older_than_days: int):
+    """
+    Завершённые заказы старше `older_than_days` дней.
+
+    Заказы, которые `rollup_sales` ещё не обработал (доставленный не учтён
+    в агрегатах или отменённый ещё не вычтен), пропускаются: он читает только
+    таблицу `order`.
+    """
+    boundary = timezone.now() - timedelta(days=older_than_days)
+    rolled_up = Exists(RolledUpOrder.objects.filter(order_id=OuterRef("id")))
+
+    return (
+        Order.objects.filter(created_at__lt=boundary)
+        .filter(
+            Q(rolled_up, status=Order.OrderStatusChoice.delivered)
+            | Q(~rolled_up, status=Order.OrderStatusChoice.cancel)
+        )
+        .order_by("id")
+    )
+
+
+def archive_batch(older_than_days: int, batch_size: int) -> int:
+    """Переносим в архив одну пачку заказов вместе с позициями и оплатой"""
+    with transaction.atomic():
+        order_ids = list(
+            Order.objects.filter(
+                id__in=get_archivable_orders(older_than_days).values("id")[:batch_size]
+            )
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)
+        )
+        if not order_ids:
+            return 0
+
+        archived_at = timezone.now()
+        ArchivedOrder.objects.bulk_create(
+            [
+                ArchivedOrder(
+                    **_copy_fields(order, ArchivedOrder, archived_at=archived_at)
+                )
+                for order in Order.objects.filter(id__in=order_ids)
+            ]
+        )
+        ArchivedOrderItem.objects.bulk_create(
+            [
+                ArchivedOrderItem(**_copy_fields(item, ArchivedOrderItem))
+                for item in OrderItem.objects.filter(order_id__in=order_ids)
+            ]
+        )
+        ArchivedPayment.objects.bulk_create(
+            [
+                ArchivedPayment(**_copy_fields(payment, ArchivedPayment))
+                for payment in Payment.objects.filter(order_id__in=order_ids)
+            ]
+        )
+        # позиции и оплата удаляются каскадно
+        Order.objects.filter(id__in=order_ids).delete()
+
+    return len(order_ids)
+
+
+def archive_orders(older_than_days: int = None, batch_size: int = None) -> int:
+    """Переносим в архив все подходящие заказы пачками по `batch_size`"""
+    if older_than_days is None:
+        older_than_days = settings.ORDER_ARCHIVE_AFTER_DAYS
+    batch_size = batch_size or settings.ORDER_ARCHIVE_BATCH_SIZE
+
+    archived = 0
+    while count := archive_batch(older_than_days, batch_size):
+        archived += count
+
+    return archived
@@ -0,0 +1,54 @@
+"""Команда для переноса завершённых заказов в архивные таблицы"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.archive import archive_batch, get_archivable_orders
+
+
+class Command(BaseCommand):
+    help = "Move delivered and cancelled orders older than N days to the archive tables in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+            help="Archive orders created more than N days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ORDER_ARCHIVE_BATCH_SIZE,
+            help="Number of orders moved in one transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count orders that would be archived",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat every N seconds instead of running once",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = get_archivable_orders(options["days"]).count()
+            self.stdout.write(f"Orders to archive: {count}")
+            return
+
+        while True:
+            archived = 0
+            while count := archive_batch(options["days"], options["batch_size"]):
+                archived += count
+                self.stdout.write(f"Archived orders: {archived}")
+            self.stdout.write(f"Done, archived orders: {archived}")
+
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
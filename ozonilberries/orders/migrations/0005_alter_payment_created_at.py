@@ -0,0 +1,20 @@
+# Generated by Django 4.2.14 on 2026-10-19 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_alter_payment_code_alter_payment_month_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="payment",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True, db_index=True, verbose_name="Дата оплаты"
+            ),
+        ),
+    ]
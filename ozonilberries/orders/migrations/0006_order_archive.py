@@ -0,0 +1,290 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:19
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import orders.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0007_tag_productimage_ordering"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("orders", "0005_alter_payment_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "city",
+                    models.CharField(
+                        default="", max_length=80, verbose_name="Город доставки"
+                    ),
+                ),
+                (
+                    "delivery_address",
+                    models.CharField(
+                        default="", max_length=200, verbose_name="Адрес доставки"
+                    ),
+                ),
+                (
+                    "delivery_type",
+                    models.CharField(
+                        choices=[
+                            ("delivery", "Обычная доставка"),
+                            ("express", "экспресс-доставка"),
+                        ],
+                        default="delivery",
+                        max_length=30,
+                        verbose_name="Тип доставки",
+                    ),
+                ),
+                (
+                    "payment_type",
+                    models.CharField(
+                        choices=[
+                            ("online_card", "Картой онлайн"),
+                            ("online_account", "Со счёта онлайн"),
+                        ],
+                        default="online_card",
+                        max_length=30,
+                        verbose_name="Тип оплаты",
+                    ),
+                ),
+                (
+                    "total_price",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=10,
+                        verbose_name="Cумма заказа",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("confirm_required", "Требуется подтверждение"),
+                            ("confirmed", "Подтверждён"),
+                            ("paid", "Оплачен"),
+                            ("sent", "Отправлен"),
+                            ("delivered", "Доставлен"),
+                            ("cancel", "Отменён"),
+                        ],
+                        default="confirm_required",
+                        max_length=50,
+                        verbose_name="Статус заказа",
+                    ),
+                ),
+                (
+                    "user_comment",
+                    models.TextField(
+                        blank=True, null=True, verbose_name="Комментарий к заказу"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(verbose_name="Дата создания заказа"),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата переноса в архив"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивный заказ",
+                "verbose_name_plural": "Архив заказов",
+                "db_table": "order_archive",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrderItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=150, verbose_name="Название")),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=7, verbose_name="Цена"
+                    ),
+                ),
+                (
+                    "quantity",
+                    models.PositiveIntegerField(default=0, verbose_name="Количество"),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Дата продажи")),
+            ],
+            options={
+                "verbose_name": "Товар архивного заказа",
+                "verbose_name_plural": "Проданные товары (архив)",
+                "db_table": "order_item_archive",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedPayment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=150, verbose_name="Владелец карты"),
+                ),
+                (
+                    "number",
+                    models.CharField(
+                        max_length=8,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                message="Номер  должен быть не длиннее 8 цифр.",
+                                regex="^\\d{1,8}$",
+                            )
+                        ],
+                        verbose_name="Номер карты/счёта",
+                    ),
+                ),
+                (
+                    "month",
+                    models.CharField(
+                        max_length=2,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                message="Введите номер месяца с карты.",
+                                regex="^[0]?[1-9]{1}$|^[1]{1}[0-2]{1}$",
+                            )
+                        ],
+                        verbose_name="month_valid_thru",
+                    ),
+                ),
+                (
+                    "year",
+                    models.CharField(
+                        max_length=4,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                message="Год должен состоять из 4 цифр.",
+                                regex="^\\d{4}$",
+                            ),
+                            orders.models.validate_expiry_period,
+                        ],
+                        verbose_name="year_valid_thru",
+                    ),
+                ),
+                (
+                    "payment_error_message",
+                    models.TextField(
+                        blank=True, null=True, verbose_name="Текст ошибки оплаты"
+                    ),
+                ),
+                (
+                    "is_paid",
+                    models.BooleanField(default=False, verbose_name="Оплачено"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(db_index=True, verbose_name="Дата оплаты"),
+                ),
+            ],
+            options={
+                "verbose_name": "Оплата архивного заказа",
+                "verbose_name_plural": "Оплаты архивных заказов",
+                "db_table": "order_payment_archive",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("status__in", ("confirm_required", "confirmed"))),
+                fields=["user", "-created_at"],
+                name="order_active_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("status__in", ("delivered", "cancel"))),
+                fields=["status", "created_at"],
+                name="order_final_created_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedpayment",
+            name="order",
+            field=models.OneToOneField(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="payment",
+                to="orders.archivedorder",
+                verbose_name="Заказ",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedorderitem",
+            name="order",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="product_items",
+                to="orders.archivedorder",
+                verbose_name="Заказ",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedorderitem",
+            name="product",
+            field=models.ForeignKey(
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_DEFAULT,
+                related_name="archived_order_items",
+                to="products.product",
+                verbose_name="Продукт",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedorder",
+            name="user",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_DEFAULT,
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Пользователь",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(
+                fields=["created_at"], name="order_archi_created_86560b_idx"
+            ),
+        ),
+    ]
@@ -12,7 +12,8 @@ from products.models import Product
 User = get_user_model()
 
 
-class Order(models.Model):
+class AbstractOrder(models.Model):
+    """Общие поля активного и архивного заказа"""
 
     class DeliveryChoice(models.TextChoices):
         delivery = "delivery", "Обычная доставка"
@@ -70,10 +71,19 @@ class Order(models.Model):
         blank=True, null=True, verbose_name="Комментарий к заказу"
     )
 
+    # статусы, с которыми заказ показывается пользователю в `OrderViewSet`
+    ACTIVE_STATUSES = (
+        OrderStatusChoice.confirm_required,
+        OrderStatusChoice.confirmed,
+    )
+    # статусы завершённых заказов, которые можно переносить в архив
+    FINAL_STATUSES = (
+        OrderStatusChoice.delivered,
+        OrderStatusChoice.cancel,
+    )
+
     class Meta:
-        db_table = "order"
-        verbose_name = "Заказ"
-        verbose_name_plural = "Заказы"
+        abstract = True
 
     def __str__(self):
         try:
@@ -82,7 +92,68 @@ class Order(models.Model):
             return f"Заказ №{self.pk} * (телефон: Не указан)"
 
 
-class OrderItem(models.Model):
+class Order(AbstractOrder):
+    # по времени изменения `rollup_sales` находит заказы, сменившие статус
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name="Дата изменения заказа"
+    )
+
+    class Meta:
+        db_table = "order"
+        verbose_name = "Заказ"
+        verbose_name_plural = "Заказы"
+        indexes = [
+            # выборка активных заказов пользователя не зависит от размера истории
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=models.Q(status__in=AbstractOrder.ACTIVE_STATUSES),
+                name="order_active_user_idx",
+            ),
+            models.Index(
+                fields=["status", "created_at"],
+                condition=models.Q(status__in=AbstractOrder.FINAL_STATUSES),
+                name="order_final_created_idx",
+            ),
+        ]
+
+
+class ArchivedOrder(AbstractOrder):
+    """Завершённый заказ, перенесённый из `order` командой `archive_orders`"""
+
+    # даты переносятся из исходных таблиц как есть
+    created_at = models.DateTimeField(verbose_name="Дата создания заказа")
+    archived_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата переноса в архив"
+    )
+
+    class Meta:
+        db_table = "order_archive"
+        verbose_name = "Архивный заказ"
+        verbose_name_plural = "Архив заказов"
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+
+class AbstractOrderItem(models.Model):
+    """Общие поля позиции активного и архивного заказа"""
+
+    name = models.CharField(max_length=150, verbose_name="Название")
+    price = models.DecimalField(max_digits=7, decimal_places=2, verbose_name="Цена")
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Количество")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата продажи")
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"Заказ №{self.order_id} * Товар {self.name}"
+
+    def products_price(self):
+        return round(self.price * self.quantity, 2)
+
+
+class OrderItem(AbstractOrderItem):
     order = models.ForeignKey(
         to=Order,
         on_delete=models.CASCADE,
@@ -97,21 +168,34 @@ class OrderItem(models.Model):
         related_name="order_items",
         verbose_name="Продукт",
     )
-    name = models.CharField(max_length=150, verbose_name="Название")
-    price = models.DecimalField(max_digits=7, decimal_places=2, verbose_name="Цена")
-    quantity = models.PositiveIntegerField(default=0, verbose_name="Количество")
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата продажи")
 
     class Meta:
         db_table = "order_item"
         verbose_name = "Товар заказа"
         verbose_name_plural = "Проданные товары"
 
-    def __str__(self):
-        return f"Заказ №{self.order.id} * Товар {self.name}"
 
-    def products_price(self):
-        return round(self.price * self.quantity, 2)
+class ArchivedOrderItem(AbstractOrderItem):
+    order = models.ForeignKey(
+        to=ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name="product_items",
+        verbose_name="Заказ",
+    )
+    product = models.ForeignKey(
+        to=Product,
+        on_delete=models.SET_DEFAULT,
+        default=None,
+        null=True,
+        related_name="archived_order_items",
+        verbose_name="Продукт",
+    )
+    created_at = models.DateTimeField(verbose_name="Дата продажи")
+
+    class Meta:
+        db_table = "order_item_archive"
+        verbose_name = "Товар архивного заказа"
+        verbose_name_plural = "Проданные товары (архив)"
 
 
 class DeliveryCost(models.Model):
@@ -156,10 +240,9 @@ def validate_expiry_period(user_year: str):
     return user_year
 
 
-class Payment(models.Model):
-    order = models.OneToOneField(
-        to=Order, on_delete=models.CASCADE, related_name="payment", verbose_name="Заказ"
-    )
+class AbstractPayment(models.Model):
+    """Общие поля оплаты активного и архивного заказа"""
+
     name = models.CharField(max_length=150, verbose_name="Владелец карты")
     number = models.CharField(
         validators=[
@@ -172,17 +255,6 @@ class Payment(models.Model):
         verbose_name="Номер карты/счёта",
     )
 
-    code = models.CharField(
-        validators=[
-            RegexValidator(
-                regex=r"^\d{3}$",
-                message="Код  должен состоять из 3 цифр.",
-            ),
-        ],
-        max_length=3,
-        verbose_name="Код",
-    )
-
     month = models.CharField(
         validators=[
             RegexValidator(
@@ -210,12 +282,50 @@ class Payment(models.Model):
         blank=True, null=True, verbose_name="Текст ошибки оплаты"
     )
     is_paid = models.BooleanField(default=False, verbose_name="Оплачено")
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата оплаты")
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="Дата оплаты"
+    )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.order}, оплачено: {self.is_paid}"
+
+
+class Payment(AbstractPayment):
+    order = models.OneToOneField(
+        to=Order, on_delete=models.CASCADE, related_name="payment", verbose_name="Заказ"
+    )
+    code = models.CharField(
+        validators=[
+            RegexValidator(
+                regex=r"^\d{3}$",
+                message="Код  должен состоять из 3 цифр.",
+            ),
+        ],
+        max_length=3,
+        verbose_name="Код",
+    )
 
     class Meta:
         db_table = "order_payment"
         verbose_name = "Оплата заказа"
         verbose_name_plural = "Оплаты заказов"
 
-    def __str__(self):
-        return f"{self.order}, оплачено: {self.is_paid}"
+
+class ArchivedPayment(AbstractPayment):
+    """Оплата архивного заказа (без кода карты: он не хранится после завершения)"""
+
+    order = models.OneToOneField(
+        to=ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name="payment",
+        verbose_name="Заказ",
+    )
+    created_at = models.DateTimeField(db_index=True, verbose_name="Дата оплаты")
+
+    class Meta:
+        db_table = "order_payment_archive"
+        verbose_name = "Оплата архивного заказа"
+        verbose_name_plural = "Оплаты архивных заказов"
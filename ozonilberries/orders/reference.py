@@ -0,0 +1,11 @@
+"""Модуль для справочных данных заказов, кэшируемых в памяти процесса"""
+
+from core.refcache import reference_cache
+from orders.models import DeliveryCost
+
+
+def load_delivery_cost() -> DeliveryCost:
+    return DeliveryCost.objects.get(is_active=True)
+
+
+reference_cache.register("delivery_cost", load_delivery_cost, models=[DeliveryCost])
@@ -7,8 +7,10 @@ from django.core.validators import RegexValidator
 from django.db import transaction
 from rest_framework import serializers
 
+from baskets.availability import annotate_availability
 from baskets.models import Basket
-from orders.models import DeliveryCost, Order, OrderItem, Payment
+from core.refcache import reference_cache
+from orders.models import Order, OrderItem, Payment
 from products.models import Product
 from products.serializers import PartialProductSerializer
 
@@ -120,7 +122,7 @@ class ConfirmOrderSerializer(serializers.HyperlinkedModelSerializer):
         if not user_basket:
             raise serializers.ValidationError("Ваша корзина пуста!")
         try:
-            delivery_conditions = DeliveryCost.objects.get(is_active=True)
+            delivery_conditions = reference_cache.get("delivery_cost")
             attrs["delivery_conditions"] = delivery_conditions
         except (ObjectDoesNotExist, MultipleObjectsReturned):
             raise serializers.ValidationError(
@@ -138,6 +140,15 @@ class ConfirmOrderSerializer(serializers.HyperlinkedModelSerializer):
         with transaction.atomic():
             total_order_price = 0
             delivery_conditions = validated_data["delivery_conditions"]
+            # остатки за вычетом чужих резервов одним запросом на весь заказ
+            available = dict(
+                annotate_availability(
+                    Product.objects.filter(
+                        id__in=validated_data["user_basket"].values("product_id")
+                    ),
+                    {"user": validated_data["user"]},
+                ).values_list("id", "available_count")
+            )
             for _basket in validated_data["user_basket"]:
                 product: Product = _basket.product
                 name = _basket.product.title
@@ -147,9 +158,9 @@ class ConfirmOrderSerializer(serializers.HyperlinkedModelSerializer):
                     price = _basket.product.price
                 quantity = _basket.count
 
-                if product.count < quantity:
+                if available[product.id] < quantity:
                     raise serializers.ValidationError(
-                        f"Такого количества товара {name} нет на складе. В наличии - {product.count}"
+                        f"Такого количества товара {name} нет на складе. В наличии - {max(available[product.id], 0)}"
                     )
 
                 OrderItem.objects.create(
@@ -46,7 +46,7 @@ class OrderViewSet(
     def get_queryset(self):
         """Получаем список актуальных заказов"""
         return Order.objects.filter(
-            user=self.request.user, status__in=["confirm_required", "confirmed"]
+            user=self.request.user, status__in=Order.ACTIVE_STATUSES
         ).order_by("-created_at")
 
 
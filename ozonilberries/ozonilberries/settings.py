@@ -61,14 +61,19 @@ INSTALLED_APPS = [
     'my_auth',
     'baskets',
     'orders',
+    'reports',
+    'core',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
+    'core.middleware.ServiceBusyMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
@@ -110,6 +115,73 @@ DATABASES = {
     }
 }
 
+# Read replicas
+# Реплики для чтения каталога через пробел: "host[:port][/name]"; пропущенные части берутся у основной БД,
+# например "/shop_replica" — другая БД на том же сервере (удобно для локальной проверки)
+for number, replica in enumerate(os.getenv('DB_REPLICAS', default='').split(), start=1):
+    address, _, name = replica.partition('/')
+    host, _, port = address.partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host or DATABASES['default']['HOST'],
+        'PORT': port or DATABASES['default']['PORT'],
+        'NAME': name or DATABASES['default']['NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+# Сколько секунд после записи клиент читает только с основной БД
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache')
+CACHE_LOCATION = os.getenv('CACHE_LOCATION', default='')
+# Кэши в памяти процесса не видны другим процессам (воркерам, командам)
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION,
+    },
+    # Отдельный кэш сессий, чтобы вытеснение записей каталога и лимитов не удаляло сессии;
+    # для Redis лучше отдельная БД или сервер без вытеснения (maxmemory-policy noeviction)
+    'sessions': {
+        'BACKEND': os.getenv('SESSION_CACHE_BACKEND', default=CACHE_BACKEND),
+        'LOCATION': os.getenv('SESSION_CACHE_LOCATION', default=CACHE_LOCATION or 'sessions'),
+        'KEY_PREFIX': 'sessions',
+    },
+}
+
+
+# Sessions
+# Анонимные сессии хранятся только в кэше, сессии пользователей — в БД (`core.sessions`).
+# С кэшем в памяти процесса анонимная сессия терялась бы между воркерами, поэтому все сессии хранятся в БД
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE',
+    default=(
+        'django.contrib.sessions.backends.db'
+        if CACHES[SESSION_CACHE_ALIAS]['BACKEND'] in LOCAL_CACHE_BACKENDS
+        else 'core.sessions'
+    ),
+)
+
+
+# Кэш справочных данных (доставка, категории, теги) в памяти каждого процесса.
+# Версии справочников хранятся в общем кэше; с кэшем в памяти процесса изменения
+# доходят до других процессов только через REFERENCE_CACHE_TTL секунд
+REFERENCE_CACHE_ALIAS = 'default'
+REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', default=300))
+REFERENCE_CACHE_MAX_SIZE = int(os.getenv('REFERENCE_CACHE_MAX_SIZE', default=64))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -133,6 +205,25 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    # тот же алгоритм pbkdf2_sha256, что у стандартного `PBKDF2PasswordHasher`
+    'my_auth.hashers.BoundedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+# Количество паролей, которые хэшируются одновременно
+PASSWORD_HASHING_CONCURRENCY = int(os.getenv('PASSWORD_HASHING_CONCURRENCY', default=2))
+# Сколько секунд запрос ждёт свободного места в пуле, прежде чем получить 503
+PASSWORD_HASHING_QUEUE_TIMEOUT = int(os.getenv('PASSWORD_HASHING_QUEUE_TIMEOUT', default=5))
+# Пул потоков (thread) или процессов (process)
+PASSWORD_HASHING_EXECUTOR = os.getenv('PASSWORD_HASHING_EXECUTOR', default='thread')
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -154,6 +245,31 @@ MEDIA_URL = 'media/'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'MEDIA_STORAGE_BACKEND', default='core.storage.ContentAddressedStorage'
+        ),
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Загружаемые файлы сразу пишутся во временный файл, а не в память
+FILE_UPLOAD_HANDLERS = ['core.uploads.MaxSizeTemporaryFileUploadHandler']
+# Ограничение размера загрузки, представление может задать своё в `upload_max_size`
+FILE_UPLOAD_MAX_SIZE = int(os.getenv('FILE_UPLOAD_MAX_SIZE', default=10 * 1024 * 1024))
+AVATAR_UPLOAD_MAX_SIZE = int(os.getenv('AVATAR_UPLOAD_MAX_SIZE', default=2 * 1024 * 1024))
+CATALOG_IMPORT_MAX_SIZE = int(os.getenv('CATALOG_IMPORT_MAX_SIZE', default=200 * 1024 * 1024))
+
+# Отдавать медиафайлы через Django (по умолчанию только при DEBUG), в продакшене их отдаёт веб-сервер или CDN
+MEDIA_SERVE = int(os.getenv('MEDIA_SERVE', default=DEBUG))
+# Файлы с именем по хэшу содержимого не меняются и кэшируются на год
+MEDIA_BLOB_MAX_AGE = int(os.getenv('MEDIA_BLOB_MAX_AGE', default=60 * 60 * 24 * 365))
+# Неиспользуемые файлы моложе этого срока не удаляются: их объект ещё может сохраняться
+MEDIA_BLOB_GC_GRACE_HOURS = int(os.getenv('MEDIA_BLOB_GC_GRACE_HOURS', default=24))
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -165,6 +281,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # AUTH_USER_MODEL: str = 'users.ShopUser'
 # LOGIN_URL ='api/sign-in/'
 
+# Authentication
+# Кэш "токен → пользователь": отзыв токена виден всем процессам только в общем кэше,
+# поэтому с кэшем в памяти процесса токены проверяются по БД
+AUTH_TOKEN_CACHE_ALIAS = 'default'
+# Время жизни кэша "токен → пользователь" в секундах
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', default=60))
+# Basic-аутентификация хэширует пароль на каждом запросе, в продакшене её лучше выключить
+BASIC_AUTH_ENABLED = int(os.getenv('BASIC_AUTH_ENABLED', default=DEBUG))
+
 #REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -174,17 +299,105 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
+        'my_auth.authentication.CachedTokenAuthentication',
+        *(['my_auth.authentication.BasicAuthentication'] if BASIC_AUTH_ENABLED else []),
+        'my_auth.authentication.SessionAuthentication',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
-    ]
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'EXCEPTION_HANDLER': 'core.exceptions.api_exception_handler',
+    # Лимиты token bucket (`core.throttling`): N запросов, пополняются за период
+    'DEFAULT_THROTTLE_RATES': {
+        'sign_in_ip': os.getenv('THROTTLE_SIGN_IN_IP', default='30/min'),
+        'sign_in_username': os.getenv('THROTTLE_SIGN_IN_USERNAME', default='5/min'),
+        'sign_up_ip': os.getenv('THROTTLE_SIGN_UP_IP', default='10/hour'),
+        'sign_up_username': os.getenv('THROTTLE_SIGN_UP_USERNAME', default='5/hour'),
+        'basket_user': os.getenv('THROTTLE_BASKET_USER', default='120/min'),
+        'review_user': os.getenv('THROTTLE_REVIEW_USER', default='10/hour'),
+    },
 }
 
+# Throttling
+# Кэш для корзин лимитов: должен быть общим для всех процессов, иначе каждый процесс считает свой лимит
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Compression
+# Ответы короче N байт не сжимаются
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', default=1024))
+# Уровень сжатия brotli (0-11), если пакет brotli установлен
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', default=5))
+
+# Order archive
+# Доставленные и отменённые заказы старше N дней переносятся в архивные таблицы
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv('ORDER_ARCHIVE_AFTER_DAYS', default=180))
+# Количество заказов, переносимых за одну транзакцию
+ORDER_ARCHIVE_BATCH_SIZE = int(os.getenv('ORDER_ARCHIVE_BATCH_SIZE', default=500))
+
+# Basket cleanup
+# Анонимные корзины старше N дней удаляются, даже если сессия ещё жива
+ANONYMOUS_BASKET_MAX_AGE_DAYS = int(os.getenv('ANONYMOUS_BASKET_MAX_AGE_DAYS', default=30))
+# Количество строк, удаляемых одним запросом
+BASKET_CLEANUP_BATCH_SIZE = int(os.getenv('BASKET_CLEANUP_BATCH_SIZE', default=1000))
+
+# Basket reservations
+# На сколько секунд добавление в корзину резервирует товар (0 — без резервов)
+BASKET_RESERVATION_SECONDS = int(os.getenv('BASKET_RESERVATION_SECONDS', default=0))
+
+# Fast lists
+# Списки каталога, скидок и корзины сериализуются из строк `values()`, без ModelSerializer
+FAST_LIST_SERIALIZATION = int(os.getenv('FAST_LIST_SERIALIZATION', default=1))
+
+# Catalog import
+# Количество строк фида, проверяемых и записываемых за одну транзакцию
+CATALOG_IMPORT_CHUNK_SIZE = int(os.getenv('CATALOG_IMPORT_CHUNK_SIZE', default=1000))
+
+# Images
+# Ширины уменьшенных копий изображений для `srcset`
+IMAGE_THUMBNAIL_SIZES = [
+    int(size) for size in os.getenv('IMAGE_THUMBNAIL_SIZES', default='160 320 640').split()
+]
+IMAGE_THUMBNAIL_QUALITY = int(os.getenv('IMAGE_THUMBNAIL_QUALITY', default=80))
+# Оригиналы больше этого размера по любой стороне уменьшаются в фоне после загрузки
+IMAGE_MAX_DIMENSION = int(os.getenv('IMAGE_MAX_DIMENSION', default=2048))
+# Изображения с большим числом пикселей отклоняются по заголовку, без декодирования
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', default=40_000_000))
+IMAGE_UPLOAD_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+
+# Background tasks
+BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', default=2))
+# Выполнять фоновые задачи сразу после фиксации транзакции в текущем потоке
+BACKGROUND_TASKS_EAGER = int(os.getenv('BACKGROUND_TASKS_EAGER', default=0))
+
+# Category tree
+# Готовое дерево категорий пересобирается при изменении категорий и не реже, чем раз в N секунд
+CATEGORY_TREE_TIMEOUT = int(os.getenv('CATEGORY_TREE_TIMEOUT', default=60))
+
+# Product detail
+# Количество последних отзывов в карточке товара, остальные — в `/api/product/<id>/reviews/`
+PRODUCT_DETAIL_REVIEWS_LIMIT = int(os.getenv('PRODUCT_DETAIL_REVIEWS_LIMIT', default=10))
+# Время хранения карточки товара в кэше (0 — не кэшировать)
+PRODUCT_DETAIL_CACHE_TIMEOUT = int(os.getenv('PRODUCT_DETAIL_CACHE_TIMEOUT', default=300))
+
+# Stock sync
+# Количество товаров в одном `UPDATE ... FROM (VALUES ...)`
+STOCK_SYNC_BATCH_SIZE = int(os.getenv('STOCK_SYNC_BATCH_SIZE', default=1000))
+# Максимальное количество товаров в одном запросе синхронизации
+STOCK_SYNC_MAX_ITEMS = int(os.getenv('STOCK_SYNC_MAX_ITEMS', default=10000))
+
+# Reports
+# Заказы, изменённые за столько секунд до прошлого запуска, проверяются повторно:
+# транзакция могла зафиксироваться позже, чем записано время изменения
+SALES_ROLLUP_OVERLAP_SECONDS = int(os.getenv('SALES_ROLLUP_OVERLAP_SECONDS', default=300))
+# Количество строк, читаемых из серверного курсора и отправляемых клиенту за раз
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', default=2000))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'OzoNilBerries project API',
     'DESCRIPTION': 'shop app',
@@ -15,7 +15,6 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import (SpectacularAPIView, SpectacularRedocView,
@@ -32,10 +31,11 @@ urlpatterns = [
     path("api/", include("users.urls")),
     path("api/", include("baskets.urls")),
     path("api/", include("orders.urls")),
+    path("api/", include("reports.urls")),
+    path("", include("core.urls")),
 ]
 
 if settings.DEBUG:
     from debug_toolbar.toolbar import debug_toolbar_urls
 
     urlpatterns += debug_toolbar_urls()
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
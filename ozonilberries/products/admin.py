@@ -1,9 +1,11 @@
 """Модуль для регистрации в административной панели Django модели 'Product' и связанных с ней"""
 
 from django.contrib import admin
+from django.db import transaction
 from django.db.models import QuerySet
 from django.http import HttpRequest
 
+from products.cache import touch_products
 from products.models import (
     Category,
     Product,
@@ -14,6 +16,8 @@ from products.models import (
     Subcategory,
     Tag,
 )
+from products.tree import invalidate_category_tree
+from reports.exports import export_products
 
 
 @admin.register(Category)
@@ -25,14 +29,29 @@ class CategoryAdmin(admin.ModelAdmin):
 def mark_available(
     modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
 ):
-    queryset.update(is_available=True)
+    touch_products(queryset.values_list("id", flat=True), is_available=True)
+    transaction.on_commit(invalidate_category_tree)
 
 
 @admin.action(description='Пометить товар как "Лимитированный"')
 def mark_limited(
     modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
 ):
-    queryset.update(is_limited=True)
+    touch_products(queryset.values_list("id", flat=True), is_limited=True)
+
+
+@admin.action(description="Выгрузить товары в CSV")
+def export_products_csv(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+):
+    return export_products(queryset, "csv")
+
+
+@admin.action(description="Выгрузить товары в JSONL")
+def export_products_jsonl(
+    modeladmin: admin.ModelAdmin, request: HttpRequest, queryset: QuerySet
+):
+    return export_products(queryset, "jsonl")
 
 
 class ProductImageTabularAdmin(admin.TabularInline):
@@ -69,6 +88,8 @@ class ProductAdmin(admin.ModelAdmin):
     actions = [
         mark_available,
         mark_limited,
+        export_products_csv,
+        export_products_jsonl,
     ]
 
     list_display = [
@@ -5,3 +5,7 @@ class ProductsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "products"
     verbose_name = "Товары"
+
+    def ready(self):
+        import products.reference
+        import products.signals
@@ -0,0 +1,31 @@
+"""Модуль для работы с кэшем каталога товаров и версиями товаров"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+
+def product_cache_key(product_id: int) -> str:
+    return f"catalog:product:{product_id}"
+
+
+def invalidate_products(product_ids):
+    """Удаляем из кэша записи указанных товаров"""
+    cache.delete_many([product_cache_key(product_id) for product_id in product_ids])
+
+
+def touch_products(product_ids, **fields):
+    """
+    Увеличиваем версию и время изменения товаров и сбрасываем их кэш.
+
+    Используется для изменений, которые не проходят через `Product.save()`:
+    связанные модели, `QuerySet.update()` и пакетные операции.
+    """
+    from products.models import Product
+
+    product_ids = list(product_ids)
+    Product.objects.filter(id__in=product_ids).update(
+        version=F("version") + 1, updated_at=timezone.now(), **fields
+    )
+    transaction.on_commit(lambda: invalidate_products(product_ids))
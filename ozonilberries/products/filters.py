@@ -2,7 +2,8 @@
 
 import django_filters
 
-from products.models import Product, Tag
+from products.models import Product
+from products.reference import get_tag_choices
 
 
 class ProductFilter(django_filters.FilterSet):
@@ -24,8 +25,8 @@ class ProductFilter(django_filters.FilterSet):
         field_name="is_available", label="В наличии"
     )
 
-    tags = django_filters.ModelMultipleChoiceFilter(
-        queryset=Tag.objects.all(), field_name="tags", label="Тэги"
+    tags = django_filters.MultipleChoiceFilter(
+        choices=get_tag_choices, field_name="tags", distinct=True, label="Тэги"
     )
 
     order_by = django_filters.OrderingFilter(
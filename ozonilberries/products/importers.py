@@ -0,0 +1,401 @@
+"""Модуль для пакетного импорта каталога товаров из CSV/JSONL"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, transaction
+from rest_framework import serializers
+
+from core.refcache import reference_cache
+from products.cache import touch_products
+from products.models import (
+    Category,
+    Product,
+    ProductImage,
+    Sale,
+    Specification,
+    Subcategory,
+    Tag,
+)
+from products.tree import invalidate_category_tree
+from reports.exports import unescape_csv_formula
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+CSV_FLAG_COLUMNS = ("freeDelivery", "is_available", "is_limited")
+
+PRODUCT_UPDATE_FIELDS = [
+    "title",
+    "description",
+    "fullDescription",
+    "price",
+    "count",
+    "category",
+    "subcategory",
+    "freeDelivery",
+    "is_available",
+    "is_limited",
+]
+
+
+class CatalogRowSerializer(serializers.Serializer):
+    """
+    Класс сериалайзера для проверки одной строки фида каталога.
+
+    Формат строки совпадает с выгрузкой `/api/reports/export/products/`.
+    Категория и подкатегория указываются по slug или названию.
+    """
+
+    slug = serializers.SlugField(max_length=200)
+    title = serializers.CharField(max_length=150)
+    description = serializers.CharField(
+        max_length=400, allow_blank=True, allow_null=True, required=False
+    )
+    fullDescription = serializers.CharField(
+        allow_blank=True, allow_null=True, required=False
+    )
+    price = serializers.DecimalField(
+        max_digits=7, decimal_places=2, min_value=Decimal("0")
+    )
+    count = serializers.IntegerField(min_value=0)
+    category = serializers.CharField(max_length=200)
+    subcategory = serializers.CharField(max_length=200)
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=150), required=False
+    )
+    specifications = serializers.DictField(
+        child=serializers.CharField(allow_blank=True, allow_null=True), required=False
+    )
+    images = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False
+    )
+    discount = serializers.DecimalField(
+        max_digits=4, decimal_places=2, allow_null=True, required=False
+    )
+    dateFrom = serializers.DateField(allow_null=True, required=False)
+    dateTo = serializers.DateField(allow_null=True, required=False)
+    freeDelivery = serializers.BooleanField(default=False)
+    is_available = serializers.BooleanField(default=True)
+    is_limited = serializers.BooleanField(default=False)
+
+    def validate_category(self, value):
+        try:
+            return self.context["categories"][value]
+        except KeyError:
+            raise serializers.ValidationError(f"Категория {value!r} не найдена.")
+
+    def validate_subcategory(self, value):
+        try:
+            return self.context["subcategories"][value]
+        except KeyError:
+            raise serializers.ValidationError(f"Подкатегория {value!r} не найдена.")
+
+    def validate_specifications(self, value):
+        # `DictField` не проверяет ключи, а они пишутся в `Specification.name`
+        for name in value:
+            if len(name) > 150:
+                raise serializers.ValidationError(
+                    f"Название характеристики {name[:50]!r}... длиннее 150 символов."
+                )
+
+        return value
+
+    def validate(self, attrs):
+        if attrs.get("discount") is not None and not (
+            attrs.get("dateFrom") and attrs.get("dateTo")
+        ):
+            raise serializers.ValidationError(
+                "Для скидки нужно указать dateFrom и dateTo."
+            )
+
+        return attrs
+
+
+def _parse_csv_row(row: dict) -> dict:
+    """Приводим строку CSV к виду JSONL: списки через `|`, словари в JSON"""
+    parsed = {}
+    for key, value in row.items():
+        if key is None or value is None:
+            continue
+        if key in CSV_FLAG_COLUMNS and value == "":
+            continue
+        if value == "":
+            value = None
+        else:
+            value = unescape_csv_formula(value)
+        if key in ("tags", "images"):
+            value = [item for item in (value or "").split("|") if item]
+        elif key == "specifications":
+            value = json.loads(value) if value else {}
+        parsed[key] = value
+
+    return parsed
+
+
+def read_rows(file, file_format: str):
+    """Читаем фид построчно, не загружая его в память целиком"""
+    if isinstance(file, io.TextIOBase):
+        text = file
+    else:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    if file_format == "csv":
+        for row in csv.DictReader(text):
+            try:
+                yield _parse_csv_row(row)
+            except ValueError as exc:
+                yield exc
+    else:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                yield exc
+
+
+class CatalogImporter:
+    """
+    Класс для импорта каталога пачками.
+
+    Каждая пачка проверяется, после чего товары, теги, спецификации,
+    изображения и скидки записываются через `bulk_create(update_conflicts=True)`
+    по одному запросу на модель. Если БД отклонила пачку, она откатывается
+    и записывается построчно, а отклонённые строки попадают в отчёт.
+    """
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or settings.CATALOG_IMPORT_CHUNK_SIZE
+        self.categories = self._lookup_map(Category)
+        self.subcategories = self._lookup_map(Subcategory)
+        self.tags = dict(Tag.objects.values_list("name", "id"))
+        # один экземпляр на весь импорт: поля сериалайзера не копируются на каждую строку
+        self.row_serializer = CatalogRowSerializer(
+            context={
+                "categories": self.categories,
+                "subcategories": self.subcategories,
+            }
+        )
+        self.report = {
+            "rows": 0,
+            "created": 0,
+            "updated": 0,
+            "errors": [],
+        }
+
+    @staticmethod
+    def _lookup_map(model) -> dict:
+        lookup = {}
+        for pk, title, slug in model.objects.values_list("id", "title", "slug"):
+            lookup[title] = pk
+            if slug:
+                lookup[slug] = pk
+
+        return lookup
+
+    def add_error(self, row_number: int, errors):
+        self.report["errors"].append({"row": row_number, "errors": errors})
+
+    def run(self, rows) -> dict:
+        """Импортируем все строки фида и возвращаем отчёт"""
+        numbered_rows = enumerate(rows, start=1)
+        while chunk := list(islice(numbered_rows, self.chunk_size)):
+            self.report["rows"] += len(chunk)
+            valid_rows = self.validate_chunk(chunk)
+            if valid_rows:
+                self.save_rows(valid_rows)
+
+        return self.report
+
+    def save_rows(self, rows: list):
+        """Сохраняем пачку `(номер строки, данные)`, при ошибке БД — построчно"""
+        try:
+            with transaction.atomic():
+                created, updated = self.save_chunk([data for _, data in rows])
+        except (DataError, IntegrityError) as exc:
+            # новые теги могли откатиться вместе с пачкой
+            self.tags = dict(Tag.objects.values_list("name", "id"))
+            if len(rows) == 1:
+                self.add_error(rows[0][0], {"non_field_errors": [str(exc).strip()]})
+            else:
+                for row in rows:
+                    self.save_rows([row])
+            return
+
+        self.report["created"] += created
+        self.report["updated"] += updated
+
+    def validate_chunk(self, chunk) -> list:
+        valid_rows = {}
+        for row_number, row in chunk:
+            if isinstance(row, Exception):
+                self.add_error(row_number, {"non_field_errors": [str(row)]})
+                continue
+
+            try:
+                data = self.row_serializer.run_validation(row)
+            except serializers.ValidationError as exc:
+                self.add_error(row_number, exc.detail)
+                continue
+
+            if data["slug"] in valid_rows:
+                self.add_error(row_number, {"slug": ["Повтор slug в одной пачке."]})
+                continue
+            valid_rows[data["slug"]] = (row_number, data)
+
+        existing_titles = dict(
+            Product.objects.filter(
+                title__in=[data["title"] for _, data in valid_rows.values()]
+            ).values_list("title", "slug")
+        )
+        checked_rows = []
+        for slug, (row_number, data) in valid_rows.items():
+            if existing_titles.setdefault(data["title"], slug) != slug:
+                self.add_error(
+                    row_number, {"title": ["Товар с таким названием уже существует."]}
+                )
+                continue
+            checked_rows.append((row_number, data))
+
+        return checked_rows
+
+    def save_chunk(self, rows: list) -> tuple:
+        """Записываем проверенные строки и возвращаем (создано, обновлено)"""
+        slugs = [row["slug"] for row in rows]
+        existing = set(
+            Product.objects.filter(slug__in=slugs).values_list("slug", flat=True)
+        )
+
+        Product.objects.bulk_create(
+            [
+                Product(
+                    slug=row["slug"],
+                    title=row["title"],
+                    description=row.get("description"),
+                    fullDescription=row.get("fullDescription"),
+                    price=row["price"],
+                    count=row["count"],
+                    category_id=row["category"],
+                    subcategory_id=row["subcategory"],
+                    freeDelivery=row["freeDelivery"],
+                    is_available=row["is_available"],
+                    is_limited=row["is_limited"],
+                )
+                for row in rows
+            ],
+            update_conflicts=True,
+            unique_fields=["slug"],
+            update_fields=PRODUCT_UPDATE_FIELDS,
+        )
+        product_ids = dict(
+            Product.objects.filter(slug__in=slugs).values_list("slug", "id")
+        )
+        for row in rows:
+            row["product_id"] = product_ids[row["slug"]]
+
+        self.save_tags([row for row in rows if "tags" in row])
+        self.save_specifications([row for row in rows if "specifications" in row])
+        self.save_images([row for row in rows if row.get("images")])
+        self.save_sales([row for row in rows if "discount" in row])
+        touch_products(product_ids.values())
+        transaction.on_commit(invalidate_category_tree)
+
+        return len(slugs) - len(existing), len(existing)
+
+    def save_tags(self, rows: list):
+        if not rows:
+            return
+
+        new_names = {name for row in rows for name in row["tags"]} - self.tags.keys()
+        if new_names:
+            Tag.objects.bulk_create(
+                [Tag(name=name) for name in new_names], ignore_conflicts=True
+            )
+            self.tags.update(
+                Tag.objects.filter(name__in=new_names).values_list("name", "id")
+            )
+            transaction.on_commit(lambda: reference_cache.invalidate("tags"))
+
+        ProductTag = Product.tags.through
+        product_ids = [row["product_id"] for row in rows]
+        ProductTag.objects.filter(product_id__in=product_ids).delete()
+        ProductTag.objects.bulk_create(
+            [
+                ProductTag(product_id=row["product_id"], tag_id=self.tags[name])
+                for row in rows
+                for name in set(row["tags"])
+            ],
+            ignore_conflicts=True,
+        )
+
+    def save_specifications(self, rows: list):
+        if not rows:
+            return
+
+        specifications = [
+            Specification(product_id=row["product_id"], name=name, value=value)
+            for row in rows
+            for name, value in row["specifications"].items()
+        ]
+        Specification.objects.bulk_create(
+            specifications,
+            update_conflicts=True,
+            unique_fields=["product", "name"],
+            update_fields=["value"],
+        )
+
+        actual = {(spec.product_id, spec.name) for spec in specifications}
+        stale_ids = [
+            pk
+            for pk, product_id, name in Specification.objects.filter(
+                product_id__in=[row["product_id"] for row in rows]
+            ).values_list("id", "product_id", "name")
+            if (product_id, name) not in actual
+        ]
+        Specification.objects.filter(id__in=stale_ids).delete()
+
+    def save_images(self, rows: list):
+        existing = set(
+            ProductImage.objects.filter(
+                product_id__in=[row["product_id"] for row in rows]
+            ).values_list("product_id", "image")
+        )
+        new_images = {
+            (row["product_id"], image)
+            for row in rows
+            for image in row["images"]
+            if (row["product_id"], image) not in existing
+        }
+        ProductImage.objects.bulk_create(
+            [
+                ProductImage(product_id=product_id, image=image)
+                for product_id, image in new_images
+            ]
+        )
+
+    def save_sales(self, rows: list):
+        sales = [row for row in rows if row["discount"] is not None]
+        Sale.objects.bulk_create(
+            [
+                Sale(
+                    product_id=row["product_id"],
+                    discount=row["discount"],
+                    dateFrom=row["dateFrom"],
+                    dateTo=row["dateTo"],
+                )
+                for row in sales
+            ],
+            update_conflicts=True,
+            unique_fields=["product"],
+            update_fields=["discount", "dateFrom", "dateTo"],
+        )
+        Sale.objects.filter(
+            product_id__in=[
+                row["product_id"] for row in rows if row["discount"] is None
+            ]
+        ).delete()
@@ -0,0 +1,135 @@
+"""Команда для сравнения обычных и облегчённых сериалайзеров списков"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from baskets.models import Basket
+from baskets.serializers import ShowBasketItemRowSerializer, ShowBasketItemSerializer
+from core.fastjson import FastJSONRenderer
+from products.models import Product
+from products.serializers import (
+    PartialProductRowSerializer,
+    PartialProductSerializer,
+    SalesProductRowSerializer,
+    SalesProductSerializer,
+)
+
+
+def _catalog_queryset():
+    return Product.objects.prefetch_related("images", "tags", "reviews").order_by("id")
+
+
+def _sales_queryset():
+    return Product.objects.filter(discounted__isnull=False).order_by("id")
+
+
+def _basket_queryset():
+    return Basket.objects.select_related("product").order_by("id")
+
+
+BENCHMARKS = {
+    "catalog": (
+        _catalog_queryset,
+        PartialProductSerializer,
+        PartialProductRowSerializer,
+    ),
+    "sales": (_sales_queryset, SalesProductSerializer, SalesProductRowSerializer),
+    "basket": (_basket_queryset, ShowBasketItemSerializer, ShowBasketItemRowSerializer),
+}
+
+
+def _measure(render, repeat: int):
+    """Лучшее время из `repeat` прогонов, число запросов и результат"""
+    best = None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            content = render()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, len(queries), content
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that row serializers with FastJSONRenderer produce the same bytes "
+        "as the model serializers with JSONRenderer and compare their speed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="Number of objects in each list",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of runs, the best time is reported",
+        )
+        parser.add_argument(
+            "benchmarks",
+            nargs="*",
+            help=f"Lists to check: {', '.join(BENCHMARKS)} (all by default)",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["benchmarks"]) - BENCHMARKS.keys()
+        if unknown:
+            raise CommandError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+        mismatches = []
+        for name in options["benchmarks"] or BENCHMARKS:
+            get_queryset, serializer_class, row_serializer_class = BENCHMARKS[name]
+            queryset = get_queryset()[: options["limit"]]
+            count = queryset.count()
+            if not count:
+                self.stdout.write(f"{name}: no objects, skipped")
+                continue
+
+            def render_objects():
+                data = serializer_class(queryset.all(), many=True).data
+                return JSONRenderer().render(data)
+
+            def render_rows():
+                rows = row_serializer_class.get_rows(queryset.all())
+                data = row_serializer_class(rows, many=True).data
+                return FastJSONRenderer().render(data)
+
+            objects_time, objects_queries, expected = _measure(
+                render_objects, options["repeat"]
+            )
+            rows_time, rows_queries, content = _measure(render_rows, options["repeat"])
+
+            if content == expected:
+                result = "identical output"
+            else:
+                position = next(
+                    (
+                        index
+                        for index, (left, right) in enumerate(zip(expected, content))
+                        if left != right
+                    ),
+                    min(len(expected), len(content)),
+                )
+                result = f"OUTPUT DIFFERS at byte {position}"
+                mismatches.append(name)
+
+            scale = 1000 / count
+            self.stdout.write(
+                f"{name}: {count} objects, {len(content)} bytes, {result}\n"
+                f"  serializer: {objects_time * scale * 1000:.1f} ms per 1000 "
+                f"({objects_queries} queries)\n"
+                f"  rows:       {rows_time * scale * 1000:.1f} ms per 1000 "
+                f"({rows_queries} queries)"
+            )
+
+        if mismatches:
+            raise CommandError(f"Output differs for: {', '.join(mismatches)}")
@@ -0,0 +1,42 @@
+"""Команда для пакетного импорта каталога товаров"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importers import IMPORT_FORMATS, CatalogImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Import products with tags, specifications, images and sales from a CSV/JSONL feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path, help="Path to the catalog feed")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=IMPORT_FORMATS,
+            help="Feed format (default: taken from the file extension)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows validated and saved per batch",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or path.suffix.lstrip(".").lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f"Unknown feed format: {file_format!r}")
+
+        importer = CatalogImporter(chunk_size=options["chunk_size"])
+        with path.open(encoding="utf-8-sig", newline="") as feed:
+            report = importer.run(read_rows(feed, file_format))
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            f"Rows: {report['rows']}, created: {report['created']}, "
+            f"updated: {report['updated']}, errors: {len(report['errors'])}"
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.14 on 2026-10-19 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0002_alter_sale_datefrom_alter_sale_dateto"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="specification",
+            name="name",
+            field=models.CharField(max_length=150, verbose_name="Название"),
+        ),
+        migrations.AddConstraint(
+            model_name="specification",
+            constraint=models.UniqueConstraint(
+                fields=("product", "name"), name="unique_product_specification"
+            ),
+        ),
+    ]
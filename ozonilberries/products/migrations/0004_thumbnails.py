@@ -0,0 +1,43 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_specification_unique_per_product"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="thumbnails",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Уменьшенные копии",
+            ),
+        ),
+        migrations.AddField(
+            model_name="productimage",
+            name="thumbnails",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Уменьшенные копии",
+            ),
+        ),
+        migrations.AddField(
+            model_name="subcategory",
+            name="thumbnails",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Уменьшенные копии",
+            ),
+        ),
+    ]
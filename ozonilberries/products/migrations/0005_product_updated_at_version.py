@@ -0,0 +1,25 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Дата изменения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="version",
+            field=models.PositiveIntegerField(default=1, verbose_name="Версия"),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_review_stats(apps, schema_editor):
+    Review = apps.get_model("products", "Review")
+    ProductReviewStats = apps.get_model("products", "ProductReviewStats")
+
+    stats = {}
+    for row in Review.objects.values("product_id", "rate").annotate(total=Count("id")):
+        product_stats = stats.setdefault(
+            row["product_id"], ProductReviewStats(product_id=row["product_id"])
+        )
+        setattr(product_stats, f"rate_{row['rate']}", row["total"])
+        product_stats.reviews_count += row["total"]
+        product_stats.rate_sum += row["rate"] * row["total"]
+
+    ProductReviewStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0005_product_updated_at_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductReviewStats",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="review_stats",
+                        serialize=False,
+                        to="products.product",
+                        verbose_name="Товар",
+                    ),
+                ),
+                (
+                    "reviews_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество отзывов"
+                    ),
+                ),
+                (
+                    "rate_sum",
+                    models.PositiveIntegerField(default=0, verbose_name="Сумма оценок"),
+                ),
+                (
+                    "rate_0",
+                    models.PositiveIntegerField(default=0, verbose_name="Оценок 0"),
+                ),
+                (
+                    "rate_1",
+                    models.PositiveIntegerField(default=0, verbose_name="Оценок 1"),
+                ),
+                (
+                    "rate_2",
+                    models.PositiveIntegerField(default=0, verbose_name="Оценок 2"),
+                ),
+                (
+                    "rate_3",
+                    models.PositiveIntegerField(default=0, verbose_name="Оценок 3"),
+                ),
+                (
+                    "rate_4",
+                    models.PositiveIntegerField(default=0, verbose_name="Оценок 4"),
+                ),
+                (
+                    "rate_5",
+                    models.PositiveIntegerField(default=0, verbose_name="Оценок 5"),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика отзывов",
+                "verbose_name_plural": "Статистика отзывов",
+                "db_table": "product_review_stats",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["product", "date"], name="review_product_0fa8c6_idx"
+            ),
+        ),
+        migrations.RunPython(fill_review_stats, migrations.RunPython.noop),
+    ]
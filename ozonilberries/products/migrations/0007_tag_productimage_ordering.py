@@ -0,0 +1,29 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0006_product_review_stats"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="productimage",
+            options={
+                "ordering": ("id",),
+                "verbose_name": "Изображение товара",
+                "verbose_name_plural": "Изображения товаров",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="tag",
+            options={
+                "ordering": ("id",),
+                "verbose_name": "Тэг",
+                "verbose_name_plural": "Тэги",
+            },
+        ),
+    ]
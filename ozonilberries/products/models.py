@@ -1,21 +1,21 @@
 """Модуль для описания модели 'Product' для БД и связанных с ней"""
 
-from django.conf import settings
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import Avg
 
+from core.images import image_info
+
 User = get_user_model()
 
 
 class GetImageInfoMixin:
 
     def show_image_info(self):
-        return {
-            "src": f"{settings.MEDIA_URL}{self.image}",
-            "alt": self.title,
-        }
+        return image_info(self.image, self.thumbnails, self.title)
 
 
 def product_category_directory_path(instance: "Category", filename: str) -> str:
@@ -41,6 +41,9 @@ class Subcategory(GetImageInfoMixin, models.Model):
         null=True,
         verbose_name="Изображение",
     )
+    thumbnails = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Уменьшенные копии"
+    )
 
     class Meta:
         db_table = "subcategory"
@@ -62,6 +65,9 @@ class Category(GetImageInfoMixin, models.Model):
         null=True,
         verbose_name="Изображение",
     )
+    thumbnails = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Уменьшенные копии"
+    )
     subcategories = models.ManyToManyField(
         to=Subcategory, related_name="categories", verbose_name="Подкатегория"
     )
@@ -80,6 +86,7 @@ class Tag(models.Model):
 
     class Meta:
         db_table = "tag"
+        ordering = ("id",)
         verbose_name = "Тэг"
         verbose_name_plural = "Тэги"
 
@@ -120,6 +127,11 @@ class Product(models.Model):
     # sold_count = models.PositiveIntegerField(default=0, verbose_name='Количество проданного')
     freeDelivery = models.BooleanField(default=False)
     date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name="Дата изменения"
+    )
+    # увеличивается при любом изменении товара и связанных с ним данных
+    version = models.PositiveIntegerField(default=1, verbose_name="Версия")
     is_available = models.BooleanField(default=True)
     is_limited = models.BooleanField(default=False)
 
@@ -135,15 +147,27 @@ class Product(models.Model):
         return f"{self.id:05}"
 
     def show_rating(self):
-        rating = self.reviews.aggregate(Avg("rate"))
-        if not rating["rate__avg"]:
+        # рейтинг мог быть уже посчитан в запросе через `annotate(rating=...)`
+        if hasattr(self, "rating"):
+            rating = self.rating
+        else:
+            rating = self.reviews.aggregate(Avg("rate"))["rate__avg"]
+        if not rating:
             return 0.0
-        return round(rating["rate__avg"], 1)
+        return round(rating, 1)
 
     def show_reviews_count(self):
+        if hasattr(self, "reviews_count"):
+            return self.reviews_count
         return self.reviews.count()
 
 
+def calculate_sale_price(price: Decimal, discount: Decimal) -> Decimal:
+    if discount != 0:
+        return round(price - (price * discount) / 100, 2)
+    return price
+
+
 class Sale(models.Model):
     product = models.OneToOneField(
         to=Product,
@@ -154,8 +178,12 @@ class Sale(models.Model):
     discount = models.DecimalField(
         max_digits=4, decimal_places=2, verbose_name="Скидка в %"
     )
-    dateFrom = models.DateField(verbose_name="Начало распродажи",)
-    dateTo = models.DateField(verbose_name="Конец распродажи",)
+    dateFrom = models.DateField(
+        verbose_name="Начало распродажи",
+    )
+    dateTo = models.DateField(
+        verbose_name="Конец распродажи",
+    )
 
     class Meta:
         db_table = "sale"
@@ -163,11 +191,7 @@ class Sale(models.Model):
         verbose_name_plural = "Скидки"
 
     def sale_price(self):
-        if self.discount != 0:
-            return round(
-                self.product.price - (self.product.price * self.discount) / 100, 2
-            )
-        return self.product.price
+        return calculate_sale_price(self.product.price, self.discount)
 
     def __str__(self):
         return f"Текущая скидка на товар: {self.product.title} _{self.discount}% до {self.dateTo} числа."
@@ -180,6 +204,9 @@ class ProductImage(models.Model):
         null=True,
         verbose_name="Изображение",
     )
+    thumbnails = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Уменьшенные копии"
+    )
     product = models.ForeignKey(
         to=Product,
         on_delete=models.CASCADE,
@@ -189,6 +216,7 @@ class ProductImage(models.Model):
 
     class Meta:
         db_table = "product_image"
+        ordering = ("id",)
         verbose_name = "Изображение товара"
         verbose_name_plural = "Изображения товаров"
 
@@ -227,13 +255,54 @@ class Review(models.Model):
                 name="Оценка должна быть от 0 до 5",
             )
         ]
+        indexes = [
+            models.Index(fields=["product", "date"]),
+        ]
 
     def __str__(self):
         return f"Оценка на {self.product.title} от {self.author}"
 
 
+class ProductReviewStats(models.Model):
+    """Счётчики отзывов товара по оценкам, обновляются сигналами модели `Review`"""
+
+    product = models.OneToOneField(
+        to=Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="review_stats",
+        verbose_name="Товар",
+    )
+    reviews_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество отзывов"
+    )
+    rate_sum = models.PositiveIntegerField(default=0, verbose_name="Сумма оценок")
+    rate_0 = models.PositiveIntegerField(default=0, verbose_name="Оценок 0")
+    rate_1 = models.PositiveIntegerField(default=0, verbose_name="Оценок 1")
+    rate_2 = models.PositiveIntegerField(default=0, verbose_name="Оценок 2")
+    rate_3 = models.PositiveIntegerField(default=0, verbose_name="Оценок 3")
+    rate_4 = models.PositiveIntegerField(default=0, verbose_name="Оценок 4")
+    rate_5 = models.PositiveIntegerField(default=0, verbose_name="Оценок 5")
+
+    class Meta:
+        db_table = "product_review_stats"
+        verbose_name = "Статистика отзывов"
+        verbose_name_plural = "Статистика отзывов"
+
+    def __str__(self):
+        return f"Отзывы на товар {self.product_id}: {self.reviews_count}"
+
+    def show_rating(self):
+        if not self.reviews_count:
+            return 0.0
+        return round(self.rate_sum / self.reviews_count, 1)
+
+    def show_histogram(self):
+        return {str(rate): getattr(self, f"rate_{rate}") for rate in range(6)}
+
+
 class Specification(models.Model):
-    name = models.CharField(max_length=150, unique=True, verbose_name="Название")
+    name = models.CharField(max_length=150, verbose_name="Название")
     value = models.TextField(blank=True, null=True, verbose_name="Параметры")
     product = models.ForeignKey(
         to=Product,
@@ -246,6 +315,11 @@ class Specification(models.Model):
         db_table = "specification"
         verbose_name = "Спецификация"
         verbose_name_plural = "Спецификации"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "name"], name="unique_product_specification"
+            )
+        ]
 
     def __str__(self):
         return self.name
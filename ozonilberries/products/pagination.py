@@ -0,0 +1,18 @@
+"""Модуль для описания пагинации, связанной с моделью `Product`"""
+
+from django.conf import settings
+
+from core.pagination import KeysetCursorPagination
+
+
+class ReviewCursorPagination(KeysetCursorPagination):
+    """Курсорная пагинация отзывов товара с сортировкой по дате или оценке"""
+
+    page_size = settings.PRODUCT_DETAIL_REVIEWS_LIMIT
+    sort_options = {
+        "-date": ("-date", "-id"),
+        "date": ("date", "id"),
+        "-rate": ("-rate", "-date", "-id"),
+        "rate": ("rate", "date", "id"),
+    }
+    default_sort = "-date"
@@ -0,0 +1,20 @@
+"""Модуль для справочных данных каталога, кэшируемых в памяти процесса"""
+
+from core.refcache import reference_cache
+from products.models import Category, Subcategory, Tag
+
+
+def load_categories() -> list:
+    return list(Category.objects.prefetch_related("subcategories").order_by("id"))
+
+
+def load_tags() -> list:
+    return list(Tag.objects.order_by("id"))
+
+
+def get_tag_choices() -> list:
+    return [(str(tag.id), tag.name) for tag in reference_cache.get("tags")]
+
+
+reference_cache.register("categories", load_categories, models=[Category, Subcategory])
+reference_cache.register("tags", load_tags, models=[Tag])
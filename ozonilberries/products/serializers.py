@@ -1,19 +1,32 @@
 """Модуль для описания сериалайзеров для модели 'Product' и связанных с ней"""
 
+from collections import defaultdict
+from decimal import Decimal
+
 from django.conf import settings
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from core.fieldsets import SparseFieldsetMixin
+from core.images import build_srcset, image_info
+from core.rows import RowSerializer
+from products.importers import IMPORT_FORMATS
 from products.models import (
     Category,
     Product,
     ProductImage,
+    ProductReviewStats,
     Review,
     Specification,
     Subcategory,
     Tag,
+    calculate_sale_price,
 )
 
+PRICE_FIELD = serializers.DecimalField(max_digits=7, decimal_places=2)
+DATE_FIELD = serializers.DateField()
+DATETIME_FIELD = serializers.DateTimeField()
+
 
 class ProductImageSerializer(serializers.ModelSerializer):
     """Класс сериалайзера для работы с изображениями модели `Product`"""
@@ -21,12 +34,16 @@ class ProductImageSerializer(serializers.ModelSerializer):
     # src = serializers.CharField(source='image')
     src = serializers.SerializerMethodField()
     alt = serializers.CharField(source="product.title")
+    srcset = serializers.SerializerMethodField()
+    srcsetJpeg = serializers.SerializerMethodField()
 
     class Meta:
         model = ProductImage
         fields = (
             "src",
             "alt",
+            "srcset",
+            "srcsetJpeg",
         )
         # extra_kwargs = {
         #     'src': {'source': 'image', 'read_only': True},
@@ -37,6 +54,12 @@ class ProductImageSerializer(serializers.ModelSerializer):
         full_path = f"{settings.MEDIA_URL}{obj.image}"
         return full_path
 
+    def get_srcset(self, obj) -> str:
+        return build_srcset(obj.thumbnails, "webp")
+
+    def get_srcsetJpeg(self, obj) -> str:
+        return build_srcset(obj.thumbnails, "jpeg")
+
 
 class SubcategorySerializer(serializers.ModelSerializer):
     """Класс сериалайзера для работы с подкатегориями модели `Product`"""
@@ -110,12 +133,31 @@ class ReviewSerializer(serializers.ModelSerializer):
         )
 
 
-class FullProductSerializer(serializers.ModelSerializer):
+class ReviewSummarySerializer(serializers.ModelSerializer):
+    """Класс сериалайзера для сводки по оценкам отзывов модели `Product`"""
+
+    count = serializers.IntegerField(source="reviews_count")
+    rating = serializers.FloatField(source="show_rating")
+    histogram = serializers.DictField(
+        source="show_histogram", child=serializers.IntegerField()
+    )
+
+    class Meta:
+        model = ProductReviewStats
+        fields = (
+            "count",
+            "rating",
+            "histogram",
+        )
+
+
+class FullProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Класс сериалайзера для полного описания модели `Product`"""
 
     images = serializers.SerializerMethodField()
     tags = TagSerializer(many=True)
-    reviews = ReviewSerializer(many=True)
+    reviews = serializers.SerializerMethodField()
+    reviewsCount = serializers.IntegerField(source="show_reviews_count")
     specifications = SpecificationSerializer(many=True)
     rating = serializers.FloatField(source="show_rating")
 
@@ -134,6 +176,7 @@ class FullProductSerializer(serializers.ModelSerializer):
             "images",
             "tags",
             "reviews",
+            "reviewsCount",
             "specifications",
             "rating",
         )
@@ -151,8 +194,18 @@ class FullProductSerializer(serializers.ModelSerializer):
         all_images = obj.images.all()
         return ProductImageSerializer([img for img in all_images], many=True).data
 
+    @extend_schema_field(ReviewSerializer(many=True))
+    def get_reviews(self, obj):
+        """Последние отзывы: подгруженные заранее или первые из БД"""
+        reviews = getattr(obj, "latest_reviews", None)
+        if reviews is None:
+            reviews = obj.reviews.select_related("author__profile").order_by(
+                "-date", "-id"
+            )[: settings.PRODUCT_DETAIL_REVIEWS_LIMIT]
+        return ReviewSerializer(reviews, many=True).data
+
 
-class PartialProductSerializer(serializers.ModelSerializer):
+class PartialProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Класс сериалайзера для частичного описания модели `Product`"""
 
     images = serializers.SerializerMethodField()
@@ -191,7 +244,7 @@ class PartialProductSerializer(serializers.ModelSerializer):
         return ProductImageSerializer([img for img in all_images], many=True).data
 
 
-class SalesProductSerializer(serializers.ModelSerializer):
+class SalesProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Класс сериалайзера для работы со скидками модели `Product`"""
 
     images = serializers.SerializerMethodField()
@@ -225,3 +278,167 @@ class SalesProductSerializer(serializers.ModelSerializer):
     def get_images(self, obj):
         all_images = obj.images.all()
         return ProductImageSerializer([img for img in all_images], many=True).data
+
+
+class ProductRowSerializer(RowSerializer):
+    """
+    Базовый класс облегчённого сериалайзера для строк с товаром.
+
+    Изображения и теги всех товаров страницы загружаются двумя запросами,
+    количество отзывов и рейтинг берутся из `ProductReviewStats`.
+    """
+
+    product_key = "id"
+    title_key = "title"
+    load_tags = True
+
+    def prepare_rows(self, rows: list):
+        product_ids = [row[self.product_key] for row in rows]
+
+        self.images = defaultdict(list)
+        self.tags = defaultdict(list)
+
+        if self.is_requested("images"):
+            images = (
+                ProductImage.objects.filter(product_id__in=product_ids)
+                .order_by("id")
+                .values_list("product_id", "image", "thumbnails")
+            )
+            for product_id, image, thumbnails in images:
+                self.images[product_id].append((image or "", thumbnails))
+
+        if self.load_tags and self.is_requested("tags"):
+            tags = (
+                Product.tags.through.objects.filter(product_id__in=product_ids)
+                .order_by("tag_id")
+                .values_list("product_id", "tag_id", "tag__name")
+            )
+            for product_id, tag_id, name in tags:
+                self.tags[product_id].append({"id": tag_id, "name": name})
+
+    def get_images(self, row: dict) -> list:
+        title = row[self.title_key]
+        return [
+            image_info(image, thumbnails, title)
+            for image, thumbnails in self.images[row[self.product_key]]
+        ]
+
+    @staticmethod
+    def get_rating(reviews_count, rate_sum) -> float:
+        # то же значение, что `Product.show_rating()` по средней оценке отзывов
+        if not reviews_count or not rate_sum:
+            return 0.0
+        return round(rate_sum / reviews_count, 1)
+
+
+class PartialProductRowSerializer(ProductRowSerializer):
+    """Класс облегчённого сериалайзера, совпадающий с `PartialProductSerializer`"""
+
+    row_fields = (
+        "id",
+        "category",
+        "price",
+        "count",
+        "date",
+        "title",
+        "description",
+        "freeDelivery",
+        "review_stats__reviews_count",
+        "review_stats__rate_sum",
+        # для ETag списка (`ConditionalListMixin`)
+        "updated_at",
+    )
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "category": row["category"],
+            "price": PRICE_FIELD.to_representation(row["price"]),
+            "count": row["count"],
+            "date": DATETIME_FIELD.to_representation(row["date"]),
+            "title": row["title"],
+            "description": row["description"],
+            "freeDelivery": row["freeDelivery"],
+            "images": self.get_images(row),
+            "tags": self.tags[row["id"]],
+            "reviews": row["review_stats__reviews_count"] or 0,
+            "rating": self.get_rating(
+                row["review_stats__reviews_count"], row["review_stats__rate_sum"]
+            ),
+        }
+
+
+class SalesProductRowSerializer(ProductRowSerializer):
+    """Класс облегчённого сериалайзера, совпадающий с `SalesProductSerializer`"""
+
+    load_tags = False
+    row_fields = (
+        "id",
+        "price",
+        "title",
+        "discounted__discount",
+        "discounted__dateFrom",
+        "discounted__dateTo",
+        # для ETag списка (`ConditionalListMixin`)
+        "updated_at",
+    )
+
+    def to_representation(self, row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "price": PRICE_FIELD.to_representation(row["price"]),
+            "salePrice": PRICE_FIELD.to_representation(
+                calculate_sale_price(row["price"], row["discounted__discount"])
+            ),
+            "dateFrom": DATE_FIELD.to_representation(row["discounted__dateFrom"]),
+            "dateTo": DATE_FIELD.to_representation(row["discounted__dateTo"]),
+            "title": row["title"],
+            "images": self.get_images(row),
+        }
+
+
+class CatalogImportSerializer(serializers.Serializer):
+    """Класс сериалайзера для загрузки фида каталога"""
+
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=IMPORT_FORMATS, required=False)
+
+    def validate(self, attrs):
+        if "file_format" not in attrs:
+            extension = attrs["file"].name.rsplit(".", 1)[-1].lower()
+            if extension not in IMPORT_FORMATS:
+                raise serializers.ValidationError(
+                    {"file_format": "Не удалось определить формат файла."}
+                )
+            attrs["file_format"] = extension
+
+        return attrs
+
+
+class StockUpdateSerializer(serializers.Serializer):
+    """Класс сериалайзера для обновления остатка и цены одного товара"""
+
+    id = serializers.IntegerField(min_value=1, required=False)
+    slug = serializers.SlugField(max_length=200, required=False)
+    count = serializers.IntegerField(min_value=0, required=False)
+    price = serializers.DecimalField(
+        max_digits=7, decimal_places=2, min_value=Decimal("0"), required=False
+    )
+
+    def validate(self, attrs):
+        if "id" not in attrs and "slug" not in attrs:
+            raise serializers.ValidationError("Нужно указать id или slug товара.")
+        if "count" not in attrs and "price" not in attrs:
+            raise serializers.ValidationError("Нужно указать count или price.")
+
+        return attrs
+
+
+class StockSyncSerializer(serializers.Serializer):
+    """Класс сериалайзера для пакетного обновления остатков и цен"""
+
+    products = serializers.ListField(
+        child=StockUpdateSerializer(),
+        allow_empty=False,
+        max_length=settings.STOCK_SYNC_MAX_ITEMS,
+    )
@@ -0,0 +1,157 @@
+"""Модуль для описания сигналов для модели 'Product' и связанных с ней"""
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.images import schedule_image_processing
+from core.refcache import reference_cache
+from core.signals import image_processed
+from products.cache import invalidate_products, touch_products
+from products.models import (
+    Category,
+    Product,
+    ProductImage,
+    ProductReviewStats,
+    Review,
+    Sale,
+    Specification,
+    Subcategory,
+)
+from products.tree import invalidate_category_tree
+
+# поля товара, от которых зависят количества в дереве категорий
+TREE_FIELDS = ("is_available", "category_id", "subcategory_id")
+
+
+@receiver(pre_save, sender=Product)
+def pre_save_product(sender, instance: Product, **kwargs):
+    """Сигнал для увеличения версии товара и запоминания полей дерева категорий"""
+    if not instance._state.adding:
+        instance.version += 1
+        instance.previous_tree_fields = (
+            Product.objects.filter(pk=instance.pk).values_list(*TREE_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_cache(sender, instance: Product, **kwargs):
+    """Сигнал для сброса кэша каталога после изменения товара"""
+    transaction.on_commit(lambda: invalidate_products([instance.pk]))
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Subcategory)
+def post_save_image(sender, instance, **kwargs):
+    """Сигнал для обработки изображения после загрузки"""
+    schedule_image_processing(instance, "image")
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+@receiver(post_save, sender=Specification)
+@receiver(post_delete, sender=Specification)
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def touch_product(sender, instance, **kwargs):
+    """Сигнал для обновления версии товара при изменении связанных данных"""
+    touch_products([instance.product_id])
+
+
+@receiver(m2m_changed, sender=Product.tags.through)
+def touch_product_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Сигнал для обновления версии товаров при изменении их тегов"""
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            touch_products([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        touch_products(pk_set)
+    elif action == "pre_clear":
+        # после очистки со стороны тега список его товаров уже не получить
+        touch_products(instance.products.values_list("id", flat=True))
+
+
+@receiver(image_processed, sender=ProductImage)
+def touch_product_image(sender, pk, **kwargs):
+    """Сигнал для обновления версии товара после обработки изображения"""
+    product_id = ProductImage.objects.filter(pk=pk).values_list("product_id", flat=True)
+    touch_products(product_id)
+
+
+def _change_review_stats(product_id: int, rate: int, delta: int):
+    """Меняем счётчики отзывов товара на `delta` для оценки `rate`"""
+    fields = {
+        "reviews_count": F("reviews_count") + delta,
+        "rate_sum": F("rate_sum") + rate * delta,
+        f"rate_{rate}": F(f"rate_{rate}") + delta,
+    }
+    stats = ProductReviewStats.objects.filter(product_id=product_id)
+    if not stats.update(**fields) and delta > 0:
+        ProductReviewStats.objects.get_or_create(product_id=product_id)
+        stats.update(**fields)
+
+
+@receiver(pre_save, sender=Review)
+def pre_save_review(sender, instance: Review, **kwargs):
+    """Сигнал для запоминания прежней оценки перед изменением отзыва"""
+    if not instance._state.adding:
+        instance.previous_rate = (
+            Review.objects.filter(pk=instance.pk).values_list("rate", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def post_save_review(sender, instance: Review, created, **kwargs):
+    """Сигнал для обновления счётчиков отзывов товара"""
+    if created:
+        _change_review_stats(instance.product_id, instance.rate, 1)
+        return
+
+    previous_rate = getattr(instance, "previous_rate", None)
+    if previous_rate is not None and previous_rate != instance.rate:
+        _change_review_stats(instance.product_id, previous_rate, -1)
+        _change_review_stats(instance.product_id, instance.rate, 1)
+
+
+@receiver(post_delete, sender=Review)
+def post_delete_review(sender, instance: Review, **kwargs):
+    """Сигнал для обновления счётчиков отзывов товара после удаления отзыва"""
+    _change_review_stats(instance.product_id, instance.rate, -1)
+
+
+@receiver(image_processed, sender=Category)
+@receiver(image_processed, sender=Subcategory)
+def invalidate_categories(sender, **kwargs):
+    """Сигнал для сброса кэша категорий после обработки их изображений"""
+    reference_cache.invalidate("categories")
+    invalidate_category_tree()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Subcategory)
+@receiver(post_delete, sender=Subcategory)
+@receiver(m2m_changed, sender=Category.subcategories.through)
+def invalidate_tree(sender, **kwargs):
+    """Сигнал для пересборки дерева категорий после изменения категорий"""
+    transaction.on_commit(invalidate_category_tree)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_tree_counts(sender, instance: Product, **kwargs):
+    """
+    Сигнал для пересборки дерева категорий после изменения количеств товаров.
+
+    Дерево сбрасывается при добавлении и удалении товара, а также когда
+    у товара меняется доступность, категория или подкатегория.
+    """
+    previous = getattr(instance, "previous_tree_fields", None)
+    current = tuple(getattr(instance, field) for field in TREE_FIELDS)
+    if kwargs.get("created", True) or previous != current:
+        transaction.on_commit(invalidate_category_tree)
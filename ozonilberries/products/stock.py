@@ -0,0 +1,87 @@
+"""Модуль для пакетного обновления остатков и цен товаров"""
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from products.cache import invalidate_products
+from products.models import Product
+from products.tree import invalidate_category_tree
+
+STOCK_UPDATE_SQL = """
+    UPDATE {table} AS p
+    SET
+        count = COALESCE(v.count, p.count),
+        price = COALESCE(v.price, p.price),
+        version = p.version + 1,
+        updated_at = NOW(),
+        is_available = CASE
+            WHEN v.count IS NULL THEN p.is_available
+            WHEN v.count = 0 THEN FALSE
+            WHEN p.count = 0 THEN TRUE
+            ELSE p.is_available
+        END
+    FROM (VALUES {values}) AS v(id, count, price)
+    WHERE p.id = v.id
+    RETURNING p.id
+"""
+STOCK_UPDATE_ROW_SQL = "(%s::bigint, %s::integer, %s::numeric)"
+
+
+def _resolve_ids(updates: list) -> tuple:
+    """Заменяем slug на id товара одним запросом, возвращаем ненайденные slug"""
+    slugs = {update["slug"] for update in updates if update.get("id") is None}
+    ids_by_slug = dict(Product.objects.filter(slug__in=slugs).values_list("slug", "id"))
+
+    resolved = {}
+    for update in updates:
+        product_id = update.get("id") or ids_by_slug.get(update.get("slug"))
+        if product_id is not None:
+            # при повторе товара в запросе применяется последнее обновление
+            resolved[product_id] = update
+
+    return resolved, sorted(slugs - ids_by_slug.keys())
+
+
+def apply_stock_updates(updates: list) -> dict:
+    """
+    Применяем обновления остатков и цен пачками.
+
+    Каждая пачка из `STOCK_SYNC_BATCH_SIZE` товаров записывается одним
+    `UPDATE ... FROM (VALUES ...)`. Товар становится недоступным, когда остаток
+    доходит до нуля, и снова доступным, когда приходит на пустой склад.
+    """
+    resolved, missing_slugs = _resolve_ids(updates)
+    batch_size = settings.STOCK_SYNC_BATCH_SIZE
+    product_ids = sorted(resolved)
+    updated_ids = []
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(product_ids), batch_size):
+            batch = product_ids[start : start + batch_size]
+            params = []
+            for product_id in batch:
+                params += [
+                    product_id,
+                    resolved[product_id].get("count"),
+                    resolved[product_id].get("price"),
+                ]
+
+            cursor.execute(
+                STOCK_UPDATE_SQL.format(
+                    table=connection.ops.quote_name(Product._meta.db_table),
+                    values=", ".join([STOCK_UPDATE_ROW_SQL] * len(batch)),
+                ),
+                params,
+            )
+            updated_ids += [row[0] for row in cursor.fetchall()]
+
+        transaction.on_commit(lambda: invalidate_products(updated_ids))
+        transaction.on_commit(invalidate_category_tree)
+
+    return {
+        "updated": len(updated_ids),
+        "notFound": {
+            "id": sorted(set(product_ids) - set(updated_ids)),
+            "slug": missing_slugs,
+        },
+    }
@@ -1,3 +1,509 @@
-from django.test import TestCase
+import io
+import json
+from base64 import urlsafe_b64encode
+from contextlib import ExitStack
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from core.refcache import reference_cache
+from products.cache import product_cache_key
+from products.importers import CatalogImporter, CatalogRowSerializer, read_rows
+from products.models import (
+    Category,
+    Product,
+    ProductImage,
+    Review,
+    Sale,
+    Specification,
+    Subcategory,
+    Tag,
+)
+from products.tree import CATEGORY_TREE_KEY, get_category_tree, invalidate_category_tree
+
+User = get_user_model()
+
+
+class CatalogImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Category.objects.create(title="Компьютеры", slug="computers")
+        Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+
+    def make_row(self, number: int, **fields) -> dict:
+        return {
+            "slug": f"product-{number}",
+            "title": f"Товар {number}",
+            "price": "100.00",
+            "count": 5,
+            "category": "computers",
+            "subcategory": "notebooks",
+            **fields,
+        }
+
+    def run_import(self, rows, chunk_size=10) -> dict:
+        feed = io.StringIO("".join(json.dumps(row) + "\n" for row in rows))
+
+        return CatalogImporter(chunk_size=chunk_size).run(read_rows(feed, "jsonl"))
+
+    def test_import_creates_and_updates_products(self):
+        self.run_import([self.make_row(1, specifications={"Цвет": "чёрный"})])
+        report = self.run_import(
+            [self.make_row(1, count=7, specifications={}), self.make_row(2)]
+        )
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["updated"], 1)
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(Product.objects.get(slug="product-1").count, 7)
+        self.assertFalse(Specification.objects.exists())
+
+    def test_long_specification_name_is_reported(self):
+        report = self.run_import(
+            [self.make_row(1), self.make_row(2, specifications={"x" * 200: "1"})]
+        )
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual([error["row"] for error in report["errors"]], [2])
+        self.assertIn("specifications", report["errors"][0]["errors"])
+
+    def test_database_error_fails_only_its_rows(self):
+        rows = [
+            self.make_row(1),
+            self.make_row(2, specifications={"x" * 200: "1"}),
+            self.make_row(3),
+        ]
+        with mock.patch.object(
+            CatalogRowSerializer, "validate_specifications", lambda self, value: value
+        ):
+            report = self.run_import(rows)
+
+        self.assertEqual(report["rows"], 3)
+        self.assertEqual(report["created"], 2)
+        self.assertEqual([error["row"] for error in report["errors"]], [2])
+        self.assertEqual(
+            set(Product.objects.values_list("slug", flat=True)),
+            {"product-1", "product-3"},
+        )
+
+
+class CategoryTreeCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.computers = Category.objects.create(title="Компьютеры", slug="computers")
+        cls.phones = Category.objects.create(title="Телефоны", slug="phones")
+        cls.subcategory = Subcategory.objects.create(title="Новинки", slug="new")
+        cls.computers.subcategories.add(cls.subcategory)
+        cls.phones.subcategories.add(cls.subcategory)
+        cls.product = Product.objects.create(
+            title="Ноутбук",
+            slug="notebook",
+            category=cls.computers,
+            subcategory=cls.subcategory,
+            price=100,
+            count=5,
+        )
+
+    def setUp(self):
+        invalidate_category_tree()
+
+    def get_counts(self) -> dict:
+        _, content = get_category_tree()
+
+        return {category["slug"]: category["count"] for category in json.loads(content)}
+
+    def save_product(self, **fields):
+        for name, value in fields.items():
+            setattr(self.product, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+
+    def test_tree_is_rebuilt_when_availability_changes(self):
+        self.assertEqual(self.get_counts(), {"computers": 1, "phones": 0})
+
+        self.save_product(is_available=False)
+
+        self.assertEqual(self.get_counts(), {"computers": 0, "phones": 0})
+
+    def test_tree_is_rebuilt_when_product_moves(self):
+        self.get_counts()
+
+        self.save_product(category=self.phones)
+
+        self.assertEqual(self.get_counts(), {"computers": 0, "phones": 1})
+
+    def test_tree_is_kept_when_other_fields_change(self):
+        self.get_counts()
+
+        self.save_product(price=200)
+
+        self.assertIsNotNone(cache.get(CATEGORY_TREE_KEY))
+
+
+class RowSerializerParityTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(title="Компьютеры", slug="computers")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        tags = [Tag.objects.create(name=name) for name in ("Игровой", "Новинка")]
+        cls.products = []
+        for number in range(3):
+            product = Product.objects.create(
+                title=f"Товар {number}",
+                slug=f"product-{number}",
+                description=f"Описание {number}",
+                category=category,
+                subcategory=subcategory,
+                price=Decimal("99.90") + number,
+                count=number,
+                freeDelivery=bool(number % 2),
+            )
+            product.tags.set(tags[:number])
+            cls.products.append(product)
+
+        first, second, _ = cls.products
+        for number in range(2):
+            ProductImage.objects.create(
+                product=first,
+                image=f"products/first-{number}.jpg",
+                thumbnails={"webp": {"320": f"products/first-{number}-320.webp"}},
+            )
+        for rate in (5, 4):
+            Review.objects.create(
+                author=User.objects.create_user(username=f"author-{rate}"),
+                product=first,
+                rate=rate,
+            )
+        Sale.objects.create(
+            product=second,
+            discount=Decimal("15.00"),
+            dateFrom=date(2026, 1, 1),
+            dateTo=date(2026, 12, 31),
+        )
+
+    def assert_same_json(self, url: str):
+        responses = {}
+        for fast in (1, 0):
+            with override_settings(FAST_LIST_SERIALIZATION=fast):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            responses[fast] = response.json()
+
+        self.assertTrue(responses[1]["results"])
+        self.assertEqual(responses[1], responses[0])
+
+    def test_catalog_rows_match_model_serializer(self):
+        self.assert_same_json("/api/catalog/")
+        self.assert_same_json("/api/catalog/?fields=id,title,images,rating")
+
+    def test_sales_rows_match_model_serializer(self):
+        self.assert_same_json("/api/sales/")
+
+
+@override_settings(STOCK_SYNC_BATCH_SIZE=2)
+class StockSyncTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(title="Компьютеры", slug="computers")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        cls.products = [
+            Product.objects.create(
+                title=f"Товар {number}",
+                slug=f"product-{number}",
+                category=category,
+                subcategory=subcategory,
+                price=100,
+                count=number,
+                is_available=bool(number),
+            )
+            for number in range(5)
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(
+            User.objects.create_user(username="warehouse", is_staff=True)
+        )
+
+    def sync(self, *updates):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/products/stock/", {"products": updates}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+        return response.data
+
+    def get_stock(self) -> dict:
+        return {
+            product.slug: (product.count, product.price, product.is_available)
+            for product in Product.objects.order_by("id")
+        }
+
+    def test_updates_are_applied_across_batches(self):
+        empty, first, second, third, fourth = self.products
+
+        result = self.sync(
+            {"id": empty.id, "count": 7},
+            {"id": first.id, "count": 0},
+            {"slug": second.slug, "price": "150.50"},
+            {"id": third.id, "count": 30, "price": "90.00"},
+            {"id": fourth.id, "count": 1},
+        )
+
+        self.assertEqual(result["updated"], 5)
+        self.assertEqual(
+            self.get_stock(),
+            {
+                "product-0": (7, Decimal("100.00"), True),
+                "product-1": (0, Decimal("100.00"), False),
+                "product-2": (2, Decimal("150.50"), True),
+                "product-3": (30, Decimal("90.00"), True),
+                "product-4": (1, Decimal("100.00"), True),
+            },
+        )
+        self.assertEqual(Product.objects.get(id=third.id).version, third.version + 1)
+
+    def test_unknown_products_are_reported(self):
+        first = self.products[1]
+
+        result = self.sync(
+            {"id": first.id, "count": 5},
+            {"id": 999999, "count": 1},
+            {"slug": "missing", "count": 1},
+        )
+
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(result["notFound"], {"id": [999999], "slug": ["missing"]})
+        self.assertEqual(Product.objects.get(id=first.id).count, 5)
+
+    def test_product_cache_is_invalidated(self):
+        first = self.products[1]
+        cache.set(product_cache_key(first.id), "stale")
+
+        self.sync({"id": first.id, "count": 3})
+
+        self.assertIsNone(cache.get(product_cache_key(first.id)))
+
+
+class ConditionalRequestTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(title="Компьютеры", slug="computers")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        cls.products = [
+            Product.objects.create(
+                title=f"Товар {number}",
+                slug=f"product-{number}",
+                category=category,
+                subcategory=subcategory,
+                price=100,
+                count=5,
+            )
+            for number in range(12)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_detail_not_modified(self):
+        url = f"/api/product/{self.products[0].id}/"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        for headers in (
+            {"HTTP_IF_NONE_MATCH": response["ETag"]},
+            {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+        ):
+            with self.subTest(headers=headers):
+                not_modified = self.client.get(url, **headers)
+
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_version_bump_invalidates_cached_detail(self):
+        product = self.products[0]
+        url = f"/api/product/{product.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        # без смены версии отдаётся закэшированный объект
+        Product.objects.filter(id=product.id).update(title="Без версии")
+        self.assertEqual(self.client.get(url).data["title"], product.title)
+
+        Product.objects.filter(id=product.id).update(
+            title="Новая версия", version=F("version") + 1
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["title"], "Новая версия")
+
+    def test_list_not_modified(self):
+        for fast in (1, 0):
+            with self.subTest(fast=fast), override_settings(
+                FAST_LIST_SERIALIZATION=fast
+            ):
+                response = self.client.get("/api/catalog/")
+                etag = response["ETag"]
+
+                not_modified = self.client.get("/api/catalog/", HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified["ETag"], etag)
+                self.assertNotEqual(
+                    self.client.get("/api/catalog/?page=2")["ETag"], etag
+                )
+
+    def test_list_etag_changes_with_page_rows(self):
+        for fast in (1, 0):
+            with self.subTest(fast=fast), override_settings(
+                FAST_LIST_SERIALIZATION=fast
+            ):
+                etag = self.client.get("/api/catalog/")["ETag"]
+                product = Product.objects.get(id=self.products[fast].id)
+                product.price = 200
+                product.save()
+
+                response = self.client.get("/api/catalog/", HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_etag_changes_with_count(self):
+        etag = self.client.get("/api/catalog/")["ETag"]
+        self.products[-1].delete()
+
+        response = self.client.get("/api/catalog/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class ReviewPaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(title="Компьютеры", slug="computers")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        cls.product = Product.objects.create(
+            title="Ноутбук",
+            slug="notebook",
+            category=category,
+            subcategory=subcategory,
+            price=100,
+            count=5,
+        )
+        now = timezone.now()
+        cls.reviews = []
+        for number, rate in enumerate((5, 3, 4)):
+            review = Review.objects.create(
+                author=User.objects.create_user(username=f"author-{number}"),
+                product=cls.product,
+                rate=rate,
+            )
+            Review.objects.filter(id=review.id).update(
+                date=now - timedelta(days=number)
+            )
+            cls.reviews.append(review)
+
+    def get_reviews(self, **params):
+        return self.client.get(
+            f"/api/product/{self.product.id}/reviews/", {"limit": 2, **params}
+        )
+
+    def test_pages_follow_cursor(self):
+        response = self.get_reviews(sort="-rate")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [review["rate"] for review in response.data["results"]], [5, 4]
+        )
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([review["rate"] for review in response.data["results"]], [3])
+        self.assertIsNone(response.data["next"])
+
+    def test_tampered_cursor_is_not_found(self):
+        for position in (
+            ["not-a-date", self.reviews[0].id],
+            [timezone.now().isoformat(), "not-an-id"],
+            [None, self.reviews[0].id],
+            [{"date": 1}, self.reviews[0].id],
+        ):
+            cursor = urlsafe_b64encode(json.dumps(position).encode()).decode()
+            with self.subTest(position=position):
+                response = self.get_reviews(cursor=cursor)
+
+                self.assertEqual(response.status_code, 404)
+
+        self.assertEqual(self.get_reviews(cursor="%%%").status_code, 404)
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "DB_REPLICAS is not configured")
+@override_settings(REPLICA_PIN_SECONDS=0)
+class ReplicaReadTests(TransactionTestCase):
+    # в `TestCase` всё выполняется в транзакции, а в ней роутер читает с основной БД
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        category = Category.objects.create(title="Компьютеры", slug="computers")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        category.subcategories.add(subcategory)
+        Product.objects.create(
+            title="Ноутбук",
+            slug="notebook",
+            category=category,
+            subcategory=subcategory,
+            price=100,
+            count=5,
+        )
+        reference_cache.clear()
+        invalidate_category_tree()
+
+    def get_with_queries(self, url: str) -> tuple:
+        """Выполняем запрос и считаем запросы к основной БД и к репликам"""
+        with ExitStack() as stack:
+            queries = {
+                alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in self.databases
+            }
+            response = self.client.get(url, HTTP_HOST="localhost")
+
+        replica_queries = sum(
+            len(captured)
+            for alias, captured in queries.items()
+            if alias != DEFAULT_DB_ALIAS
+        )
+
+        return response, len(queries[DEFAULT_DB_ALIAS]), replica_queries
+
+    def test_catalog_is_read_from_replica(self):
+        response, _, replica_queries = self.get_with_queries("/api/catalog/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(replica_queries, 0)
+
+    def test_shared_caches_are_loaded_from_primary(self):
+        for url in ("/api/categories/", "/api/tags/", "/api/categories/tree/"):
+            with self.subTest(url=url):
+                response, primary_queries, replica_queries = self.get_with_queries(url)
+
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(primary_queries, 0)
+                self.assertEqual(replica_queries, 0)
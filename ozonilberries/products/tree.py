@@ -0,0 +1,76 @@
+"""Модуль для готового дерева категорий с количеством товаров"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from core.db import read_from_primary
+from products.models import Category, Product
+
+CATEGORY_TREE_KEY = "catalog:category-tree"
+
+
+def build_category_tree() -> bytes:
+    """
+    Собираем дерево категорий одним документом JSON.
+
+    Для категорий и их подкатегорий указывается количество доступных товаров.
+    """
+    available = Product.objects.filter(is_available=True).order_by()
+    category_counts = dict(
+        available.values_list("category_id").annotate(total=Count("id"))
+    )
+    subcategory_counts = {
+        (category_id, subcategory_id): total
+        for category_id, subcategory_id, total in available.values_list(
+            "category_id", "subcategory_id"
+        ).annotate(total=Count("id"))
+    }
+
+    tree = []
+    for category in Category.objects.prefetch_related("subcategories").order_by("id"):
+        tree.append(
+            {
+                "id": category.id,
+                "title": category.title,
+                "slug": category.slug,
+                "image": category.show_image_info(),
+                "count": category_counts.get(category.id, 0),
+                "subcategories": [
+                    {
+                        "id": subcategory.id,
+                        "title": subcategory.title,
+                        "slug": subcategory.slug,
+                        "image": subcategory.show_image_info(),
+                        "count": subcategory_counts.get(
+                            (category.id, subcategory.id), 0
+                        ),
+                    }
+                    for subcategory in category.subcategories.all()
+                ],
+            }
+        )
+
+    return json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def get_category_tree() -> tuple:
+    """Получаем (ETag, JSON) дерева категорий из кэша или собираем заново"""
+    cached = cache.get(CATEGORY_TREE_KEY)
+    if cached is not None:
+        return cached
+
+    # дерево кэшируется для всех клиентов, поэтому собираем его по основной БД
+    with read_from_primary():
+        content = build_category_tree()
+    cached = (f'"{hashlib.md5(content).hexdigest()}"', content)
+    cache.set(CATEGORY_TREE_KEY, cached, settings.CATEGORY_TREE_TIMEOUT)
+
+    return cached
+
+
+def invalidate_category_tree():
+    cache.delete(CATEGORY_TREE_KEY)
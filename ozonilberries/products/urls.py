@@ -5,11 +5,14 @@ from rest_framework.routers import DefaultRouter
 
 from products.views import (
     BannerProductsViewSet,
+    CatalogImportAPIView,
     CatalogViewSet,
+    CategoryTreeAPIView,
     CategoryViewSet,
     OneProductViewSet,
     ProductsViewSet,
     SalesProductsViewSet,
+    StockSyncAPIView,
     TagViewSet,
 )
 
@@ -25,5 +28,11 @@ routers_products.register("sales", SalesProductsViewSet, basename="sales")
 routers_products.register("banners", BannerProductsViewSet, basename="banners")
 
 urlpatterns = [
+    path("categories/tree/", CategoryTreeAPIView.as_view(), name="category_tree"),
     path("", include(routers_products.urls)),
 ]
+
+urlpatterns += [
+    path("catalog/import/", CatalogImportAPIView.as_view(), name="catalog_import"),
+    path("products/stock/", StockSyncAPIView.as_view(), name="stock_sync"),
+]
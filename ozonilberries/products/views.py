@@ -2,25 +2,51 @@
 
 from datetime import date
 
-from django.db.models import Avg, F
+from django.conf import settings
+from django.db.models import Avg, F, FloatField, Prefetch
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from core.conditional import (
+    CachedRetrieveMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+)
+from core.db import ReplicaReadMixin
+from core.refcache import reference_cache
+from core.rows import RowListMixin
+from core.throttling import UserWriteThrottle
+from products.cache import product_cache_key
 from products.filters import ProductFilter
-from products.models import Category, Product, Review, Sale, Tag
+from products.importers import CatalogImporter, read_rows
+from products.models import Category, Product, ProductReviewStats, Review, Sale, Tag
+from products.pagination import ReviewCursorPagination
 from products.serializers import (
+    CatalogImportSerializer,
     CategorySerializer,
     FullProductSerializer,
+    PartialProductRowSerializer,
     PartialProductSerializer,
     ReviewSerializer,
+    ReviewSummarySerializer,
+    SalesProductRowSerializer,
     SalesProductSerializer,
+    StockSyncSerializer,
     TagSerializer,
 )
+from products.stock import apply_stock_updates
+from products.tree import get_category_tree
 
 
 @extend_schema_view(
@@ -30,12 +56,37 @@ from products.serializers import (
         description="Get all categories",
     )
 )
-class CategoryViewSet(ListModelMixin, GenericViewSet):
+class CategoryViewSet(ReplicaReadMixin, ListModelMixin, GenericViewSet):
     """ViewSet для работы с моделью `Category`"""
 
-    queryset = Category.objects.prefetch_related("subcategories")
     serializer_class = CategorySerializer
 
+    def get_queryset(self):
+        """Получаем категории с подкатегориями из кэша справочников"""
+        return reference_cache.get("categories")
+
+
+class CategoryTreeAPIView(ReplicaReadMixin, APIView):
+    """APIView для готового дерева категорий с количеством товаров"""
+
+    replica_actions = ("get",)
+
+    @extend_schema(
+        tags=["catalog"],
+        summary="Получить дерево категорий",
+        description="Get prebuilt category tree with subcategories and available product counts",
+        responses={200: dict},
+    )
+    def get(self, request):
+        """Метод для отдачи дерева категорий без сериализации"""
+        etag, content = get_category_tree()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+
+        return response
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -53,10 +104,13 @@ class CategoryViewSet(ListModelMixin, GenericViewSet):
         ],
     )
 )
-class CatalogViewSet(ListModelMixin, GenericViewSet):
+class CatalogViewSet(
+    ReplicaReadMixin, ConditionalListMixin, RowListMixin, ListModelMixin, GenericViewSet
+):
     """ViewSet для работы с каталогом продуктов"""
 
     serializer_class = PartialProductSerializer
+    row_serializer_class = PartialProductRowSerializer
     filterset_class = ProductFilter
 
     def get_queryset(self):
@@ -95,7 +149,7 @@ class CatalogViewSet(ListModelMixin, GenericViewSet):
         ],
     )
 )
-class TagViewSet(ListModelMixin, GenericViewSet):
+class TagViewSet(ReplicaReadMixin, ListModelMixin, GenericViewSet):
     """ViewSet для работы с моделью `Tag`"""
 
     serializer_class = TagSerializer
@@ -110,7 +164,7 @@ class TagViewSet(ListModelMixin, GenericViewSet):
                 products__category=interested_category.id
             ).distinct()
 
-        return Tag.objects.all()
+        return reference_cache.get("tags")
 
 
 @extend_schema_view(
@@ -128,6 +182,34 @@ class TagViewSet(ListModelMixin, GenericViewSet):
             ),
         ],
     ),
+    reviews=extend_schema(
+        tags=["product"],
+        summary="Посмотреть отзывы на продукт",
+        description="Get product reviews with cursor pagination, sorted by date or rate",
+        parameters=[
+            OpenApiParameter(
+                name="id",
+                description="product id",
+                location=OpenApiParameter.PATH,
+                required=True,
+                type=int,
+            ),
+        ],
+    ),
+    reviews_summary=extend_schema(
+        tags=["product"],
+        summary="Посмотреть распределение оценок товара",
+        description="Get review count, average rating and 0-5 rating histogram",
+        parameters=[
+            OpenApiParameter(
+                name="id",
+                description="product id",
+                location=OpenApiParameter.PATH,
+                required=True,
+                type=int,
+            ),
+        ],
+    ),
     review=extend_schema(
         tags=["product"],
         summary="Оставить отзыв на продукт",
@@ -143,28 +225,93 @@ class TagViewSet(ListModelMixin, GenericViewSet):
         ],
     ),
 )
-class OneProductViewSet(RetrieveModelMixin, GenericViewSet):
+class OneProductViewSet(
+    ReplicaReadMixin,
+    ConditionalRetrieveMixin,
+    CachedRetrieveMixin,
+    RetrieveModelMixin,
+    GenericViewSet,
+):
     """ViewSet для работы с одним экземпляром модели `Product`"""
 
+    replica_actions = ("retrieve", "reviews", "reviews_summary")
+    # лимит для `review` (см. `throttle_classes` действия)
+    throttle_scope = "review"
+    retrieve_cache_timeout = settings.PRODUCT_DETAIL_CACHE_TIMEOUT
+
     def get_queryset(self):
         """Получаем указанный продукт"""
-        if self.action in [
-            "retrieve",
-            "review",
-        ]:
+        if self.action == "retrieve":
+            latest_reviews = Review.objects.select_related("author__profile").order_by(
+                "-date", "-id"
+            )[: settings.PRODUCT_DETAIL_REVIEWS_LIMIT]
+
+            return (
+                Product.objects.filter(id=self.kwargs.get("pk"))
+                .prefetch_related(
+                    "images",
+                    "tags",
+                    "specifications",
+                    Prefetch(
+                        "reviews", queryset=latest_reviews, to_attr="latest_reviews"
+                    ),
+                )
+                .annotate(
+                    reviews_count=Coalesce("review_stats__reviews_count", 0),
+                    rating=Cast("review_stats__rate_sum", FloatField())
+                    / NullIf("review_stats__reviews_count", 0),
+                )
+            )
+        elif self.action == "reviews":
+            # порядок задаёт `ReviewCursorPagination` по параметру `sort`
+            return Review.objects.filter(
+                product_id=self.kwargs.get("pk")
+            ).select_related("author__profile")
+        elif self.action == "review":
             return Product.objects.filter(id=self.kwargs.get("pk"))
 
         return Product.objects.all()
 
+    def get_conditional_queryset(self):
+        return Product.objects.all()
+
+    def get_retrieve_cache_key(self) -> str:
+        return product_cache_key(self.kwargs["pk"])
+
     def get_serializer_class(self):
         if self.action in [
             "review",
+            "reviews",
         ]:
             return ReviewSerializer
+        elif self.action == "reviews_summary":
+            return ReviewSummarySerializer
 
         return FullProductSerializer
 
-    @action(detail=True, methods=["post"])
+    @action(detail=True, methods=["get"], pagination_class=ReviewCursorPagination)
+    def reviews(self, request, pk=None):
+        """Метод для вывода обзоров на продукт по курсору"""
+        get_object_or_404(Product.objects.only("id"), id=pk)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="reviews/summary")
+    def reviews_summary(self, request, pk=None):
+        """Метод для вывода распределения оценок отзывов на продукт"""
+        get_object_or_404(Product.objects.only("id"), id=pk)
+        stats = ProductReviewStats.objects.filter(product_id=pk).first()
+        serializer = self.get_serializer(stats or ProductReviewStats(product_id=pk))
+
+        return Response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=["post"],
+        throttle_classes=(UserWriteThrottle,),
+    )
     def review(self, request, pk=None):
         """Метод для создания нового обзора на продукт"""
         user = request.user
@@ -194,10 +341,14 @@ class OneProductViewSet(RetrieveModelMixin, GenericViewSet):
         description="Get catalog limited products",
     ),
 )
-class ProductsViewSet(ListModelMixin, GenericViewSet):
+class ProductsViewSet(
+    ReplicaReadMixin, ConditionalListMixin, RowListMixin, ListModelMixin, GenericViewSet
+):
     """ViewSet для работы с моделью `Product`"""
 
     serializer_class = PartialProductSerializer
+    row_serializer_class = PartialProductRowSerializer
+    replica_actions = ("popular", "limited")
 
     def get_queryset(self):
         if self.action == "popular":
@@ -237,10 +388,13 @@ class ProductsViewSet(ListModelMixin, GenericViewSet):
         description="Get catalog sales products",
     ),
 )
-class SalesProductsViewSet(ListModelMixin, GenericViewSet):
+class SalesProductsViewSet(
+    ReplicaReadMixin, ConditionalListMixin, RowListMixin, ListModelMixin, GenericViewSet
+):
     """ViewSet для работы с моделью `Sale`"""
 
     serializer_class = SalesProductSerializer
+    row_serializer_class = SalesProductRowSerializer
 
     def get_queryset(self):
         """Получаем товары с актуальными скидками"""
@@ -257,10 +411,13 @@ class SalesProductsViewSet(ListModelMixin, GenericViewSet):
         description="Get catalog banner products",
     ),
 )
-class BannerProductsViewSet(ListModelMixin, GenericViewSet):
+class BannerProductsViewSet(
+    ReplicaReadMixin, RowListMixin, ListModelMixin, GenericViewSet
+):
     """ViewSet для работы с баннером продуктов`"""
 
     serializer_class = PartialProductSerializer
+    row_serializer_class = PartialProductRowSerializer
 
     def get_queryset(self):
         return (
@@ -270,3 +427,53 @@ class BannerProductsViewSet(ListModelMixin, GenericViewSet):
             .annotate(rating=Avg("reviews__rate"))
             .extra(select={"random_id": "random()"})[:3]
         )
+
+
+class CatalogImportAPIView(APIView):
+    """APIView для пакетного импорта каталога товаров"""
+
+    serializer_class = CatalogImportSerializer
+    permission_classes = (IsAdminUser,)
+    parser_classes = (MultiPartParser,)
+    upload_max_size = settings.CATALOG_IMPORT_MAX_SIZE
+
+    @extend_schema(
+        tags=["catalog"],
+        summary="Импортировать каталог товаров",
+        description="Upsert products with tags, specifications, images and sales "
+        "from a CSV/JSONL feed (same columns as the products export)",
+    )
+    def post(self, request):
+        """Метод для импорта фида каталога с отчётом об ошибках по строкам"""
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        importer = CatalogImporter()
+        report = importer.run(
+            read_rows(
+                serializer.validated_data["file"],
+                serializer.validated_data["file_format"],
+            )
+        )
+
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class StockSyncAPIView(APIView):
+    """APIView для пакетного обновления остатков и цен из складской системы"""
+
+    serializer_class = StockSyncSerializer
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        tags=["catalog"],
+        summary="Обновить остатки и цены товаров",
+        description="Apply bulk count/price deltas by product id or slug",
+    )
+    def post(self, request):
+        """Метод для пакетного обновления остатков и цен"""
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = apply_stock_updates(serializer.validated_data["products"])
+
+        return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,69 @@
+"""Модуль для регистрации в административной панели Django моделей отчётов"""
+
+from django.contrib import admin
+
+from reports.models import CategoryDailySales, DailySales, ProductDailySales
+
+
+class ReadOnlyRollupAdmin(admin.ModelAdmin):
+    """Агрегаты заполняются только командой `rollup_sales`"""
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailySales)
+class DailySalesAdmin(ReadOnlyRollupAdmin):
+    list_display = [
+        "date",
+        "revenue",
+        "units",
+        "orders_count",
+        "average_order_value",
+        "payments_count",
+        "payment_failure_rate",
+    ]
+    date_hierarchy = "date"
+
+
+@admin.register(ProductDailySales)
+class ProductDailySalesAdmin(ReadOnlyRollupAdmin):
+    list_display = [
+        "date",
+        "name",
+        "category",
+        "revenue",
+        "units",
+        "orders_count",
+    ]
+    list_filter = [
+        "category",
+    ]
+    search_fields = [
+        "name",
+    ]
+    date_hierarchy = "date"
+
+    def get_queryset(self, request):
+        return ProductDailySales.objects.select_related("category")
+
+
+@admin.register(CategoryDailySales)
+class CategoryDailySalesAdmin(ReadOnlyRollupAdmin):
+    list_display = [
+        "date",
+        "category",
+        "revenue",
+        "units",
+        "orders_count",
+    ]
+    list_filter = [
+        "category",
+    ]
+    date_hierarchy = "date"
+
+    def get_queryset(self, request):
+        return CategoryDailySales.objects.select_related("category")
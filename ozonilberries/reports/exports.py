@@ -0,0 +1,214 @@
+"""Модуль для потоковой выгрузки заказов и каталога товаров в CSV/JSONL"""
+
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+ORDER_LINE_COLUMNS = {
+    "order_id": "order_id",
+    "created_at": "order__created_at",
+    "status": "order__status",
+    "user_id": "order__user_id",
+    "city": "order__city",
+    "delivery_address": "order__delivery_address",
+    "delivery_type": "order__delivery_type",
+    "payment_type": "order__payment_type",
+    "total_price": "order__total_price",
+    "item_id": "id",
+    "product_id": "product_id",
+    "name": "name",
+    "price": "price",
+    "quantity": "quantity",
+    "is_paid": "order__payment__is_paid",
+    "payment_error_message": "order__payment__payment_error_message",
+    "paid_at": "order__payment__created_at",
+}
+
+PRODUCT_COLUMNS = (
+    "id",
+    "slug",
+    "title",
+    "description",
+    "fullDescription",
+    "price",
+    "count",
+    "category",
+    "subcategory",
+    "tags",
+    "specifications",
+    "images",
+    "discount",
+    "dateFrom",
+    "dateTo",
+    "freeDelivery",
+    "is_available",
+    "is_limited",
+    "date",
+)
+
+
+# ячейки, начинающиеся с этих символов, табличные редакторы считают формулами
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class Echo:
+    """Псевдо-буфер для `csv.writer`: возвращает строку вместо записи"""
+
+    def write(self, value):
+        return value
+
+
+def escape_csv_formula(value: str) -> str:
+    """Экранируем `'` текст, который табличный редактор выполнил бы как формулу"""
+    if value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_csv_formula(value: str) -> str:
+    """Убираем экранирование `escape_csv_formula` при загрузке выгрузки обратно"""
+    if value.startswith("'") and value[1:].startswith(CSV_FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def _to_csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        value = "|".join(str(item) for item in value)
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return escape_csv_formula(value)
+    return value
+
+
+def _to_json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def render_rows(rows, columns, file_format: str):
+    """
+    Превращаем итератор строк-словарей в итератор фрагментов файла.
+
+    Строки собираются в фрагменты по `EXPORT_CHUNK_SIZE` штук, чтобы не
+    отправлять клиенту по одной строке, но и не держать весь файл в памяти.
+    """
+    chunk = []
+    if file_format == "csv":
+        writer = csv.writer(Echo())
+        chunk.append(writer.writerow(columns))
+
+        def render_row(row):
+            return writer.writerow([_to_csv_value(row[column]) for column in columns])
+
+    else:
+
+        def render_row(row):
+            values = {column: _to_json_value(row[column]) for column in columns}
+            return json.dumps(values, ensure_ascii=False) + "\n"
+
+    for row in rows:
+        chunk.append(render_row(row))
+        if len(chunk) >= settings.EXPORT_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def iter_order_lines(*order_items: QuerySet):
+    """
+    Отдаём позиции заказов вместе с данными заказа и оплаты.
+
+    Можно передать несколько queryset с одинаковыми связями, например
+    `ArchivedOrderItem` и `OrderItem`: они выгружаются по очереди.
+    """
+    columns = tuple(ORDER_LINE_COLUMNS)
+    for queryset in order_items:
+        values = (
+            queryset.order_by("order_id", "id")
+            .values_list(*ORDER_LINE_COLUMNS.values())
+            .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        )
+        for value in values:
+            yield dict(zip(columns, value))
+
+
+def iter_products(products: QuerySet):
+    """Отдаём товары каталога со спецификациями, тегами, изображениями и скидкой"""
+    products = (
+        products.select_related("category", "subcategory", "discounted")
+        .prefetch_related("tags", "specifications", "images")
+        .order_by("id")
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+    for product in products:
+        sale = getattr(product, "discounted", None)
+        yield {
+            "id": product.id,
+            "slug": product.slug,
+            "title": product.title,
+            "description": product.description,
+            "fullDescription": product.fullDescription,
+            "price": product.price,
+            "count": product.count,
+            "category": product.category.slug or product.category.title,
+            "subcategory": product.subcategory.slug or product.subcategory.title,
+            "tags": [tag.name for tag in product.tags.all()],
+            "specifications": {
+                specification.name: specification.value
+                for specification in product.specifications.all()
+            },
+            "images": [str(image.image) for image in product.images.all()],
+            "discount": sale.discount if sale else None,
+            "dateFrom": sale.dateFrom if sale else None,
+            "dateTo": sale.dateTo if sale else None,
+            "freeDelivery": product.freeDelivery,
+            "is_available": product.is_available,
+            "is_limited": product.is_limited,
+            "date": product.date,
+        }
+
+
+def export_response(rows, columns, file_format: str, name: str):
+    """Собираем потоковый ответ с выгрузкой"""
+    response = StreamingHttpResponse(
+        render_rows(rows, columns, file_format),
+        content_type=EXPORT_FORMATS[file_format],
+    )
+    filename = f"{name}-{timezone.now():%Y-%m-%d}.{file_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    return response
+
+
+def export_order_lines(*order_items: QuerySet, file_format: str = "csv"):
+    return export_response(
+        iter_order_lines(*order_items), tuple(ORDER_LINE_COLUMNS), file_format, "orders"
+    )
+
+
+def export_products(products: QuerySet, file_format: str = "csv"):
+    return export_response(
+        iter_products(products), PRODUCT_COLUMNS, file_format, "products"
+    )
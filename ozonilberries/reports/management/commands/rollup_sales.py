@@ -0,0 +1,43 @@
+"""Команда для инкрементального пересчёта агрегатов продаж"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from reports.rollups import rebuild_order_rollups, rollup_sales
+
+
+class Command(BaseCommand):
+    help = (
+        "Update daily sales rollups with orders paid or cancelled and payments "
+        "added since the last run"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Repeat every N seconds instead of running once",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute order rollups from scratch, including archived orders",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            orders = rebuild_order_rollups()
+            self.stdout.write(f"Rebuilt order rollups from {orders} orders")
+
+        while True:
+            result = rollup_sales()
+            self.stdout.write(
+                f"Processed orders: {result['orders']}, "
+                f"payment days: {result['payment_days']}"
+            )
+
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,244 @@
+# Generated by Django 4.2.14 on 2026-10-19 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("products", "0002_alter_sale_datefrom_alter_sale_dateto"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True, verbose_name="День")),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Выручка",
+                    ),
+                ),
+                (
+                    "units",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Продано единиц"
+                    ),
+                ),
+                (
+                    "orders_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество заказов"
+                    ),
+                ),
+                (
+                    "payments_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество оплат"
+                    ),
+                ),
+                (
+                    "failed_payments_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество неудачных оплат"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Продажи за день",
+                "verbose_name_plural": "Продажи по дням",
+                "db_table": "report_daily_sales",
+                "ordering": ("date",),
+            },
+        ),
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=50, unique=True, verbose_name="Название"
+                    ),
+                ),
+                (
+                    "last_id",
+                    models.BigIntegerField(
+                        default=0, verbose_name="Последний обработанный id"
+                    ),
+                ),
+                (
+                    "last_date",
+                    models.DateField(
+                        blank=True,
+                        null=True,
+                        verbose_name="Последний обработанный день",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Дата обновления"),
+                ),
+            ],
+            options={
+                "verbose_name": "Отметка обработки",
+                "verbose_name_plural": "Отметки обработки",
+                "db_table": "report_watermark",
+            },
+        ),
+        migrations.CreateModel(
+            name="CategoryDailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="День")),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Выручка",
+                    ),
+                ),
+                (
+                    "units",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Продано единиц"
+                    ),
+                ),
+                (
+                    "orders_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество заказов"
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="category_daily_sales",
+                        to="products.category",
+                        verbose_name="Категория",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Продажи категории за день",
+                "verbose_name_plural": "Продажи категорий по дням",
+                "db_table": "report_category_daily_sales",
+            },
+        ),
+        migrations.CreateModel(
+            name="ProductDailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="День")),
+                ("name", models.CharField(max_length=150, verbose_name="Название")),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0.0,
+                        max_digits=14,
+                        verbose_name="Выручка",
+                    ),
+                ),
+                (
+                    "units",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Продано единиц"
+                    ),
+                ),
+                (
+                    "orders_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество заказов"
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="daily_sales",
+                        to="products.category",
+                        verbose_name="Категория",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="daily_sales",
+                        to="products.product",
+                        verbose_name="Товар",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Продажи товара за день",
+                "verbose_name_plural": "Продажи товаров по дням",
+                "db_table": "report_product_daily_sales",
+                "indexes": [
+                    models.Index(
+                        fields=["product", "date"],
+                        name="report_prod_product_87f6cd_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="productdailysales",
+            constraint=models.UniqueConstraint(
+                fields=("date", "product"), name="unique_product_daily_sales"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="categorydailysales",
+            constraint=models.UniqueConstraint(
+                fields=("date", "category"), name="unique_category_daily_sales"
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:47
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def reset_order_rollups(apps, schema_editor):
+    """
+    Сбрасываем агрегаты заказов: в них попали неоплаченные и отменённые заказы.
+
+    Следующий `rollup_sales` учтёт заказы из таблицы `order`, архив —
+    `rollup_sales --rebuild`.
+    """
+    apps.get_model("reports", "ProductDailySales").objects.all().delete()
+    apps.get_model("reports", "CategoryDailySales").objects.all().delete()
+    apps.get_model("reports", "DailySales").objects.update(
+        revenue=Decimal("0.00"), units=0, orders_count=0
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RolledUpOrder",
+            fields=[
+                (
+                    "order_id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="id заказа"
+                    ),
+                ),
+                (
+                    "rolled_up_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата учёта в агрегатах"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Учтённый заказ",
+                "verbose_name_plural": "Учтённые заказы",
+                "db_table": "report_rolled_up_order",
+            },
+        ),
+        migrations.RunPython(reset_order_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0002_rolled_up_order"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rollupwatermark",
+            name="last_changed_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Последнее обработанное изменение"
+            ),
+        ),
+    ]
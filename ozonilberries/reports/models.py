@@ -0,0 +1,161 @@
+"""Модуль для описания моделей агрегированной статистики продаж для БД"""
+
+from decimal import Decimal
+
+from django.db import models
+
+from products.models import Category, Product
+
+
+class RollupWatermark(models.Model):
+    """Отметка о том, до какого места уже обработаны исходные данные"""
+
+    name = models.CharField(max_length=50, unique=True, verbose_name="Название")
+    last_id = models.BigIntegerField(
+        default=0, verbose_name="Последний обработанный id"
+    )
+    last_date = models.DateField(
+        blank=True, null=True, verbose_name="Последний обработанный день"
+    )
+    last_changed_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Последнее обработанное изменение"
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
+
+    class Meta:
+        db_table = "report_watermark"
+        verbose_name = "Отметка обработки"
+        verbose_name_plural = "Отметки обработки"
+
+    def __str__(self):
+        return f"{self.name}: id {self.last_id}, день {self.last_date}"
+
+
+class RolledUpOrder(models.Model):
+    """
+    Заказ, позиции которого уже учтены в агрегатах продаж.
+
+    Ссылка на заказ без внешнего ключа: заказ может быть перенесён в архив.
+    """
+
+    order_id = models.BigIntegerField(primary_key=True, verbose_name="id заказа")
+    rolled_up_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата учёта в агрегатах"
+    )
+
+    class Meta:
+        db_table = "report_rolled_up_order"
+        verbose_name = "Учтённый заказ"
+        verbose_name_plural = "Учтённые заказы"
+
+    def __str__(self):
+        return f"Заказ №{self.order_id}"
+
+
+class DailySales(models.Model):
+    date = models.DateField(unique=True, verbose_name="День")
+    revenue = models.DecimalField(
+        default=0.00, max_digits=14, decimal_places=2, verbose_name="Выручка"
+    )
+    units = models.PositiveIntegerField(default=0, verbose_name="Продано единиц")
+    orders_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество заказов"
+    )
+    payments_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество оплат"
+    )
+    failed_payments_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество неудачных оплат"
+    )
+
+    class Meta:
+        db_table = "report_daily_sales"
+        ordering = ("date",)
+        verbose_name = "Продажи за день"
+        verbose_name_plural = "Продажи по дням"
+
+    def __str__(self):
+        return f"Продажи за {self.date}: {self.revenue}"
+
+    def average_order_value(self):
+        if not self.orders_count:
+            return Decimal("0.00")
+        return round(self.revenue / self.orders_count, 2)
+
+    def payment_failure_rate(self):
+        if not self.payments_count:
+            return 0.0
+        return round(self.failed_payments_count / self.payments_count, 4)
+
+
+class ProductDailySales(models.Model):
+    date = models.DateField(verbose_name="День")
+    product = models.ForeignKey(
+        to=Product,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="daily_sales",
+        verbose_name="Товар",
+    )
+    category = models.ForeignKey(
+        to=Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="daily_sales",
+        verbose_name="Категория",
+    )
+    name = models.CharField(max_length=150, verbose_name="Название")
+    revenue = models.DecimalField(
+        default=0.00, max_digits=14, decimal_places=2, verbose_name="Выручка"
+    )
+    units = models.PositiveIntegerField(default=0, verbose_name="Продано единиц")
+    orders_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество заказов"
+    )
+
+    class Meta:
+        db_table = "report_product_daily_sales"
+        verbose_name = "Продажи товара за день"
+        verbose_name_plural = "Продажи товаров по дням"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "product"], name="unique_product_daily_sales"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["product", "date"]),
+        ]
+
+    def __str__(self):
+        return f"Продажи {self.name} за {self.date}: {self.revenue}"
+
+
+class CategoryDailySales(models.Model):
+    date = models.DateField(verbose_name="День")
+    category = models.ForeignKey(
+        to=Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="category_daily_sales",
+        verbose_name="Категория",
+    )
+    revenue = models.DecimalField(
+        default=0.00, max_digits=14, decimal_places=2, verbose_name="Выручка"
+    )
+    units = models.PositiveIntegerField(default=0, verbose_name="Продано единиц")
+    orders_count = models.PositiveIntegerField(
+        default=0, verbose_name="Количество заказов"
+    )
+
+    class Meta:
+        db_table = "report_category_daily_sales"
+        verbose_name = "Продажи категории за день"
+        verbose_name_plural = "Продажи категорий по дням"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "category"], name="unique_category_daily_sales"
+            )
+        ]
+
+    def __str__(self):
+        return f"Продажи категории {self.category_id} за {self.date}: {self.revenue}"
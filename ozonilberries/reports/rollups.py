@@ -0,0 +1,265 @@
+"""Модуль для инкрементального пересчёта агрегированной статистики продаж"""
+
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, Exists, F, Max, OuterRef, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from orders.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem, Payment
+from reports.models import (
+    CategoryDailySales,
+    DailySales,
+    ProductDailySales,
+    RolledUpOrder,
+    RollupWatermark,
+)
+
+# строка этой отметки блокируется всеми, кто пишет в `DailySales`
+DAILY_SALES_LOCK = "daily_sales"
+# отметка времени изменения последнего обработанного заказа
+ORDER_ITEMS_WATERMARK = "order_items"
+PAYMENTS_WATERMARK = "payments"
+
+# поля агрегатов, которые пересчитываются по заказам и по оплатам
+ORDER_TOTALS_FIELDS = ("revenue", "units", "orders_count")
+PAYMENT_TOTALS_FIELDS = ("payments_count", "failed_payments_count")
+
+# заказы с этими статусами оплачены и попадают в выручку
+SOLD_STATUSES = (
+    Order.OrderStatusChoice.paid,
+    Order.OrderStatusChoice.sent,
+    Order.OrderStatusChoice.delivered,
+)
+
+
+def _lock_watermark(name: str) -> RollupWatermark:
+    RollupWatermark.objects.get_or_create(name=name)
+    return RollupWatermark.objects.select_for_update().get(name=name)
+
+
+def _get_rows(model, key_field: str, keys: set) -> dict:
+    """Получаем строки агрегата по ключам (день, значение `key_field`)"""
+    days = {day for day, _ in keys}
+    values = {value for _, value in keys}
+
+    rows_filter = Q(**{f"{key_field}__in": values - {None}})
+    if None in values:
+        rows_filter |= Q(**{f"{key_field}__isnull": True})
+
+    rows = {
+        (row.date, getattr(row, key_field)): row
+        for row in model.objects.filter(rows_filter, date__in=days)
+    }
+    for day, value in keys - rows.keys():
+        rows[(day, value)] = model(
+            date=day, revenue=Decimal("0.00"), **{key_field: value}
+        )
+
+    return rows
+
+
+def _get_daily_rows(days: set) -> dict:
+    rows = {row.date: row for row in DailySales.objects.filter(date__in=days)}
+    for day in days - rows.keys():
+        rows[day] = DailySales(date=day, revenue=Decimal("0.00"))
+
+    return rows
+
+
+def _save_rows(model, rows, fields):
+    """Создаём новые строки агрегата и обновляем в старых только поля `fields`"""
+    model.objects.bulk_create([row for row in rows if row.pk is None])
+    model.objects.bulk_update([row for row in rows if row.pk is not None], fields)
+
+
+def _add_totals(row, total: dict, sign: int):
+    row.revenue += total["revenue"] * sign
+    row.units += total["units"] * sign
+    row.orders_count += total["orders_count"] * sign
+
+
+def _add_order_items(items, sign: int = 1):
+    """
+    Прибавляем (`sign=1`) или вычитаем (`sign=-1`) позиции заказов в агрегатах.
+
+    В `items` должны быть все позиции каждого заказа: тогда `orders_count`
+    считает заказ один раз для каждого дня, товара и категории. День продажи —
+    день создания заказа.
+    """
+    items = items.annotate(day=TruncDate("order__created_at"))
+    totals = {
+        "revenue": Sum(
+            F("price") * F("quantity"),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+        "units": Sum("quantity"),
+        "orders_count": Count("order_id", distinct=True),
+    }
+
+    product_totals = items.values("day", "product_id").annotate(
+        category=Max("product__category_id"), name=Max("name"), **totals
+    )
+    product_rows = _get_rows(
+        ProductDailySales,
+        "product_id",
+        {(total["day"], total["product_id"]) for total in product_totals},
+    )
+    for total in product_totals:
+        row = product_rows[(total["day"], total["product_id"])]
+        row.category_id = total["category"]
+        row.name = total["name"]
+        _add_totals(row, total, sign)
+
+    category_totals = items.values(
+        "day", category_id=F("product__category_id")
+    ).annotate(**totals)
+    category_rows = _get_rows(
+        CategoryDailySales,
+        "category_id",
+        {(total["day"], total["category_id"]) for total in category_totals},
+    )
+    for total in category_totals:
+        _add_totals(category_rows[(total["day"], total["category_id"])], total, sign)
+
+    day_totals = items.values("day").annotate(**totals)
+    daily_rows = _get_daily_rows({total["day"] for total in day_totals})
+    for total in day_totals:
+        _add_totals(daily_rows[total["day"]], total, sign)
+
+    _save_rows(
+        ProductDailySales,
+        product_rows.values(),
+        ("category", "name", *ORDER_TOTALS_FIELDS),
+    )
+    _save_rows(CategoryDailySales, category_rows.values(), ORDER_TOTALS_FIELDS)
+    _save_rows(DailySales, daily_rows.values(), ORDER_TOTALS_FIELDS)
+
+
+def rollup_orders() -> int:
+    """
+    Добавляем в агрегаты оплаченные заказы и вычитаем отменённые после учёта.
+
+    Учтённые заказы отмечаются в `RolledUpOrder`, поэтому каждый заказ
+    попадает в агрегаты один раз, а отмена уже учтённого заказа вычитает его
+    позиции обратно. Неоплаченные и отменённые до оплаты заказы не учитываются.
+    Проверяются только заказы, изменённые после прошлого запуска (с запасом
+    `SALES_ROLLUP_OVERLAP_SECONDS`), поэтому запуск не зависит от размера
+    истории заказов.
+    """
+    with transaction.atomic():
+        _lock_watermark(DAILY_SALES_LOCK)
+        watermark = _lock_watermark(ORDER_ITEMS_WATERMARK)
+        started_at = timezone.now()
+
+        orders = Order.objects.order_by()
+        if watermark.last_changed_at is not None:
+            orders = orders.filter(
+                updated_at__gte=watermark.last_changed_at
+                - timedelta(seconds=settings.SALES_ROLLUP_OVERLAP_SECONDS)
+            )
+        rolled_up = RolledUpOrder.objects.filter(order_id=OuterRef("id"))
+        sold_ids = list(
+            orders.filter(~Exists(rolled_up), status__in=SOLD_STATUSES).values_list(
+                "id", flat=True
+            )
+        )
+        cancelled_ids = list(
+            orders.filter(
+                Exists(rolled_up), status=Order.OrderStatusChoice.cancel
+            ).values_list("id", flat=True)
+        )
+
+        if sold_ids:
+            _add_order_items(OrderItem.objects.filter(order_id__in=sold_ids))
+            RolledUpOrder.objects.bulk_create(
+                [RolledUpOrder(order_id=order_id) for order_id in sold_ids]
+            )
+        if cancelled_ids:
+            _add_order_items(OrderItem.objects.filter(order_id__in=cancelled_ids), -1)
+            RolledUpOrder.objects.filter(order_id__in=cancelled_ids).delete()
+
+        watermark.last_changed_at = started_at
+        watermark.save()
+
+    return len(sold_ids) + len(cancelled_ids)
+
+
+def rebuild_order_rollups() -> int:
+    """Пересчитываем агрегаты заказов с нуля, включая доставленные заказы из архива"""
+    with transaction.atomic():
+        _lock_watermark(DAILY_SALES_LOCK)
+        watermark = _lock_watermark(ORDER_ITEMS_WATERMARK)
+        watermark.last_changed_at = None
+        watermark.save()
+        ProductDailySales.objects.all().delete()
+        CategoryDailySales.objects.all().delete()
+        DailySales.objects.update(revenue=Decimal("0.00"), units=0, orders_count=0)
+        RolledUpOrder.objects.all().delete()
+
+        archived_ids = list(
+            ArchivedOrder.objects.filter(status__in=SOLD_STATUSES).values_list(
+                "id", flat=True
+            )
+        )
+        if archived_ids:
+            _add_order_items(
+                ArchivedOrderItem.objects.filter(order_id__in=archived_ids)
+            )
+            RolledUpOrder.objects.bulk_create(
+                [RolledUpOrder(order_id=order_id) for order_id in archived_ids]
+            )
+
+        return len(archived_ids) + rollup_orders()
+
+
+def rollup_payments() -> int:
+    """
+    Пересчитываем статистику оплат начиная с последнего обработанного дня.
+
+    Оплата заказа может быть повторена (`update_or_create`), поэтому данные
+    за последние дни пересчитываются целиком, а не только по новым строкам.
+    """
+    today = timezone.now().date()
+
+    with transaction.atomic():
+        _lock_watermark(DAILY_SALES_LOCK)
+        watermark = _lock_watermark(PAYMENTS_WATERMARK)
+        payments = Payment.objects.all()
+        if watermark.last_date is not None:
+            day_start = timezone.make_aware(
+                datetime.combine(watermark.last_date, time.min)
+            )
+            payments = payments.filter(created_at__gte=day_start)
+
+        day_totals = (
+            payments.annotate(day=TruncDate("created_at"))
+            .values("day")
+            .annotate(
+                payments_count=Count("id"),
+                failed_payments_count=Count("id", filter=Q(is_paid=False)),
+            )
+        )
+        daily_rows = _get_daily_rows({total["day"] for total in day_totals})
+        for total in day_totals:
+            row = daily_rows[total["day"]]
+            row.payments_count = total["payments_count"]
+            row.failed_payments_count = total["failed_payments_count"]
+
+        _save_rows(DailySales, daily_rows.values(), PAYMENT_TOTALS_FIELDS)
+
+        watermark.last_date = today
+        watermark.save()
+
+    return len(daily_rows)
+
+
+def rollup_sales() -> dict:
+    """Обновляем все агрегаты продаж"""
+    return {
+        "orders": rollup_orders(),
+        "payment_days": rollup_payments(),
+    }
@@ -0,0 +1,94 @@
+"""Модуль для описания сериалайзеров для отчётов по продажам"""
+
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from reports.exports import EXPORT_FORMATS
+from reports.models import DailySales
+
+
+class ReportPeriodSerializer(serializers.Serializer):
+    """Класс сериалайзера для проверки периода отчёта"""
+
+    dateFrom = serializers.DateField(required=False)
+    dateTo = serializers.DateField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=1000, default=50)
+
+    def validate(self, attrs):
+        attrs.setdefault("dateTo", timezone.now().date())
+        attrs.setdefault("dateFrom", attrs["dateTo"] - timedelta(days=30))
+
+        if attrs["dateFrom"] > attrs["dateTo"]:
+            raise serializers.ValidationError(
+                "Начало периода должно быть не позже его конца."
+            )
+
+        return attrs
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    """Класс сериалайзера для проверки параметров выгрузки"""
+
+    file_format = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="csv")
+    dateFrom = serializers.DateField(required=False)
+    dateTo = serializers.DateField(required=False)
+
+
+class DailySalesSerializer(serializers.ModelSerializer):
+    """Класс сериалайзера для работы с моделью `DailySales`"""
+
+    ordersCount = serializers.IntegerField(source="orders_count")
+    averageOrderValue = serializers.DecimalField(
+        source="average_order_value", max_digits=14, decimal_places=2
+    )
+    paymentsCount = serializers.IntegerField(source="payments_count")
+    paymentFailureRate = serializers.FloatField(source="payment_failure_rate")
+
+    class Meta:
+        model = DailySales
+        fields = (
+            "date",
+            "revenue",
+            "units",
+            "ordersCount",
+            "averageOrderValue",
+            "paymentsCount",
+            "paymentFailureRate",
+        )
+        read_only_fields = fields
+
+
+class SalesSummarySerializer(serializers.Serializer):
+    """Класс сериалайзера для итогов продаж за период"""
+
+    dateFrom = serializers.DateField()
+    dateTo = serializers.DateField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    ordersCount = serializers.IntegerField()
+    averageOrderValue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    paymentsCount = serializers.IntegerField()
+    paymentFailureRate = serializers.FloatField()
+
+
+class ProductSalesSerializer(serializers.Serializer):
+    """Класс сериалайзера для продаж товара за период"""
+
+    id = serializers.IntegerField(source="product_id")
+    title = serializers.CharField(source="name")
+    category = serializers.IntegerField(source="category_id")
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    ordersCount = serializers.IntegerField(source="orders_count")
+
+
+class CategorySalesSerializer(serializers.Serializer):
+    """Класс сериалайзера для продаж категории за период"""
+
+    id = serializers.IntegerField(source="category_id")
+    title = serializers.CharField(source="category__title")
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    ordersCount = serializers.IntegerField(source="orders_count")
@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from orders.archive import get_archivable_orders
+from orders.models import Order, OrderItem
+from products.importers import read_rows
+from products.models import Category, Product, Subcategory
+from reports.models import (
+    CategoryDailySales,
+    DailySales,
+    ProductDailySales,
+    RollupWatermark,
+)
+from reports.rollups import (
+    ORDER_ITEMS_WATERMARK,
+    rebuild_order_rollups,
+    rollup_orders,
+    rollup_payments,
+)
+
+Status = Order.OrderStatusChoice
+User = get_user_model()
+
+
+class SalesTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(title="Компьютеры", slug="computers")
+        subcategory = Subcategory.objects.create(title="Ноутбуки", slug="notebooks")
+        cls.first, cls.second = (
+            Product.objects.create(
+                title=f"Товар {number}",
+                slug=f"product-{number}",
+                category=cls.category,
+                subcategory=subcategory,
+                price=100,
+                count=10,
+            )
+            for number in range(2)
+        )
+
+    def create_order(self, status, *lines) -> Order:
+        order = Order.objects.create(status=status)
+        for product, quantity in lines:
+            OrderItem.objects.create(
+                order=order,
+                product=product,
+                name=product.title,
+                price=product.price,
+                quantity=quantity,
+            )
+
+        return order
+
+
+class OrderRollupTests(SalesTestMixin, TestCase):
+    def get_daily(self) -> DailySales:
+        return DailySales.objects.get(date=timezone.now().date())
+
+    def test_only_paid_orders_are_rolled_up(self):
+        self.create_order(Status.paid, (self.first, 2))
+        self.create_order(Status.confirm_required, (self.first, 1))
+        self.create_order(Status.cancel, (self.first, 1))
+
+        rollup_orders()
+
+        daily = self.get_daily()
+        self.assertEqual((daily.revenue, daily.units, daily.orders_count), (200, 2, 1))
+
+    def test_order_is_counted_once(self):
+        self.create_order(Status.paid, (self.first, 1), (self.second, 3))
+        rollup_orders()
+        self.create_order(Status.delivered, (self.first, 1))
+        rollup_orders()
+        rollup_orders()
+
+        daily = self.get_daily()
+        self.assertEqual((daily.units, daily.orders_count), (5, 2))
+        self.assertEqual(daily.average_order_value(), Decimal("250.00"))
+        category = CategoryDailySales.objects.get(category=self.category)
+        self.assertEqual(category.orders_count, 2)
+        self.assertEqual(ProductDailySales.objects.get(product=self.first).units, 2)
+
+    def test_cancellation_after_rollup_is_subtracted(self):
+        order = self.create_order(Status.paid, (self.first, 2))
+        self.create_order(Status.paid, (self.second, 1))
+        rollup_orders()
+
+        order.status = Status.cancel
+        order.save()
+        rollup_orders()
+
+        daily = self.get_daily()
+        self.assertEqual((daily.revenue, daily.units, daily.orders_count), (100, 1, 1))
+        self.assertEqual(ProductDailySales.objects.get(product=self.first).units, 0)
+
+    def test_orders_changed_before_last_run_are_not_rescanned(self):
+        order = self.create_order(Status.paid, (self.first, 1))
+        rollup_orders()
+        self.create_order(Status.paid, (self.second, 1))
+        Order.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(rollup_orders(), 0)
+
+        order.status = Status.cancel
+        order.save()
+        self.assertEqual(rollup_orders(), 1)
+        self.assertEqual(self.get_daily().units, 0)
+
+    def test_rebuild_rescans_all_orders(self):
+        self.create_order(Status.paid, (self.first, 1), (self.second, 2))
+        rollup_orders()
+        DailySales.objects.update(units=100)
+        Order.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+        self.assertEqual(rebuild_order_rollups(), 1)
+        self.assertEqual(self.get_daily().units, 3)
+        self.assertIsNotNone(
+            RollupWatermark.objects.get(name=ORDER_ITEMS_WATERMARK).last_changed_at
+        )
+
+    def test_order_and_payment_rollups_keep_each_others_totals(self):
+        self.create_order(Status.paid, (self.first, 2))
+        rollup_orders()
+        DailySales.objects.update(payments_count=5, failed_payments_count=1)
+        self.create_order(Status.paid, (self.first, 1))
+        rollup_orders()
+        DailySales.objects.update(revenue=1000)
+        rollup_payments()
+
+        daily = self.get_daily()
+        self.assertEqual((daily.revenue, daily.units), (1000, 3))
+        self.assertEqual((daily.payments_count, daily.failed_payments_count), (5, 1))
+
+    def test_orders_are_archived_only_after_rollup(self):
+        delivered = self.create_order(Status.delivered, (self.first, 1))
+        cancelled = self.create_order(Status.cancel, (self.first, 1))
+        Order.objects.update(created_at=timezone.now() - timedelta(days=10))
+
+        self.assertEqual(list(get_archivable_orders(1)), [cancelled])
+
+        rollup_orders()
+
+        self.assertEqual(list(get_archivable_orders(1)), [delivered, cancelled])
+
+
+class SalesReportTests(SalesTestMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(
+            User.objects.create_user(username="manager", is_staff=True)
+        )
+
+    def test_reports_are_built_from_rollups(self):
+        self.create_order(Status.paid, (self.first, 2), (self.second, 1))
+        self.create_order(Status.delivered, (self.first, 1))
+        rollup_orders()
+
+        summary = self.client.get("/api/reports/sales/summary/").data
+        products = self.client.get("/api/reports/sales/products/").data
+        categories = self.client.get("/api/reports/sales/categories/").data
+
+        self.assertEqual(
+            (summary["revenue"], summary["units"], summary["ordersCount"]),
+            ("400.00", 4, 2),
+        )
+        self.assertEqual(
+            [(row["id"], row["units"]) for row in products],
+            [(self.first.id, 3), (self.second.id, 1)],
+        )
+        self.assertEqual(
+            [(row["id"], row["ordersCount"]) for row in categories],
+            [(self.category.id, 2)],
+        )
+
+    def test_reports_are_only_for_staff(self):
+        self.client.force_authenticate(User.objects.create_user(username="buyer"))
+
+        response = self.client.get("/api/reports/sales/daily/")
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ExportTests(SalesTestMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(
+            User.objects.create_user(username="manager", is_staff=True)
+        )
+
+    def read_csv(self, url: str) -> list:
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+
+        return list(csv.DictReader(io.StringIO(content)))
+
+    def test_order_lines_are_streamed(self):
+        order = self.create_order(Status.paid, (self.first, 2), (self.second, 1))
+        OrderItem.objects.filter(product=self.second).update(name="@SUM(A1:A2)")
+
+        rows = self.read_csv("/api/reports/export/orders/")
+
+        self.assertEqual(
+            [(row["order_id"], row["name"], row["quantity"]) for row in rows],
+            [
+                (str(order.id), self.first.title, "2"),
+                (str(order.id), "'@SUM(A1:A2)", "1"),
+            ],
+        )
+
+    def test_product_formulas_are_escaped_and_imported_back(self):
+        Product.objects.filter(id=self.first.id).update(
+            title='=HYPERLINK("http://example.com")', description="-1+2"
+        )
+
+        rows = self.read_csv("/api/reports/export/products/?file_format=csv")
+        first = rows[0]
+
+        self.assertEqual(first["title"], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(first["description"], "'-1+2")
+        self.assertEqual(first["price"], "100.00")
+        self.assertEqual(rows[1]["title"], self.second.title)
+
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+        output.seek(0)
+        imported = next(read_rows(output, "csv"))
+
+        self.assertEqual(imported["title"], '=HYPERLINK("http://example.com")')
+        self.assertEqual(imported["description"], "-1+2")
+
+    def test_jsonl_values_are_not_escaped(self):
+        self.create_order(Status.paid, (self.first, 1))
+        OrderItem.objects.update(name="=1+1")
+
+        response = self.client.get("/api/reports/export/orders/?file_format=jsonl")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual([json.loads(line)["name"] for line in lines], ["=1+1"])
@@ -0,0 +1,16 @@
+"""Модуль для описания urls для отчётов по продажам"""
+
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from reports.views import ExportViewSet, SalesReportViewSet
+
+app_name = "reports"
+
+routers_reports = DefaultRouter()
+routers_reports.register("reports/sales", SalesReportViewSet, basename="sales-report")
+routers_reports.register("reports/export", ExportViewSet, basename="export")
+
+urlpatterns = [
+    path("", include(routers_reports.urls)),
+]
@@ -0,0 +1,241 @@
+"""Модуль для описания представлений для отчётов по продажам"""
+
+from decimal import Decimal
+
+from django.db.models import Max, Sum
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from orders.models import ArchivedOrderItem, OrderItem
+from products.models import Product
+from reports.exports import export_order_lines, export_products
+from reports.models import CategoryDailySales, DailySales, ProductDailySales
+from reports.serializers import (
+    CategorySalesSerializer,
+    DailySalesSerializer,
+    ExportParamsSerializer,
+    ProductSalesSerializer,
+    ReportPeriodSerializer,
+    SalesSummarySerializer,
+)
+
+PERIOD_PARAMETERS = [
+    OpenApiParameter(
+        name="dateFrom",
+        description="period start (default: 30 days before dateTo)",
+        location=OpenApiParameter.QUERY,
+        required=False,
+        type=str,
+    ),
+    OpenApiParameter(
+        name="dateTo",
+        description="period end (default: today)",
+        location=OpenApiParameter.QUERY,
+        required=False,
+        type=str,
+    ),
+]
+
+LIMIT_PARAMETER = OpenApiParameter(
+    name="limit",
+    description="max rows in report",
+    location=OpenApiParameter.QUERY,
+    required=False,
+    type=int,
+)
+
+FORMAT_PARAMETER = OpenApiParameter(
+    name="file_format",
+    description="csv or jsonl",
+    location=OpenApiParameter.QUERY,
+    required=False,
+    type=str,
+    enum=["csv", "jsonl"],
+)
+
+ROLLUP_TOTALS = {
+    "revenue": Sum("revenue"),
+    "units": Sum("units"),
+    "orders_count": Sum("orders_count"),
+}
+
+
+@extend_schema_view(
+    daily=extend_schema(
+        tags=["reports"],
+        summary="Продажи по дням",
+        description="Get daily sales rollup",
+        parameters=PERIOD_PARAMETERS,
+    ),
+    summary=extend_schema(
+        tags=["reports"],
+        summary="Итоги продаж за период",
+        description="Get sales summary for period",
+        parameters=PERIOD_PARAMETERS,
+        responses=SalesSummarySerializer,
+    ),
+    products=extend_schema(
+        tags=["reports"],
+        summary="Продажи по товарам",
+        description="Get top products by revenue for period",
+        parameters=PERIOD_PARAMETERS + [LIMIT_PARAMETER],
+        responses=ProductSalesSerializer(many=True),
+    ),
+    categories=extend_schema(
+        tags=["reports"],
+        summary="Продажи по категориям",
+        description="Get categories by revenue for period",
+        parameters=PERIOD_PARAMETERS + [LIMIT_PARAMETER],
+        responses=CategorySalesSerializer(many=True),
+    ),
+)
+class SalesReportViewSet(GenericViewSet):
+    """ViewSet для отчётов по продажам, строящихся по агрегированным таблицам"""
+
+    permission_classes = (IsAdminUser,)
+    serializer_class = DailySalesSerializer
+    pagination_class = None
+
+    def get_period(self):
+        """Получаем период отчёта из параметров запроса"""
+        period = ReportPeriodSerializer(data=self.request.query_params)
+        period.is_valid(raise_exception=True)
+
+        return period.validated_data
+
+    @action(detail=False, methods=["get"])
+    def daily(self, request):
+        """Метод для вывода продаж по дням за период"""
+        period = self.get_period()
+        daily_sales = DailySales.objects.filter(
+            date__range=(period["dateFrom"], period["dateTo"])
+        )
+        serializer = self.get_serializer(daily_sales, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def summary(self, request):
+        """Метод для вывода итогов продаж за период"""
+        period = self.get_period()
+        totals = DailySales.objects.filter(
+            date__range=(period["dateFrom"], period["dateTo"])
+        ).aggregate(
+            payments_count=Sum("payments_count"),
+            failed_payments_count=Sum("failed_payments_count"),
+            **ROLLUP_TOTALS,
+        )
+        totals = {key: value or 0 for key, value in totals.items()}
+        average_order_value = Decimal("0.00")
+        if totals["orders_count"]:
+            average_order_value = round(totals["revenue"] / totals["orders_count"], 2)
+        payment_failure_rate = 0.0
+        if totals["payments_count"]:
+            payment_failure_rate = round(
+                totals["failed_payments_count"] / totals["payments_count"], 4
+            )
+
+        serializer = SalesSummarySerializer(
+            {
+                "dateFrom": period["dateFrom"],
+                "dateTo": period["dateTo"],
+                "revenue": totals["revenue"],
+                "units": totals["units"],
+                "ordersCount": totals["orders_count"],
+                "averageOrderValue": average_order_value,
+                "paymentsCount": totals["payments_count"],
+                "paymentFailureRate": payment_failure_rate,
+            }
+        )
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def products(self, request):
+        """Метод для вывода самых продаваемых товаров за период"""
+        period = self.get_period()
+        product_sales = (
+            ProductDailySales.objects.filter(
+                date__range=(period["dateFrom"], period["dateTo"])
+            )
+            .values("product_id")
+            .annotate(name=Max("name"), category_id=Max("category_id"), **ROLLUP_TOTALS)
+            .order_by("-revenue")[: period["limit"]]
+        )
+        serializer = ProductSalesSerializer(product_sales, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def categories(self, request):
+        """Метод для вывода продаж по категориям за период"""
+        period = self.get_period()
+        category_sales = (
+            CategoryDailySales.objects.filter(
+                date__range=(period["dateFrom"], period["dateTo"])
+            )
+            .values("category_id", "category__title")
+            .annotate(**ROLLUP_TOTALS)
+            .order_by("-revenue")[: period["limit"]]
+        )
+        serializer = CategorySalesSerializer(category_sales, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    orders=extend_schema(
+        tags=["reports"],
+        summary="Выгрузить заказы",
+        description="Stream order lines with order and payment data as CSV/JSONL",
+        parameters=PERIOD_PARAMETERS + [FORMAT_PARAMETER],
+        responses={(200, "text/csv"): str},
+    ),
+    products=extend_schema(
+        tags=["reports"],
+        summary="Выгрузить каталог товаров",
+        description="Stream products with specifications, tags and sales as CSV/JSONL",
+        parameters=[FORMAT_PARAMETER],
+        responses={(200, "text/csv"): str},
+    ),
+)
+class ExportViewSet(GenericViewSet):
+    """ViewSet для потоковой выгрузки данных для персонала"""
+
+    permission_classes = (IsAdminUser,)
+    serializer_class = ExportParamsSerializer
+    pagination_class = None
+
+    def get_params(self):
+        """Получаем параметры выгрузки из параметров запроса"""
+        params = self.get_serializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+
+        return params.validated_data
+
+    @action(detail=False, methods=["get"])
+    def orders(self, request):
+        """Метод для выгрузки позиций всех заказов, включая архив (по дате создания заказа)"""
+        params = self.get_params()
+        period = {}
+        if "dateFrom" in params:
+            period["order__created_at__date__gte"] = params["dateFrom"]
+        if "dateTo" in params:
+            period["order__created_at__date__lte"] = params["dateTo"]
+
+        return export_order_lines(
+            ArchivedOrderItem.objects.filter(**period),
+            OrderItem.objects.filter(**period),
+            file_format=params["file_format"],
+        )
+
+    @action(detail=False, methods=["get"])
+    def products(self, request):
+        """Метод для выгрузки всего каталога товаров"""
+        params = self.get_params()
+
+        return export_products(Product.objects.all(), params["file_format"])
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_profile_phone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="thumbnails",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Уменьшенные копии",
+            ),
+        ),
+    ]
@@ -1,10 +1,10 @@
 """Модуль для описания модели 'Profile' для БД"""
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
 from django.db import models
 
+from core.images import image_info
 
 User = get_user_model()
 
@@ -41,6 +41,9 @@ class Profile(models.Model):
         null=True,
         verbose_name="Аватарка",
     )
+    thumbnails = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Уменьшенные копии"
+    )
 
     class Meta:
         db_table = "profile"
@@ -54,7 +57,8 @@ class Profile(models.Model):
         return f"{self.user.last_name} {self.user.first_name} {self.middle_name}"
 
     def show_avatar_info(self):
-        return {
-            "src": f"{settings.MEDIA_URL}{self.avatar}",
-            "alt": f"Avatar of {self.user.last_name} {self.user.first_name}",
-        }
+        return image_info(
+            self.avatar,
+            self.thumbnails,
+            f"Avatar of {self.user.last_name} {self.user.first_name}",
+        )
@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
+from core.fields import ImageHeaderField
 from users.models import Profile
 
 User = get_user_model()
@@ -70,7 +71,7 @@ class ProfilePasswordSerializer(serializers.Serializer):
 class ProfileAvatarSerializer(serializers.ModelSerializer):
     """Класс сериалайзера для работы с аватаром профиля"""
 
-    avatar = serializers.ImageField()
+    avatar = ImageHeaderField()
 
     class Meta:
         model = Profile
@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from core.images import schedule_image_processing
 from orders.models import Order
 from users.models import Profile
 
@@ -32,3 +33,9 @@ def post_save_order(sender, instance: Order, created, **kwargs):
                 user=instance.user,
                 defaults=new_profile_data,
             )
+
+
+@receiver(post_save, sender=Profile)
+def post_save_profile(sender, instance: Profile, **kwargs):
+    """Сигнал для обработки аватарки после загрузки"""
+    schedule_image_processing(instance, "avatar")
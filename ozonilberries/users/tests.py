@@ -1,3 +1,62 @@
-from django.test import TestCase
+import io
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from users.models import Profile
+
+User = get_user_model()
+
+
+def image_file(name: str, color: str) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, "PNG")
+
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class AvatarTests(APITestCase):
+    def setUp(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.user = User.objects.create_user(username="bob")
+        self.profile = Profile.objects.create(
+            user=self.user, middle_name="Иванович", email="bob@example.com"
+        )
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name: str, color: str) -> str:
+        response = self.client.post(
+            "/api/profile/avatar/",
+            {"avatar": image_file(name, color)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+
+        return self.profile.avatar.name
+
+    def test_old_avatar_is_deleted(self):
+        storages = {
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}
+        }
+        with override_settings(STORAGES=storages):
+            first = self.upload("first.png", "red")
+            second = self.upload("second.png", "blue")
+            storage = self.profile.avatar.storage
+
+            self.assertFalse(storage.exists(first))
+            self.assertTrue(storage.exists(second))
+
+    def test_content_addressed_avatar_is_kept(self):
+        first = self.upload("first.png", "red")
+        second = self.upload("second.png", "blue")
+        storage = self.profile.avatar.storage
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(storage.exists(first))
+        self.assertTrue(storage.exists(second))
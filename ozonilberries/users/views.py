@@ -1,7 +1,5 @@
 """Модуль для описания представлений для модели 'Profile'"""
 
-import os
-
 from django.conf import settings
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, extend_schema_view
@@ -12,6 +10,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
+from core.storage import ContentAddressedStorage
 from users.models import Profile
 from users.permissions import IsCurrentUserProfileOrAdmin
 from users.serializers import (
@@ -43,6 +42,7 @@ class ProfileViewSet(CreateModelMixin, GenericViewSet):
 
     queryset = Profile.objects.all()
     permission_classes = (IsCurrentUserProfileOrAdmin,)
+    upload_max_size = settings.AVATAR_UPLOAD_MAX_SIZE
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -74,15 +74,20 @@ class ProfileViewSet(CreateModelMixin, GenericViewSet):
         """Метод для смены аватарки"""
         user_profile = Profile.objects.get(user=request.user)
         self.check_object_permissions(request, user_profile)
-        current_avatar_path = os.path.join(
-            settings.MEDIA_ROOT, str(user_profile.avatar)
-        )
+        current_avatar = user_profile.avatar.name
         serializer = self.get_serializer(data=request.data, instance=user_profile)
         serializer.is_valid(raise_exception=True)
         serializer.save()
 
-        if os.path.isfile(current_avatar_path):
-            os.remove(current_avatar_path)
+        # `ContentAddressedStorage` не удаляет файлы, их собирает
+        # `collect_media_garbage`, в остальных хранилищах удаляем сразу
+        storage = user_profile.avatar.storage
+        if (
+            current_avatar
+            and current_avatar != user_profile.avatar.name
+            and not isinstance(storage, ContentAddressedStorage)
+        ):
+            storage.delete(current_avatar)
 
         return Response(status=status.HTTP_200_OK)
 